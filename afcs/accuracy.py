@@ -0,0 +1,338 @@
+"""기준 보간기와 최적화 엔진 사이의 차등(differential) 정확도 검사.
+
+``python -m afcs.accuracy`` 로 ``rangeTables/``의 모든 표를 조밀한 격자, 고정 시드
+난수 거리, 정확한 행 거리, 표 양 끝, 중복 거리 지점에서 훑어 보고, 등록된 모든
+엔진이 ``afcs.reference``와 허용 오차 안에서 일치하는지 확인한다. 2차원 표가 있는
+사거리표는 격자 밖(``diff100m`` 모델로 계산하는) 지점만 비교한다.
+
+기준값은 ``reference_load_rows``로 원본 CSV를 최초 구현 그대로 읽어 만든다. 엔진 값이
+기준과 다르지만 같은 기준 보간기를 정규화된 행(``RangeTable.rows``)에 돌린 값과는 맞으면
+엔진 오류가 아니라 정규화(행 제외·정렬·중복 정리)가 바꾼 제원으로 따로 보고한다.
+"""
+import argparse
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.range_tables import RangeTable, available_charges, find_solutions, get_range_table
+from afcs.reference import reference_calculate, reference_load_rows
+
+TRAJECTORIES = ("low", "high")
+COMPARED_KEYS = ("mill", "base_mill", "diff100m", "eta")
+ALTITUDE_DELTAS = (0.0, 250.0, -175.0)
+DEFAULT_TOLERANCE = 1e-9
+DEFAULT_SEED = 20240101
+DEFAULT_DENSE_POINTS = 400
+DEFAULT_RANDOM_POINTS = 200
+EDGE_EPSILON = 1e-6
+
+# 엔진: (equipment, trajectory, charge, distances, altitude_delta) -> 결과 목록
+# 범위 밖이면 해당 위치에 None을 넣는다.
+Engine = Callable[[Equipment, str, int, Sequence[float], float], List[Optional[Dict]]]
+
+
+def _range_table_engine(equipment, trajectory, charge, distances, altitude_delta):
+    table = RangeTable(equipment, trajectory, charge)
+    return [
+        table.calculate(distance, altitude_delta) if table.supports_range(distance) else None
+        for distance in distances
+    ]
+
+
+def _cached_engine(equipment, trajectory, charge, distances, altitude_delta):
+    results = []
+    for distance in distances:
+        table = get_range_table(equipment, trajectory, charge)
+        results.append(
+            table.calculate(distance, altitude_delta) if table.supports_range(distance) else None
+        )
+    return results
+
+
+def _find_solutions_engine(equipment, trajectory, charge, distances, altitude_delta):
+    results = []
+    for distance in distances:
+        solutions = find_solutions(
+            distance, altitude_delta, trajectory, equipment=equipment, limit=1, charges=[charge]
+        )
+        results.append(solutions[0] if solutions else None)
+    return results
+
+
+def _grid_engine(equipment, trajectory, charge, distances, altitude_delta):
+    # sweep은 오름차순 격자용이므로 정렬해 한 번에 훑은 뒤 원래 순서로 되돌린다.
+    table = get_range_table(equipment, trajectory, charge)
+    order = sorted(range(len(distances)), key=distances.__getitem__)
+    results: List[Optional[Dict]] = [None] * len(distances)
+    for i, result in zip(order, table.sweep([distances[i] for i in order], altitude_delta)):
+        results[i] = result
+    return results
+
+
+ENGINES: Dict[str, Engine] = {
+    "range_table": _range_table_engine,
+    "cached": _cached_engine,
+    "find_solutions": _find_solutions_engine,
+    "grid": _grid_engine,
+}
+
+
+def register_engine(name: str, engine: Engine):
+    """비교 대상 엔진을 추가한다."""
+
+    ENGINES[name] = engine
+
+
+@dataclass
+class TableReport:
+    """한 사거리표에 대한 엔진별 최대 오차."""
+
+    equipment: str
+    trajectory: str
+    charge: int
+    points: int = 0
+    max_error: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    coverage_mismatches: Dict[str, int] = field(default_factory=dict)
+    # 정규화가 바꾼 제원: 열별 최대 절대 차이(밀·초)와 지원 여부가 바뀐 지점 수
+    normalization_delta: Dict[str, float] = field(default_factory=dict)
+    normalization_points: int = 0
+    normalization_coverage: int = 0
+
+    def worst(self, engine: str) -> float:
+        return max(self.max_error.get(engine, {}).values(), default=0.0)
+
+    @property
+    def normalized(self) -> bool:
+        return bool(self.normalization_points or self.normalization_coverage)
+
+
+def sample_distances(
+    rows: List[Dict[str, float]],
+    rng: random.Random,
+    dense_points: int = DEFAULT_DENSE_POINTS,
+    random_points: int = DEFAULT_RANDOM_POINTS,
+) -> List[float]:
+    """조밀한 격자, 난수, 행 거리, 양 끝과 바깥 지점을 모두 포함한 거리 목록."""
+
+    if not rows:
+        return []
+    ranges = [row["range"] for row in rows]
+    low, high = min(ranges), max(ranges)
+    span = high - low
+
+    distances = list(ranges)
+    if span > 0:
+        step = span / max(dense_points - 1, 1)
+        distances.extend(low + step * i for i in range(dense_points))
+        distances.extend(rng.uniform(low, high) for _ in range(random_points))
+        # 인접 행 사이의 정중앙 지점
+        distances.extend((a + b) / 2.0 for a, b in zip(ranges, ranges[1:]))
+    distances.extend(
+        [
+            low,
+            high,
+            low + EDGE_EPSILON,
+            high - EDGE_EPSILON,
+            low - EDGE_EPSILON,
+            high + EDGE_EPSILON,
+            low - 1.0,
+            high + 1.0,
+        ]
+    )
+    return distances
+
+
+def _error(expected: float, actual: float) -> float:
+    return abs(expected - actual) / max(1.0, abs(expected))
+
+
+def check_table(
+    equipment: Equipment,
+    trajectory: str,
+    charge: int,
+    engines: Dict[str, Engine],
+    rng: random.Random,
+    dense_points: int = DEFAULT_DENSE_POINTS,
+    random_points: int = DEFAULT_RANDOM_POINTS,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> TableReport:
+    report = TableReport(equipment.name, trajectory, charge)
+    table = RangeTable(equipment, trajectory, charge)
+    raw_rows = reference_load_rows(table.path)
+    rows = list(table.rows)
+    # 정규화가 행을 바꾸지 않았으면 두 기준값이 같으므로 한 번만 계산한다.
+    normalized = raw_rows != rows
+    sampled = sample_distances(raw_rows, rng, dense_points, random_points)
+
+    for altitude_delta in ALTITUDE_DELTAS:
+        # 2차원 표가 덮는 지점은 기준 보간기(diff100m 모델)와 모델이 달라 비교하지 않는다.
+        distances = [
+            distance for distance in sampled if not table.uses_grid(distance, altitude_delta)
+        ]
+        expected = [
+            reference_calculate(raw_rows, charge, distance, altitude_delta) for distance in distances
+        ]
+        rebased = (
+            [reference_calculate(rows, charge, distance, altitude_delta) for distance in distances]
+            if normalized
+            else expected
+        )
+        report.points += len(distances)
+        if normalized:
+            _record_normalization(report, expected, rebased, tolerance)
+        for name, engine in engines.items():
+            actual = engine(equipment, trajectory, charge, distances, altitude_delta)
+            errors = report.max_error.setdefault(name, {key: 0.0 for key in COMPARED_KEYS})
+            for want, base, got in zip(expected, rebased, actual):
+                if base is not want and _matches(base, got, tolerance):
+                    # 기준과의 차이는 정규화 몫으로 위에서 이미 셌다.
+                    continue
+                if (want is None) != (got is None):
+                    report.coverage_mismatches[name] = report.coverage_mismatches.get(name, 0) + 1
+                    continue
+                if want is None:
+                    continue
+                for key in COMPARED_KEYS:
+                    err = _error(want[key], got[key])
+                    if err > errors[key]:
+                        errors[key] = err
+    return report
+
+
+def _matches(want: Optional[Dict], got, tolerance: float) -> bool:
+    if want is None or got is None:
+        return want is None and got is None
+    return all(_error(want[key], got[key]) <= tolerance for key in COMPARED_KEYS)
+
+
+def _record_normalization(report: TableReport, raw, normalized, tolerance: float):
+    """원본 행 기준값과 정규화된 행 기준값의 차이를 ``report``에 더한다."""
+
+    deltas = report.normalization_delta
+    for want, base in zip(raw, normalized):
+        if _matches(want, base, tolerance):
+            continue
+        if want is None or base is None:
+            report.normalization_coverage += 1
+            continue
+        report.normalization_points += 1
+        for key in COMPARED_KEYS:
+            delta = abs(want[key] - base[key])
+            if delta > deltas.get(key, 0.0):
+                deltas[key] = delta
+
+
+def run_harness(
+    engines: Optional[Iterable[str]] = None,
+    equipment_names: Optional[Iterable[str]] = None,
+    seed: int = DEFAULT_SEED,
+    dense_points: int = DEFAULT_DENSE_POINTS,
+    random_points: int = DEFAULT_RANDOM_POINTS,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[TableReport]:
+    selected = {name: ENGINES[name] for name in (engines or ENGINES)}
+    wanted = set(equipment_names or [])
+    rng = random.Random(seed)
+    reports = []
+    for equipment in EquipmentRegistry():
+        if wanted and equipment.name not in wanted:
+            continue
+        for trajectory in TRAJECTORIES:
+            for charge in available_charges(equipment, trajectory):
+                reports.append(
+                    check_table(
+                        equipment,
+                        trajectory,
+                        charge,
+                        selected,
+                        rng,
+                        dense_points,
+                        random_points,
+                        tolerance,
+                    )
+                )
+    return reports
+
+
+def format_report(reports: List[TableReport], tolerance: float) -> str:
+    engines = sorted({name for report in reports for name in report.max_error})
+    header = f"{'장비':<8} {'탄도':<5} {'장약':>4} {'지점':>6} " + " ".join(
+        f"{name:>16}" for name in engines
+    )
+    lines = [header]
+    for report in reports:
+        cells = []
+        for name in engines:
+            worst = report.worst(name)
+            mismatch = report.coverage_mismatches.get(name, 0)
+            flag = "!" if worst > tolerance or mismatch else " "
+            cells.append(f"{worst:>15.3e}{flag}")
+        lines.append(
+            f"{report.equipment:<8} {report.trajectory:<5} {report.charge:>4} {report.points:>6} "
+            + " ".join(cells)
+        )
+    return "\n".join(lines)
+
+
+def failures(reports: List[TableReport], tolerance: float) -> List[str]:
+    messages = []
+    for report in reports:
+        label = f"{report.equipment}/{report.trajectory}/{report.charge}"
+        for name, errors in report.max_error.items():
+            for key, err in errors.items():
+                if err > tolerance:
+                    messages.append(f"{label} {name}.{key} 오차 {err:.3e} > {tolerance:.1e}")
+        for name, count in report.coverage_mismatches.items():
+            messages.append(f"{label} {name} 지원 범위 불일치 {count}건")
+    return messages
+
+
+def normalization_changes(reports: List[TableReport]) -> List[str]:
+    """정규화 때문에 원본 CSV 기준과 달라진 표별 차이."""
+
+    messages = []
+    for report in reports:
+        if not report.normalized:
+            continue
+        deltas = report.normalization_delta
+        messages.append(
+            f"{report.equipment}/{report.trajectory}/{report.charge} 정규화로 바뀐 제원: "
+            f"{report.normalization_points}지점, 밀 최대 {deltas.get('mill', 0.0):.3f} mil, "
+            f"ETA 최대 {deltas.get('eta', 0.0):.3f} s, 지원 여부 변경 {report.normalization_coverage}지점"
+        )
+    return messages
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="기준 보간기 대비 엔진 정확도 검사")
+    parser.add_argument("--engine", action="append", choices=sorted(ENGINES), help="검사할 엔진")
+    parser.add_argument("--equipment", action="append", help="검사할 장비 이름")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--dense", type=int, default=DEFAULT_DENSE_POINTS, help="표당 조밀 격자 지점 수")
+    parser.add_argument("--random", type=int, default=DEFAULT_RANDOM_POINTS, help="표당 난수 지점 수")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 상대 오차")
+    parser.add_argument(
+        "--accept-normalization",
+        action="store_true",
+        help="정규화로 바뀐 제원은 보고만 하고 실패로 보지 않는다",
+    )
+    args = parser.parse_args(argv)
+
+    reports = run_harness(
+        args.engine, args.equipment, args.seed, args.dense, args.random, args.tolerance
+    )
+    print(format_report(reports, args.tolerance))
+    problems = failures(reports, args.tolerance)
+    for message in problems:
+        print(message)
+    changes = normalization_changes(reports)
+    for message in changes:
+        print(message)
+    print(f"검사한 표 {len(reports)}개, 불일치 {len(problems)}건, 정규화 차이 {len(changes)}개 표")
+    return 1 if problems or (changes and not args.accept_normalization) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
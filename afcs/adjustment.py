@@ -0,0 +1,138 @@
+"""수정 사격(관측 보정) 세션.
+
+초탄 이후 관측자가 보내는 가감(ADD/DROP)과 좌우(LEFT/RIGHT) 수정을 누적해 같은
+장비·탄도·장약으로 제원을 다시 구한다. 사거리표와 직전 보간 구간을 들고 있어서
+새 거리가 같은 구간 안에 있으면 이분 탐색 없이 이웃 행을 바로 다시 쓴다.
+"""
+import math
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from afcs.equipment import Equipment
+from afcs.metrics import REGISTRY
+from afcs.range_tables import RangeTable, get_range_table
+from afcs.records import Solution
+
+MILS_PER_RADIAN = 6400.0 / (2.0 * math.pi)
+
+_BRACKET_REUSE = REGISTRY.counter(
+    "afcs_adjustment_bracket_total", "수정 사격에서 직전 보간 구간 재사용 여부", ("result",)
+)
+_BRACKET_HIT = _BRACKET_REUSE.labels("hit")
+_BRACKET_MISS = _BRACKET_REUSE.labels("miss")
+
+
+@dataclass
+class Correction:
+    """관측자 수정 한 건. 거리(+면 ADD)와 좌우(+면 RIGHT)는 m 단위."""
+
+    range_m: float = 0.0
+    lateral_m: float = 0.0
+
+
+@dataclass
+class AdjustmentState:
+    """``along``은 초탄 방향 거리, ``lateral``은 그에 수직인 좌우 이동량, ``distance``는 실제 거리."""
+
+    along: float
+    lateral: float
+    distance: float
+    solution: Solution
+    # 초탄 방향 대비 편각 수정량(밀). +면 오른쪽.
+    deflection_mils: float = 0.0
+    correction: Optional[Correction] = None
+
+
+@dataclass
+class AdjustmentSession:
+    """장비·탄도·장약을 고정한 수정 사격 세션. ``history[0]``이 초탄 제원이다."""
+
+    equipment: Equipment
+    trajectory: str
+    charge: int
+    distance: float
+    altitude_delta: float = 0.0
+    table: Optional[RangeTable] = None
+    history: List[AdjustmentState] = field(default_factory=list)
+    # bisect_left 결과 idx가 같은 거리 구간 (ranges[idx-1], ranges[idx]]
+    _bracket: Optional[Tuple[int, float, float]] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.table is None:
+            self.table = get_range_table(self.equipment, self.trajectory, self.charge)
+        self.history.append(self._state(self.distance, 0.0, None))
+
+    @property
+    def current(self) -> AdjustmentState:
+        return self.history[-1]
+
+    def _index(self, distance: float) -> int:
+        bracket = self._bracket
+        if bracket is not None and bracket[1] < distance <= bracket[2]:
+            _BRACKET_HIT.inc()
+            return bracket[0]
+        _BRACKET_MISS.inc()
+        ranges = self.table.ranges
+        idx = bisect_left(ranges, distance)
+        lower = ranges[idx - 1] if idx > 0 else -math.inf
+        upper = ranges[idx] if idx < len(ranges) else math.inf
+        self._bracket = (idx, lower, upper)
+        return idx
+
+    def solve(self, distance: float) -> Solution:
+        """``RangeTable.calculate``와 같은 결과를 직전 구간을 재사용해 구한다."""
+
+        table = self.table
+        if not table.supports_range(distance):
+            raise ValueError("거리 밖입니다")
+        span = table._span_at(self._index(distance), distance)
+        base_mill = table._interpolate_span(span, "mill", distance)
+        diff100m = table._interpolate_span(span, "diff100m", distance)
+        eta = table._interpolate_span(span, "eta", distance)
+        if table.uses_grid(distance, self.altitude_delta):
+            mill, eta = table.grid.lookup(distance, self.altitude_delta)
+        else:
+            mill = base_mill + (self.altitude_delta / 100.0) * diff100m
+        return Solution(mill, eta, self.charge, base_mill, diff100m)
+
+    def _state(self, along: float, lateral: float, correction: Optional[Correction]) -> AdjustmentState:
+        # 좌우 수정은 초탄 방향에 수직으로 옮긴 것으로 보고 거리와 편각을 함께 바꾼다.
+        distance = math.hypot(along, lateral)
+        return AdjustmentState(
+            along=along,
+            lateral=lateral,
+            distance=distance,
+            solution=self.solve(distance),
+            deflection_mils=math.atan2(lateral, along) * MILS_PER_RADIAN,
+            correction=correction,
+        )
+
+    def apply(self, correction: Correction) -> AdjustmentState:
+        """수정을 누적해 새 제원을 계산한다. 표 범위를 벗어나면 ``ValueError``이며 상태는 그대로다."""
+
+        current = self.current
+        state = self._state(
+            current.along + correction.range_m, current.lateral + correction.lateral_m, correction
+        )
+        self.history.append(state)
+        return state
+
+    def add(self, meters: float) -> AdjustmentState:
+        return self.apply(Correction(range_m=meters))
+
+    def drop(self, meters: float) -> AdjustmentState:
+        return self.apply(Correction(range_m=-meters))
+
+    def right(self, meters: float) -> AdjustmentState:
+        return self.apply(Correction(lateral_m=meters))
+
+    def left(self, meters: float) -> AdjustmentState:
+        return self.apply(Correction(lateral_m=-meters))
+
+    def undo(self) -> AdjustmentState:
+        """마지막 수정을 취소한다. 초탄 제원은 지우지 않는다."""
+
+        if len(self.history) > 1:
+            self.history.pop()
+        return self.current
@@ -0,0 +1,146 @@
+"""거리 × 고도차 2차원 사거리표.
+
+고도 구간별로 따로 만든 사거리표를 ``<prefix>_rangeTable_<trajectory>_<charge>_2d.csv``에
+``range,altitude_delta,mill,eta`` 열(고도차는 사수-목표)로 모아 두면, 1차원 표의
+``diff100m`` 선형 보정 대신 이 격자에서 밀과 ETA를 직접 보간한다. 모든 (고도차, 거리)
+칸이 채워져 있어야 하며, 격자 밖 지점은 호출한 쪽이 ``diff100m`` 모델로 계산한다.
+
+조회는 축마다 이분 탐색 한 번과 이중선형(또는 이중 2차) 가중합이다.
+"""
+import csv
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+GRID_SUFFIX = "_2d"
+GRID_COLUMNS = ("range", "altitude_delta", "mill", "eta")
+BLENDS = ("bilinear", "biquadratic")
+
+
+def grid_path_for(table_path: Path) -> Path:
+    """1차원 사거리표 경로 옆의 2차원 표 경로."""
+
+    return table_path.with_name(f"{table_path.stem}{GRID_SUFFIX}{table_path.suffix}")
+
+
+def _axis_weights(
+    axis: Sequence[float], x: float, quadratic: bool, derivative: bool = False
+) -> Tuple[int, Tuple[float, ...]]:
+    """축 위 ``x``의 보간에 쓸 시작 인덱스와 가중치. 축 값은 엄격히 증가한다.
+
+    ``derivative``면 같은 이웃 칸에서 보간식을 ``x``로 미분한 가중치를 반환한다.
+    """
+
+    count = len(axis)
+    if count == 1:
+        return 0, ((0.0,) if derivative else (1.0,))
+    if quadratic and count >= 3:
+        start = min(max(bisect_right(axis, x) - 2, 0), count - 3)
+        x0, x1, x2 = axis[start], axis[start + 1], axis[start + 2]
+        if derivative:
+            return start, (
+                ((x - x1) + (x - x2)) / ((x0 - x1) * (x0 - x2)),
+                ((x - x0) + (x - x2)) / ((x1 - x0) * (x1 - x2)),
+                ((x - x0) + (x - x1)) / ((x2 - x0) * (x2 - x1)),
+            )
+        return start, (
+            ((x - x1) / (x0 - x1)) * ((x - x2) / (x0 - x2)),
+            ((x - x0) / (x1 - x0)) * ((x - x2) / (x1 - x2)),
+            ((x - x0) / (x2 - x0)) * ((x - x1) / (x2 - x1)),
+        )
+    start = min(max(bisect_right(axis, x) - 1, 0), count - 2)
+    width = axis[start + 1] - axis[start]
+    if derivative:
+        return start, (-1.0 / width, 1.0 / width)
+    ratio = (x - axis[start]) / width
+    return start, (1.0 - ratio, ratio)
+
+
+class AltitudeGrid:
+    """장비·탄도·장약 하나의 (고도차, 거리) 격자.
+
+    밀과 ETA는 고도차 행 우선의 평평한 튜플로 두어 ``values[a * len(ranges) + r]``로
+    읽는다. 거리·고도차 범위는 읽을 때 미리 구해 둔다.
+    """
+
+    def __init__(self, path: Path, blend: str = "bilinear"):
+        if blend not in BLENDS:
+            raise ValueError(f"지원하지 않는 보간 방식입니다: {blend}")
+        self.path = path
+        self.blend = blend
+        # 캐시가 변경을 알아챌 수 있도록 읽기 전의 수정 시각을 남긴다.
+        self.mtime = path.stat().st_mtime_ns
+        cells: Dict[Tuple[float, float], Tuple[float, float]] = {}
+        with path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f, skipinitialspace=True)
+            missing = [name for name in GRID_COLUMNS if name not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"{path.name}: {', '.join(missing)} 열이 없습니다")
+            for line, row in enumerate(reader, start=2):
+                try:
+                    key = (float(row["altitude_delta"]), float(row["range"]))
+                    cells[key] = (float(row["mill"]), float(row["eta"]))
+                except (TypeError, ValueError):
+                    raise ValueError(f"{path.name} {line}행을 숫자로 읽을 수 없습니다") from None
+
+        if not cells:
+            raise ValueError(f"{path.name}: 격자가 비어 있습니다")
+        self.altitudes = tuple(sorted({altitude for altitude, _ in cells}))
+        self.ranges = tuple(sorted({distance for _, distance in cells}))
+        mills: List[float] = []
+        etas: List[float] = []
+        for altitude in self.altitudes:
+            for distance in self.ranges:
+                cell = cells.get((altitude, distance))
+                if cell is None:
+                    raise ValueError(
+                        f"{path.name}: 고도차 {altitude:g} m, 거리 {distance:g} m 칸이 비어 있습니다"
+                    )
+                mills.append(cell[0])
+                etas.append(cell[1])
+        self.mills = tuple(mills)
+        self.etas = tuple(etas)
+        self.min_range, self.max_range = self.ranges[0], self.ranges[-1]
+        self.min_altitude, self.max_altitude = self.altitudes[0], self.altitudes[-1]
+
+    def covers(self, distance: float, altitude_delta: float) -> bool:
+        return (
+            self.min_range <= distance <= self.max_range
+            and self.min_altitude <= altitude_delta <= self.max_altitude
+        )
+
+    def lookup(self, distance: float, altitude_delta: float) -> Tuple[float, float]:
+        """격자 안의 한 지점에서 (mill, eta)를 보간한다. 범위 확인은 ``covers``로 한다."""
+
+        quadratic = self.blend == "biquadratic"
+        return self._blend(
+            _axis_weights(self.ranges, distance, quadratic),
+            _axis_weights(self.altitudes, altitude_delta, quadratic),
+        )
+
+    def gradient(
+        self, distance: float, altitude_delta: float
+    ) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """((d mill/d range, d eta/d range), (d mill/d 고도차, d eta/d 고도차))를 보간식에서 구한다."""
+
+        quadratic = self.blend == "biquadratic"
+        r_weights = _axis_weights(self.ranges, distance, quadratic)
+        a_weights = _axis_weights(self.altitudes, altitude_delta, quadratic)
+        return (
+            self._blend(_axis_weights(self.ranges, distance, quadratic, True), a_weights),
+            self._blend(r_weights, _axis_weights(self.altitudes, altitude_delta, quadratic, True)),
+        )
+
+    def _blend(self, r_axis, a_axis) -> Tuple[float, float]:
+        r_start, r_weights = r_axis
+        a_start, a_weights = a_axis
+        width = len(self.ranges)
+        mills, etas = self.mills, self.etas
+        mill = eta = 0.0
+        for a_offset, a_weight in enumerate(a_weights):
+            base = (a_start + a_offset) * width + r_start
+            for r_offset, r_weight in enumerate(r_weights):
+                weight = a_weight * r_weight
+                mill += weight * mills[base + r_offset]
+                eta += weight * etas[base + r_offset]
+        return mill, eta
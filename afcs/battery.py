@@ -0,0 +1,127 @@
+"""포대(여러 문의 포) 일괄 계산.
+
+포마다 고도와 목표까지의 거리가 다르더라도 같은 장비·탄도·장약의 사거리표는
+한 번만 가져와 ``RangeTable.sweep``으로 모든 포의 거리를 함께 훑는다. 포별 결과는
+``find_solutions``를 포마다 호출한 것과 같다.
+
+    python -m afcs.battery guns.csv --target-alt 120
+"""
+import argparse
+import csv
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from afcs.equipment import EquipmentRegistry
+from afcs.range_tables import find_solutions_batch, resolve_charges
+from afcs.records import Solution
+
+TRAJECTORIES = ("low", "high")
+DEFAULT_LIMIT = 3
+
+
+@dataclass
+class GunRecord:
+    """포 한 문의 위치 정보. ``equipment``는 장비 이름."""
+
+    name: str
+    equipment: str
+    altitude: float
+    distance: float
+
+
+@dataclass
+class GunSolution:
+    gun: GunRecord
+    altitude_delta: float
+    low: List[Solution] = field(default_factory=list)
+    high: List[Solution] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def solutions(self, trajectory: str) -> List[Solution]:
+        return self.low if trajectory == "low" else self.high
+
+
+def solve_battery(
+    guns: Iterable[GunRecord],
+    target_altitude: float,
+    limit: int = DEFAULT_LIMIT,
+    registry: Optional[EquipmentRegistry] = None,
+) -> List[GunSolution]:
+    """모든 포의 저각/고각 해를 입력 순서대로 반환한다.
+
+    같은 장비의 포를 묶어 ``find_solutions_batch``로 한 번에 계산한다.
+    """
+
+    registry = registry or EquipmentRegistry()
+    results = [GunSolution(gun, gun.altitude - target_altitude) for gun in guns]
+
+    groups: Dict[str, List[GunSolution]] = {}
+    for result in results:
+        if registry.get(result.gun.equipment) is None:
+            result.error = f"'{result.gun.equipment}' 장비 정보를 찾을 수 없습니다."
+            continue
+        groups.setdefault(result.gun.equipment, []).append(result)
+
+    for name, members in groups.items():
+        equipment = registry.get(name)
+        distances = [member.gun.distance for member in members]
+        deltas = [member.altitude_delta for member in members]
+        for trajectory in TRAJECTORIES:
+            charges = resolve_charges(equipment, trajectory)
+            batch = find_solutions_batch(distances, deltas, trajectory, equipment, limit, charges)
+            for member, solutions in zip(members, batch):
+                member.solutions(trajectory).extend(solutions)
+    return results
+
+
+def read_guns(path: Path) -> List[GunRecord]:
+    """``name,equipment,altitude,distance`` 헤더를 가진 CSV를 읽는다."""
+
+    guns = []
+    with Path(path).open("r", encoding="utf-8", newline="") as f:
+        for i, row in enumerate(csv.DictReader(f), start=1):
+            guns.append(
+                GunRecord(
+                    name=(row.get("name") or f"#{i}").strip(),
+                    equipment=row["equipment"].strip(),
+                    altitude=float(row["altitude"]),
+                    distance=float(row["distance"]),
+                )
+            )
+    return guns
+
+
+def format_battery(results: List[GunSolution]) -> str:
+    lines = [f"{'포':<6} {'장비':<8} {'LOW CH':>6} {'MILL':>9} {'ETA':>6}  {'HIGH CH':>7} {'MILL':>9} {'ETA':>6}"]
+    for result in results:
+        if result.error:
+            lines.append(f"{result.gun.name:<6} {result.gun.equipment:<8} {result.error}")
+            continue
+        cells = []
+        for trajectory, width in (("low", 6), ("high", 7)):
+            solutions = result.solutions(trajectory)
+            if solutions:
+                best = solutions[0]
+                cells.append(f"{best.charge:>{width}} {best.mill:>9.2f} {best.eta:>6.1f}")
+            else:
+                cells.append(f"{'—':>{width}} {'—':>9} {'—':>6}")
+        lines.append(f"{result.gun.name:<6} {result.gun.equipment:<8} " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="포대 일괄 사격 제원 계산")
+    parser.add_argument("guns", help="name,equipment,altitude,distance 열을 가진 CSV")
+    parser.add_argument("--target-alt", type=float, required=True, help="목표 고도(m)")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="탄도별 최대 해 개수")
+    args = parser.parse_args(argv)
+
+    results = solve_battery(read_guns(Path(args.guns)), args.target_alt, args.limit)
+    print(format_battery(results))
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""사거리표 엔진과 계산 경로의 성능 측정 도구.
+
+``python -m afcs.benchmark run --output result.json`` 으로 측정 결과를 JSON으로
+저장하고, ``python -m afcs.benchmark compare baseline.json result.json`` 으로
+기준 결과 대비 성능 저하를 확인한다.
+"""
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.mission import FireMissionController
+from afcs.range_tables import (
+    RangeTable,
+    available_charges,
+    clear_table_cache,
+    find_solutions,
+    get_range_table,
+)
+
+TRAJECTORIES = ("low", "high")
+DEFAULT_SEED = 20240101
+DEFAULT_REPEAT = 5
+DEFAULT_WORKLOAD = 200
+DEFAULT_THRESHOLD = 0.10
+# 이름이 바뀐 측정 항목의 (새 접미사 -> 예전 접미사). 예전 기준 결과와도 비교되도록 한다.
+# 캐시가 생기기 전의 find_solutions는 매번 표를 읽었으므로 cold 측정과 같은 작업이다.
+RENAMED_CASES = {"/find_solutions.cold": "/find_solutions"}
+
+
+@dataclass
+class BenchmarkResult:
+    """하나의 측정 항목에 대한 반복 측정 결과."""
+
+    name: str
+    ops: int
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def min_us(self) -> float:
+        return min(self.samples) / self.ops * 1e6
+
+    @property
+    def median_us(self) -> float:
+        return statistics.median(self.samples) / self.ops * 1e6
+
+    @property
+    def mean_us(self) -> float:
+        return statistics.fmean(self.samples) / self.ops * 1e6
+
+    def to_dict(self):
+        return {
+            "ops": self.ops,
+            "repeat": len(self.samples),
+            "min_us": self.min_us,
+            "median_us": self.median_us,
+            "mean_us": self.mean_us,
+        }
+
+
+def measure(name: str, func: Callable[[], None], ops: int, repeat: int) -> BenchmarkResult:
+    """``func``를 ``repeat``번 실행하고 1회 연산당 시간을 계산할 수 있게 기록한다."""
+
+    result = BenchmarkResult(name=name, ops=max(ops, 1))
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        result.samples.append(time.perf_counter() - started)
+    return result
+
+
+def _table_span(table: RangeTable):
+    ranges = [row["range"] for row in table.rows]
+    return min(ranges), max(ranges)
+
+
+def _random_distances(rng: random.Random, low: float, high: float, count: int) -> List[float]:
+    return [rng.uniform(low, high) for _ in range(count)]
+
+
+def _two_point_table(table: RangeTable) -> RangeTable:
+    """선형 보간 분기를 측정하기 위해 앞의 두 행만 남긴 사본을 만든다."""
+
+    clone = copy.copy(table)
+    clone._index_rows(table.rows[:2])
+    return clone
+
+
+def _equipment_cases(
+    equipment: Equipment, rng: random.Random, workload: int, repeat: int
+) -> List[BenchmarkResult]:
+    results = []
+    label = equipment.name
+
+    for trajectory in TRAJECTORIES:
+        charges = available_charges(equipment, trajectory)
+        results.append(
+            measure(
+                f"{label}/{trajectory}/available_charges",
+                lambda: available_charges(equipment, trajectory),
+                ops=1,
+                repeat=repeat,
+            )
+        )
+        if not charges:
+            continue
+
+        tables = [RangeTable(equipment, trajectory, charge) for charge in charges]
+        tables = [table for table in tables if table.rows]
+        if not tables:
+            continue
+
+        results.append(
+            measure(
+                f"{label}/{trajectory}/RangeTable.cold",
+                lambda: [RangeTable(equipment, trajectory, charge) for charge in charges],
+                ops=len(charges),
+                repeat=repeat,
+            )
+        )
+        results.append(
+            measure(
+                f"{label}/{trajectory}/_load_rows",
+                lambda: [table._load_rows() for table in tables],
+                ops=len(tables),
+                repeat=repeat,
+            )
+        )
+
+        # 테이블마다 고정된 난수 거리 집합을 만든다.
+        workloads = []
+        for table in tables:
+            low, high = _table_span(table)
+            workloads.append((table, _random_distances(rng, low, high, workload)))
+        total_ops = sum(len(distances) for _, distances in workloads)
+
+        def _supports():
+            for table, distances in workloads:
+                for distance in distances:
+                    table.supports_range(distance)
+
+        def _quadratic():
+            for table, distances in workloads:
+                for distance in distances:
+                    table._interpolate("mill", distance)
+
+        linear_workloads = []
+        for table, distances in workloads:
+            if len(table.rows) < 2:
+                continue
+            clone = _two_point_table(table)
+            low, high = _table_span(clone)
+            linear_workloads.append((clone, _random_distances(rng, low, high, workload)))
+
+        def _linear():
+            for table, distances in linear_workloads:
+                for distance in distances:
+                    table._interpolate("mill", distance)
+
+        def _calculate_warm():
+            for table, distances in workloads:
+                for distance in distances:
+                    table.calculate(distance, 0.0)
+
+        results.append(
+            measure(f"{label}/{trajectory}/supports_range", _supports, total_ops, repeat)
+        )
+        results.append(
+            measure(f"{label}/{trajectory}/_interpolate.quadratic", _quadratic, total_ops, repeat)
+        )
+        if linear_workloads:
+            results.append(
+                measure(
+                    f"{label}/{trajectory}/_interpolate.linear",
+                    _linear,
+                    sum(len(distances) for _, distances in linear_workloads),
+                    repeat,
+                )
+            )
+        sorted_workloads = [(table, sorted(distances)) for table, distances in workloads]
+
+        def _sweep():
+            for table, distances in sorted_workloads:
+                for _ in table.sweep(distances, 0.0):
+                    pass
+
+        results.append(
+            measure(f"{label}/{trajectory}/calculate.warm", _calculate_warm, total_ops, repeat)
+        )
+        results.append(measure(f"{label}/{trajectory}/sweep", _sweep, total_ops, repeat))
+
+        # find_solutions는 범위 밖 거리도 섞어서 실제 사용 패턴에 가깝게 측정한다.
+        overall_low = min(_table_span(table)[0] for table in tables)
+        overall_high = max(_table_span(table)[1] for table in tables)
+        margin = (overall_high - overall_low) * 0.05
+        solve_distances = _random_distances(
+            rng, overall_low - margin, overall_high + margin, max(workload // 10, 1)
+        )
+        altitude_deltas = [rng.uniform(-300.0, 300.0) for _ in solve_distances]
+
+        def _solve_cold():
+            for distance, delta in zip(solve_distances, altitude_deltas):
+                clear_table_cache()
+                find_solutions(distance, delta, trajectory, equipment=equipment, charges=charges)
+
+        def _solve_warm():
+            for distance, delta in zip(solve_distances, altitude_deltas):
+                find_solutions(distance, delta, trajectory, equipment=equipment, charges=charges)
+
+        results.append(
+            measure(
+                f"{label}/{trajectory}/find_solutions.cold",
+                _solve_cold,
+                len(solve_distances),
+                repeat,
+            )
+        )
+        _solve_warm()
+        results.append(
+            measure(
+                f"{label}/{trajectory}/find_solutions.warm",
+                _solve_warm,
+                len(solve_distances),
+                repeat,
+            )
+        )
+
+    # GUI 계산 버튼과 같은 경로(문자열 입력 → MissionResult)를 디스플레이 없이 측정한다.
+    # 공유 난수열을 건드리지 않도록 장비 이름으로 따로 시드를 정한다.
+    mission_rng = random.Random(label)
+    controller = FireMissionController(EquipmentRegistry())
+    spans = [
+        _table_span(get_range_table(equipment, trajectory, charge))
+        for trajectory in TRAJECTORIES
+        for charge in available_charges(equipment, trajectory)
+    ]
+    if spans:
+        low = min(span[0] for span in spans)
+        high = max(span[1] for span in spans)
+        missions = [
+            tuple(f"{value:.0f}" for value in (
+                mission_rng.uniform(0.0, 500.0),
+                mission_rng.uniform(0.0, 500.0),
+                mission_rng.uniform(low, high),
+            ))
+            for _ in range(max(workload // 10, 1))
+        ]
+
+        def _mission():
+            for my_alt, target_alt, distance in missions:
+                controller.calculate(label, my_alt, target_alt, distance)
+
+        _mission()
+        results.append(measure(f"{label}/mission.calculate", _mission, len(missions), repeat))
+
+    return results
+
+
+def run_benchmarks(
+    seed: int = DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+    workload: int = DEFAULT_WORKLOAD,
+    equipment_names: Optional[List[str]] = None,
+) -> Dict:
+    """등록된 모든 장비에 대해 측정을 수행하고 JSON 직렬화 가능한 결과를 반환한다."""
+
+    registry = EquipmentRegistry()
+    rng = random.Random(seed)
+    results: List[BenchmarkResult] = []
+    for equipment in registry:
+        if equipment_names and equipment.name not in equipment_names:
+            continue
+        results.extend(_equipment_cases(equipment, rng, workload, repeat))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "workload": workload,
+        },
+        "results": {result.name: result.to_dict() for result in results},
+    }
+
+
+def _legacy_name(name: str) -> Optional[str]:
+    for suffix, legacy in RENAMED_CASES.items():
+        if name.endswith(suffix):
+            return name[: -len(suffix)] + legacy
+    return None
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD):
+    """기준 결과 대비 중앙값이 ``threshold`` 비율 이상 느려진 항목을 찾는다."""
+
+    rows = []
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, current_stats in current.get("results", {}).items():
+        base_stats = base_results.get(name) or base_results.get(_legacy_name(name))
+        if not base_stats or not base_stats.get("median_us"):
+            rows.append((name, None, current_stats["median_us"], None))
+            continue
+        ratio = current_stats["median_us"] / base_stats["median_us"]
+        rows.append((name, base_stats["median_us"], current_stats["median_us"], ratio))
+        if ratio > 1.0 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_results(data: Dict) -> str:
+    lines = [f"{'항목':<48} {'median(us)':>12} {'min(us)':>12}"]
+    for name, stats in data["results"].items():
+        lines.append(f"{name:<48} {stats['median_us']:>12.2f} {stats['min_us']:>12.2f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows, regressions) -> str:
+    lines = [f"{'항목':<48} {'기준(us)':>12} {'현재(us)':>12} {'비율':>8}"]
+    for name, base, current, ratio in rows:
+        base_text = f"{base:>12.2f}" if base is not None else f"{'—':>12}"
+        ratio_text = f"{ratio:>8.2f}" if ratio is not None else f"{'new':>8}"
+        flag = "  ◀ 저하" if name in regressions else ""
+        lines.append(f"{name:<48} {base_text} {current:>12.2f} {ratio_text}{flag}")
+    lines.append(f"성능 저하 항목: {len(regressions)}개")
+    return "\n".join(lines)
+
+
+def _load_json(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AFCS 사거리표 엔진 성능 측정")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="측정을 실행합니다")
+    run_parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument("--workload", type=int, default=DEFAULT_WORKLOAD, help="테이블당 난수 거리 개수")
+    run_parser.add_argument("--equipment", action="append", help="측정할 장비 이름(반복 지정 가능)")
+    run_parser.add_argument("--baseline", help="측정 직후 비교할 기준 JSON 경로")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    compare_parser = sub.add_parser("compare", help="두 결과 JSON을 비교합니다")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows, regressions = compare_results(
+            _load_json(args.baseline), _load_json(args.current), args.threshold
+        )
+        print(format_comparison(rows, regressions))
+        return 1 if regressions else 0
+
+    data = run_benchmarks(
+        seed=args.seed,
+        repeat=args.repeat,
+        workload=args.workload,
+        equipment_names=args.equipment,
+    )
+    print(format_results(data))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        rows, regressions = compare_results(_load_json(args.baseline), data, args.threshold)
+        print()
+        print(format_comparison(rows, regressions))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
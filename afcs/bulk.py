@@ -0,0 +1,175 @@
+"""여러 목표 일괄 계산.
+
+CSV 파일이나 붙여 넣은 목록에서 목표(이름, 거리, 목표 고도)를 읽고, 한 장비에 대해
+일정 개수씩 묶어 ``find_solutions_batch``로 푼다. 묶음마다 결과를 내보내므로 GUI는
+작업 스레드에서 진행률을 갱신하고 중간에 취소할 수 있다.
+
+    python -m afcs.bulk M109A6 targets.csv --my-alt 120
+"""
+import argparse
+import csv
+import io
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.range_tables import find_solutions_batch, resolve_charges
+from afcs.records import Solution
+
+TRAJECTORIES = ("low", "high")
+DEFAULT_LIMIT = 3
+# 진행률을 알리는 단위. 묶음이 작을수록 자주 갱신되고 클수록 sweep 효율이 높다.
+CHUNK_TARGETS = 50
+
+
+@dataclass
+class BulkTarget:
+    """``target_alt``를 생략하면 사수 고도와 같은 것으로 본다."""
+
+    name: str
+    distance: float
+    target_alt: Optional[float] = None
+
+
+@dataclass
+class BulkResult:
+    index: int
+    target: BulkTarget
+    altitude_delta: float
+    low: List[Solution] = field(default_factory=list)
+    high: List[Solution] = field(default_factory=list)
+
+    def solutions(self, trajectory: str) -> List[Solution]:
+        return self.low if trajectory == "low" else self.high
+
+
+def parse_targets(text: str) -> List[BulkTarget]:
+    """CSV(``name,distance[,target_alt]`` 헤더) 또는 ``거리 [목표 고도]`` 줄 목록을 읽는다.
+
+    헤더가 없으면 쉼표·탭·공백으로 나눈 줄마다 숫자 한두 개를 읽고, 첫 칸이 숫자가
+    아니면 목표 이름으로 쓴다. 읽을 수 없는 줄은 ``ValueError``로 줄 번호를 알린다.
+    """
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+    header = [cell.strip().lower() for cell in next(csv.reader([lines[0]]))]
+    if "distance" in header:
+        # 정리한 헤더를 열 이름으로 써서 ``Name, Distance``처럼 쓴 헤더도 같은 키로 읽는다.
+        reader = csv.DictReader(
+            io.StringIO("\n".join(lines[1:])), fieldnames=header, skipinitialspace=True
+        )
+        targets = []
+        for i, row in enumerate(reader, start=1):
+            try:
+                altitude = (row.get("target_alt") or "").strip()
+                targets.append(
+                    BulkTarget(
+                        (row.get("name") or f"T{i}").strip(),
+                        float(row["distance"]),
+                        float(altitude) if altitude else None,
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"{i + 1}번째 줄을 읽을 수 없습니다") from None
+        return targets
+
+    targets = []
+    for i, line in enumerate(lines, start=1):
+        cells = line.replace(",", " ").replace("\t", " ").split()
+        name = f"T{i}"
+        try:
+            float(cells[0])
+        except ValueError:
+            name, cells = cells[0], cells[1:]
+        try:
+            if not 1 <= len(cells) <= 2:
+                raise ValueError
+            numbers = [float(cell) for cell in cells]
+        except ValueError:
+            raise ValueError(f"{i}번째 줄을 읽을 수 없습니다") from None
+        targets.append(BulkTarget(name, numbers[0], numbers[1] if len(numbers) > 1 else None))
+    return targets
+
+
+def iter_bulk_solutions(
+    targets: List[BulkTarget],
+    equipment: Equipment,
+    my_alt: float,
+    limit: int = DEFAULT_LIMIT,
+    chunk_size: int = CHUNK_TARGETS,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Iterator[List[BulkResult]]:
+    """목표를 ``chunk_size``개씩 풀어 묶음마다 결과 목록을 내보낸다.
+
+    ``should_cancel()``이 참이면 다음 묶음을 시작하지 않고 끝난다. 사거리표는
+    ``get_range_table`` 캐시를 함께 쓰므로 묶음이 여러 개여도 CSV는 다시 읽지 않는다.
+    """
+
+    charges = {trajectory: resolve_charges(equipment, trajectory) for trajectory in TRAJECTORIES}
+    for start in range(0, len(targets), chunk_size):
+        if should_cancel is not None and should_cancel():
+            return
+        chunk = targets[start:start + chunk_size]
+        results = [
+            BulkResult(
+                start + offset,
+                target,
+                my_alt - (my_alt if target.target_alt is None else target.target_alt),
+            )
+            for offset, target in enumerate(chunk)
+        ]
+        distances = [target.distance for target in chunk]
+        deltas = [result.altitude_delta for result in results]
+        for trajectory in TRAJECTORIES:
+            block = find_solutions_batch(
+                distances, deltas, trajectory, equipment, limit, charges[trajectory]
+            )
+            for result, solutions in zip(results, block):
+                result.solutions(trajectory).extend(solutions)
+        yield results
+
+
+def format_bulk(results: List[BulkResult]) -> str:
+    lines = [f"{'목표':<8} {'거리':>8} {'LOW CH':>6} {'MILL':>9} {'ETA':>6}  {'HIGH CH':>7} {'MILL':>9} {'ETA':>6}"]
+    for result in results:
+        cells = []
+        for trajectory, width in (("low", 6), ("high", 7)):
+            solutions = result.solutions(trajectory)
+            if solutions:
+                best = solutions[0]
+                cells.append(f"{best.charge:>{width}} {best.mill:>9.2f} {best.eta:>6.1f}")
+            else:
+                cells.append(f"{'—':>{width}} {'—':>9} {'—':>6}")
+        lines.append(f"{result.target.name:<8} {result.target.distance:>8g} " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="여러 목표 일괄 사격 제원 계산")
+    parser.add_argument("equipment", help="장비 이름(예: M109A6)")
+    parser.add_argument("targets", help="name,distance[,target_alt] CSV 또는 거리 목록 파일")
+    parser.add_argument("--my-alt", type=float, default=0.0, help="사수 고도(m)")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="탄도별 최대 해 개수")
+    args = parser.parse_args(argv)
+
+    equipment = EquipmentRegistry().get(args.equipment)
+    if equipment is None:
+        parser.error(f"'{args.equipment}' 장비 정보를 찾을 수 없습니다.")
+    try:
+        targets = parse_targets(Path(args.targets).read_text(encoding="utf-8"))
+    except ValueError as exc:
+        parser.error(f"{args.targets}: {exc}")
+    results = [
+        result
+        for chunk in iter_bulk_solutions(targets, equipment, args.my_alt, args.limit)
+        for result in chunk
+    ]
+    print(format_bulk(results))
+    return 0 if all(result.low or result.high for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
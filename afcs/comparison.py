@@ -0,0 +1,161 @@
+"""표적 하나에 대한 전 장비 비교.
+
+``EquipmentRegistry``의 모든 장비와 저각/고각 조합을 스레드 풀에서 동시에 풀고,
+사격 가능한 장비를 최단 ETA 순으로 정렬한 요약을 만든다. 사거리표는
+``get_range_table`` 캐시를 공유하므로 두 번째 비교부터는 CSV를 다시 읽지 않는다.
+
+    python -m afcs.comparison 12500 --altitude -40
+"""
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.range_tables import find_solutions, resolve_charges
+from afcs.records import Solution
+
+TRAJECTORIES = ("low", "high")
+DEFAULT_WORKERS = 8
+
+
+@dataclass
+class TrajectoryResult:
+    """장비·탄도 조합 하나의 계산 결과. 사거리표가 지원하는 모든 장약을 담는다."""
+
+    equipment: str
+    trajectory: str
+    solutions: List[Solution] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def best(self) -> Optional[Solution]:
+        """ETA가 가장 짧은 해."""
+
+        return min(self.solutions, key=lambda solution: solution.eta, default=None)
+
+
+@dataclass
+class ComparisonEntry:
+    """장비 하나의 비교 요약. ``best``는 두 탄도를 통틀어 ETA가 가장 짧은 해."""
+
+    equipment: str
+    results: Dict[str, TrajectoryResult] = field(default_factory=dict)
+
+    @property
+    def best(self) -> Optional[Solution]:
+        candidates = [
+            result.best.replace(trajectory=trajectory)
+            for trajectory, result in self.results.items()
+            if result.best is not None
+        ]
+        return min(candidates, key=lambda solution: solution.eta, default=None)
+
+    @property
+    def can_engage(self) -> bool:
+        return self.best is not None
+
+
+def solve_trajectory(
+    equipment: Equipment, trajectory: str, distance: float, altitude_delta: float
+) -> TrajectoryResult:
+    result = TrajectoryResult(equipment.name, trajectory)
+    try:
+        charges = resolve_charges(equipment, trajectory)
+        if charges:
+            result.solutions = find_solutions(
+                distance,
+                altitude_delta,
+                trajectory,
+                equipment=equipment,
+                limit=len(charges),
+                charges=charges,
+            )
+    except (OSError, ValueError) as e:
+        result.error = str(e)
+    return result
+
+
+def iter_comparison(
+    distance: float,
+    altitude_delta: float,
+    equipments: Optional[Iterable[Equipment]] = None,
+    max_workers: int = DEFAULT_WORKERS,
+) -> Iterator[TrajectoryResult]:
+    """장비·탄도 조합의 결과를 끝나는 순서대로 내보낸다."""
+
+    equipments = list(equipments if equipments is not None else EquipmentRegistry())
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="afcs-compare") as pool:
+        futures = [
+            pool.submit(solve_trajectory, equipment, trajectory, distance, altitude_delta)
+            for equipment in equipments
+            for trajectory in TRAJECTORIES
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def rank(results: Iterable[TrajectoryResult]) -> List[ComparisonEntry]:
+    """사격 가능한 장비를 최단 ETA 순으로, 불가능한 장비는 이름 순으로 뒤에 둔다."""
+
+    entries: Dict[str, ComparisonEntry] = {}
+    for result in results:
+        entry = entries.setdefault(result.equipment, ComparisonEntry(result.equipment))
+        entry.results[result.trajectory] = result
+
+    def _key(entry: ComparisonEntry):
+        best = entry.best
+        return (best is None, best.eta if best else 0.0, entry.equipment)
+
+    return sorted(entries.values(), key=_key)
+
+
+def compare_equipment(
+    distance: float,
+    altitude_delta: float,
+    equipments: Optional[Iterable[Equipment]] = None,
+    max_workers: int = DEFAULT_WORKERS,
+    on_result: Optional[Callable[[TrajectoryResult], None]] = None,
+) -> List[ComparisonEntry]:
+    """모든 장비를 동시에 풀어 순위가 매겨진 요약을 반환한다.
+
+    ``on_result``는 조합 하나가 끝날 때마다 작업 스레드에서 호출된다.
+    """
+
+    results = []
+    for result in iter_comparison(distance, altitude_delta, equipments, max_workers):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return rank(results)
+
+
+def format_ranking(entries: List[ComparisonEntry]) -> str:
+    lines = [f"{'순위':>4} {'장비':<8} {'탄도':<5} {'CH':>3} {'MILL':>10} {'ETA':>6}"]
+    for position, entry in enumerate(entries, start=1):
+        best = entry.best
+        if best is None:
+            lines.append(f"{'-':>4} {entry.equipment:<8} 지원 범위 밖")
+            continue
+        lines.append(
+            f"{position:>4} {entry.equipment:<8} {best.trajectory.upper():<5} "
+            f"{best.charge:>3} {best.mill:>10.2f} {best.eta:>6.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="표적 하나에 대한 전 장비 비교")
+    parser.add_argument("distance", type=float, help="사수-목표 거리(m)")
+    parser.add_argument("--altitude", type=float, default=0.0, help="사수 고도 - 목표 고도(m)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    entries = compare_equipment(args.distance, args.altitude, max_workers=args.workers)
+    print(format_ranking(entries))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
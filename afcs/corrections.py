@@ -0,0 +1,280 @@
+"""기상·탄도 보정 파이프라인.
+
+사거리표 보간으로 얻은 기본 밀(``base_mill``) 위에 고도, 거리 방향 바람, 측풍,
+기온, 장약 온도 보정을 단계별로 더한다. 단계는 지점 하나가 아니라 지점 묶음의
+열(column) 목록을 한 번에 처리하므로, 일괄 계산에서 보정을 켜도 지점당 비용은
+덧셈 몇 번만 늘어난다.
+
+보정 계수는 사거리표와 같은 폴더의
+``<prefix>_corrections_<trajectory>_<charge>.csv``에 둔다. 열은 ``range``와 다음 중
+필요한 것만 있으면 된다. 파일이나 열이 없으면 해당 단계는 건너뛴다.
+
+* ``range_wind``: 맞바람 1 m/s당 밀 수정량
+* ``cross_wind``: 오른쪽에서 부는 측풍 1 m/s당 편각 수정량(밀, +면 오른쪽)
+* ``air_temperature``: 기온이 표준(15℃)보다 1℃ 높을 때 밀 수정량
+* ``propellant_temperature``: 장약 온도가 표준(21℃)보다 1℃ 높을 때 밀 수정량
+"""
+import csv
+import math
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from afcs.equipment import Equipment
+
+STANDARD_AIR_TEMPERATURE = 15.0
+STANDARD_PROPELLANT_TEMPERATURE = 21.0
+COEFFICIENT_COLUMNS = ("range_wind", "cross_wind", "air_temperature", "propellant_temperature")
+MILS_PER_RADIAN = 6400.0 / (2.0 * math.pi)
+
+
+@dataclass
+class Conditions:
+    """지점 하나의 기상·장약 조건. 바람은 사격 방향 기준 성분(m/s)이다."""
+
+    head_wind: float = 0.0
+    # +면 오른쪽에서 왼쪽으로 분다.
+    cross_wind: float = 0.0
+    air_temperature: float = STANDARD_AIR_TEMPERATURE
+    propellant_temperature: float = STANDARD_PROPELLANT_TEMPERATURE
+
+    @classmethod
+    def from_wind(
+        cls,
+        speed: float,
+        direction_mils: float,
+        azimuth_mils: float,
+        air_temperature: float = STANDARD_AIR_TEMPERATURE,
+        propellant_temperature: float = STANDARD_PROPELLANT_TEMPERATURE,
+    ) -> "Conditions":
+        """풍속과 풍향(바람이 불어오는 방위, 밀)을 사격 방위각 기준 성분으로 나눈다."""
+
+        angle = (direction_mils - azimuth_mils) / MILS_PER_RADIAN
+        return cls(
+            head_wind=speed * math.cos(angle),
+            cross_wind=speed * math.sin(angle),
+            air_temperature=air_temperature,
+            propellant_temperature=propellant_temperature,
+        )
+
+
+class CorrectionTable:
+    """장비·탄도·장약 하나의 거리별 보정 계수. 계수는 거리에 대해 선형 보간한다."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        rows = []
+        with path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f, skipinitialspace=True)
+            fieldnames = reader.fieldnames or ()
+            if "range" not in fieldnames:
+                raise ValueError(f"{path.name}: range 열이 없습니다")
+            present = [name for name in COEFFICIENT_COLUMNS if name in fieldnames]
+            for row in reader:
+                try:
+                    rows.append(
+                        (float(row["range"]), tuple(float(row[name] or 0.0) for name in present))
+                    )
+                except (TypeError, ValueError):
+                    continue
+        rows.sort()
+        self.ranges = [distance for distance, _ in rows]
+        self.columns = {
+            name: [values[i] for _, values in rows] for i, name in enumerate(present)
+        }
+
+    def coefficients(self, distances: Sequence[float]) -> Dict[str, List[float]]:
+        """``distances``(오름차순 권장)에서의 모든 계수 열을 한 번의 훑기로 구한다.
+
+        표 밖의 거리는 가장 가까운 끝 값을 쓴다. 구간 가중치는 열마다 공유한다.
+        """
+
+        ranges = self.ranges
+        count = len(ranges)
+        names = list(self.columns)
+        result: Dict[str, List[float]] = {name: [] for name in names}
+        if not count:
+            for name in names:
+                result[name] = [0.0] * len(distances)
+            return result
+
+        sources = [self.columns[name] for name in names]
+        targets = [result[name] for name in names]
+        idx = 0
+        previous = None
+        for distance in distances:
+            lo = idx if previous is not None and distance >= previous else 0
+            idx = bisect_left(ranges, distance, lo)
+            previous = distance
+            if idx == 0 or count == 1:
+                for source, target in zip(sources, targets):
+                    target.append(source[0])
+            elif idx == count:
+                for source, target in zip(sources, targets):
+                    target.append(source[-1])
+            else:
+                lower = ranges[idx - 1]
+                ratio = (distance - lower) / (ranges[idx] - lower)
+                for source, target in zip(sources, targets):
+                    target.append(source[idx - 1] + ratio * (source[idx] - source[idx - 1]))
+        return result
+
+
+# 경로 -> (파일 수정 시각, CorrectionTable). 파일이 없으면 수정 시각 대신 None을 둔다.
+_CORRECTION_CACHE: Dict[Path, Tuple[Optional[int], Optional[CorrectionTable]]] = {}
+_CORRECTION_CACHE_LOCK = threading.Lock()
+
+
+def correction_table_path(equipment: Equipment, trajectory: str, charge: int) -> Path:
+    return equipment.range_table_dir / f"{equipment.prefix}_corrections_{trajectory}_{charge}.csv"
+
+
+def get_correction_table(
+    equipment: Equipment, trajectory: str, charge: int
+) -> Optional[CorrectionTable]:
+    """캐시된 보정표를 반환한다. 보정표 파일이 없으면 ``None``."""
+
+    path = correction_table_path(equipment, trajectory, charge)
+    try:
+        mtime: Optional[int] = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    cached = _CORRECTION_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _CORRECTION_CACHE_LOCK:
+        table = CorrectionTable(path) if mtime is not None else None
+        _CORRECTION_CACHE[path] = (mtime, table)
+        return table
+
+
+def clear_correction_cache():
+    _CORRECTION_CACHE.clear()
+
+
+class CorrectionBatch:
+    """보정 단계가 다루는 지점 묶음. 모든 값은 지점 순서대로 나란한 열이다."""
+
+    def __init__(
+        self,
+        distances: Sequence[float],
+        base_mills: Sequence[float],
+        diff100m: Sequence[float],
+        altitude_deltas: Sequence[float],
+        conditions: Optional[Sequence[Conditions]] = None,
+    ):
+        self.distances = distances
+        self.base_mills = base_mills
+        self.diff100m = diff100m
+        self.altitude_deltas = altitude_deltas
+        self.conditions = conditions
+        self.mills = list(base_mills)
+        self.deflections = [0.0] * len(base_mills)
+
+    def column(self, name: str) -> List[float]:
+        return [getattr(condition, name) for condition in self.conditions]
+
+
+# 단계: (묶음, 보정 계수 열) -> None. ``batch.mills``/``batch.deflections``를 갱신한다.
+Stage = Callable[[CorrectionBatch, Dict[str, List[float]]], None]
+
+
+def altitude_stage(batch: CorrectionBatch, coefficients: Dict[str, List[float]]):
+    mills = batch.mills
+    for i, (delta, diff100m) in enumerate(zip(batch.altitude_deltas, batch.diff100m)):
+        mills[i] = mills[i] + (delta / 100.0) * diff100m
+
+
+def _scaled_stage(column: str, attribute: str, target: str, standard: float = 0.0) -> Stage:
+    def stage(batch: CorrectionBatch, coefficients: Dict[str, List[float]]):
+        factors = coefficients.get(column)
+        if factors is None or batch.conditions is None:
+            return
+        values = getattr(batch, target)
+        for i, (factor, value) in enumerate(zip(factors, batch.column(attribute))):
+            values[i] += factor * (value - standard)
+
+    stage.__name__ = f"{column}_stage"
+    return stage
+
+
+range_wind_stage = _scaled_stage("range_wind", "head_wind", "mills")
+cross_wind_stage = _scaled_stage("cross_wind", "cross_wind", "deflections")
+air_temperature_stage = _scaled_stage(
+    "air_temperature", "air_temperature", "mills", STANDARD_AIR_TEMPERATURE
+)
+propellant_temperature_stage = _scaled_stage(
+    "propellant_temperature", "propellant_temperature", "mills", STANDARD_PROPELLANT_TEMPERATURE
+)
+
+
+class CorrectionPipeline:
+    """보정 단계를 순서대로 실행한다. ``stages``는 (이름, 단계) 목록이다."""
+
+    def __init__(self, stages: Optional[List[Tuple[str, Stage]]] = None):
+        self.stages: List[Tuple[str, Stage]] = list(stages or [])
+
+    def add_stage(self, name: str, stage: Stage, before: Optional[str] = None):
+        """단계를 추가한다. ``before``를 주면 그 이름의 단계 앞에 넣는다."""
+
+        if before is not None:
+            for i, (existing, _) in enumerate(self.stages):
+                if existing == before:
+                    self.stages.insert(i, (name, stage))
+                    return
+        self.stages.append((name, stage))
+
+    def apply(
+        self,
+        equipment: Equipment,
+        trajectory: str,
+        charge: int,
+        distances: Sequence[float],
+        base_mills: Sequence[float],
+        diff100m: Sequence[float],
+        altitude_deltas: Sequence[float],
+        conditions: Optional[Sequence[Conditions]] = None,
+    ) -> CorrectionBatch:
+        """같은 장약의 지점 묶음에 보정을 적용한다.
+
+        결과는 ``batch.mills``(최종 밀)와 ``batch.deflections``(편각 수정량, 밀)이다.
+        ``conditions``가 없으면 보정표를 열지 않고 고도 보정만 한다.
+        """
+
+        batch = CorrectionBatch(distances, base_mills, diff100m, altitude_deltas, conditions)
+        coefficients: Dict[str, List[float]] = {}
+        if conditions is not None:
+            table = get_correction_table(equipment, trajectory, charge)
+            if table is not None:
+                coefficients = table.coefficients(distances)
+        for _, stage in self.stages:
+            stage(batch, coefficients)
+        return batch
+
+
+DEFAULT_PIPELINE = CorrectionPipeline(
+    [
+        ("altitude", altitude_stage),
+        ("range_wind", range_wind_stage),
+        ("cross_wind", cross_wind_stage),
+        ("air_temperature", air_temperature_stage),
+        ("propellant_temperature", propellant_temperature_stage),
+    ]
+)
+
+
+def broadcast(
+    conditions: Union[None, Conditions, Sequence[Conditions]], count: int
+) -> Optional[List[Conditions]]:
+    """단일 조건이면 지점 수만큼 늘리고, 목록이면 그대로 쓴다."""
+
+    if conditions is None:
+        return None
+    if isinstance(conditions, Conditions):
+        return [conditions] * count
+    conditions = list(conditions)
+    if len(conditions) != count:
+        raise ValueError("조건 개수가 지점 수와 다릅니다")
+    return conditions
@@ -0,0 +1,93 @@
+"""장약별 사거리 커버리지 곡선 표본.
+
+차트가 장비·탄도 하나의 모든 장약에 대해 거리-밀, 거리-ETA 곡선을 그릴 수 있도록
+각 사거리표 범위를 고른 간격으로 ``RangeTable.sweep`` 한 번에 훑어 표본을 만든다.
+표본은 (사거리표 폴더, 탄도) 단위로 캐시하고, 표가 다시 읽히면 새로 만든다.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from afcs.equipment import Equipment
+from afcs.range_tables import RangeTable, get_range_table, resolve_charges
+
+CURVE_POINTS = 120
+
+
+@dataclass
+class ChargeCurve:
+    charge: int
+    distances: List[float] = field(default_factory=list)
+    mills: List[float] = field(default_factory=list)
+    etas: List[float] = field(default_factory=list)
+
+    @property
+    def min_range(self) -> float:
+        return self.distances[0]
+
+    @property
+    def max_range(self) -> float:
+        return self.distances[-1]
+
+
+@dataclass
+class CoverageCurves:
+    """장비·탄도 하나의 장약별 곡선과 전체 축 범위."""
+
+    equipment: str
+    trajectory: str
+    curves: List[ChargeCurve] = field(default_factory=list)
+    tables: Dict[int, RangeTable] = field(default_factory=dict, repr=False)
+
+    def bounds(self, key: str) -> Tuple[float, float]:
+        values = [value for curve in self.curves for value in getattr(curve, key)]
+        return (min(values), max(values)) if values else (0.0, 1.0)
+
+    def covering(self, distance: float) -> List[int]:
+        return [curve.charge for curve in self.curves if curve.min_range <= distance <= curve.max_range]
+
+
+_CURVE_CACHE: Dict[Tuple[Path, str], CoverageCurves] = {}
+
+
+def _sample_table(table: RangeTable, points: int) -> ChargeCurve:
+    curve = ChargeCurve(table.charge)
+    low, high = table.min_range, table.max_range
+    if points < 2 or high <= low:
+        distances = [low]
+    else:
+        step = (high - low) / (points - 1)
+        distances = [low + step * i for i in range(points - 1)] + [high]
+    for distance, result in zip(distances, table.sweep(distances, 0.0)):
+        curve.distances.append(distance)
+        curve.mills.append(result.mill)
+        curve.etas.append(result.eta)
+    return curve
+
+
+def sample_curves(
+    equipment: Equipment, trajectory: str, points: int = CURVE_POINTS
+) -> CoverageCurves:
+    """장비·탄도의 장약별 곡선을 반환한다. 표가 바뀌지 않았으면 캐시된 객체를 그대로 준다."""
+
+    key = (equipment.range_table_dir, trajectory)
+    charges = resolve_charges(equipment, trajectory)
+    tables: Dict[int, RangeTable] = {}
+    for charge in charges:
+        try:
+            table = get_range_table(equipment, trajectory, charge)
+        except FileNotFoundError:
+            continue
+        if table.rows:
+            tables[charge] = table
+
+    cached: Optional[CoverageCurves] = _CURVE_CACHE.get(key)
+    if cached is not None and cached.tables.keys() == tables.keys() and all(
+        cached.tables[charge] is table for charge, table in tables.items()
+    ):
+        return cached
+
+    coverage = CoverageCurves(equipment.name, trajectory, tables=tables)
+    coverage.curves = [_sample_table(tables[charge], points) for charge in sorted(tables)]
+    _CURVE_CACHE[key] = coverage
+    return coverage
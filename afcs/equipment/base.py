@@ -1,20 +1,34 @@
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence
 
 
 # 프로젝트 루트의 rangeTables 디렉터리(장비별 서브폴더 보관)를 가리킨다.
 RANGE_TABLE_ROOT = Path(__file__).resolve().parent.parent.parent / "rangeTables"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Equipment:
-    """데이터 파일 경로와 사격 설정을 보유하는 장비 모델."""
+    """데이터 파일 경로와 사격 설정을 보유하는 장비 모델.
+
+    여러 스레드가 레지스트리 스냅숏을 통해 함께 읽으므로 만든 뒤에는 바꾸지 않는다.
+    설정이 다르면 ``dataclasses.replace``로 새 객체를 만든다.
+    """
 
     name: str
     prefix: str
     display_name: Optional[str] = None
-    charges_override: Dict[str, Optional[List[int]]] = field(default_factory=dict)
+    charges_override: Mapping[str, Optional[Sequence[int]]] = field(default_factory=dict)
+    # 지정하면 기본 rangeTables 대신 이 경로 아래의 ``<prefix>`` 폴더를 사용한다.
+    table_root: Optional[Path] = None
+
+    def __post_init__(self):
+        overrides = {
+            trajectory: tuple(charges) if charges is not None else None
+            for trajectory, charges in self.charges_override.items()
+        }
+        object.__setattr__(self, "charges_override", MappingProxyType(overrides))
 
     @property
     def label(self) -> str:
@@ -22,7 +36,7 @@ class Equipment:
 
     @property
     def range_table_dir(self) -> Path:
-        return RANGE_TABLE_ROOT / self.prefix
+        return (self.table_root or RANGE_TABLE_ROOT) / self.prefix
 
     def ensure_range_table_dir(self) -> Path:
         path = self.range_table_dir
@@ -1,23 +1,43 @@
 import importlib
 import pkgutil
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional, Tuple
 
 from .base import Equipment
 
 
+class RegistrySnapshot:
+    """장비 목록의 불변 스냅숏. 이름순으로 정렬되어 있다."""
+
+    __slots__ = ("equipments", "names", "by_name")
+
+    def __init__(self, equipments: Iterable[Equipment]):
+        ordered = sorted(equipments, key=lambda equipment: equipment.name)
+        self.equipments: Tuple[Equipment, ...] = tuple(ordered)
+        self.names: Tuple[str, ...] = tuple(equipment.name for equipment in ordered)
+        self.by_name: Mapping[str, Equipment] = MappingProxyType(
+            {equipment.name: equipment for equipment in ordered}
+        )
+
+
 class EquipmentRegistry:
-    """패키지 내부의 장비 정의를 동적으로 탐색합니다."""
+    """패키지 내부의 장비 정의를 동적으로 탐색합니다.
+
+    장비 목록은 ``RegistrySnapshot``으로 게시됩니다. ``refresh``는 새 스냅숏을 따로
+    만든 뒤 참조 하나를 바꿔 끼우므로, 다른 스레드는 잠금 없이 읽어도 반쯤 갱신된
+    목록을 보지 않습니다.
+    """
 
     def __init__(self):
         self._package = __package__
         self._root = Path(__file__).parent
-        self._equipments: Dict[str, Equipment] = {}
+        self._snapshot = RegistrySnapshot(())
         self.refresh()
 
     def refresh(self):
         """패키지 내 장비 모듈을 다시 스캔합니다."""
-        equipments: Dict[str, Equipment] = {}
+        equipments = {}
         for module_info in pkgutil.iter_modules([str(self._root)]):
             if module_info.name.startswith("__") or module_info.name in {"base", "registry"}:
                 continue
@@ -26,18 +46,22 @@ class EquipmentRegistry:
             if isinstance(equipment, Equipment):
                 equipments[equipment.name] = equipment
                 equipment.ensure_range_table_dir()
-        self._equipments = dict(sorted(equipments.items(), key=lambda item: item[0]))
+        self._snapshot = RegistrySnapshot(equipments.values())
+
+    def snapshot(self) -> RegistrySnapshot:
+        """현재 스냅숏. 여러 값을 함께 읽을 때 이것을 한 번 받아 쓰면 서로 일관됩니다."""
+        return self._snapshot
 
     @property
     def equipments(self) -> List[Equipment]:
-        return list(self._equipments.values())
+        return list(self._snapshot.equipments)
 
     @property
     def names(self) -> List[str]:
-        return list(self._equipments.keys())
+        return list(self._snapshot.names)
 
     def get(self, name: str) -> Optional[Equipment]:
-        return self._equipments.get(name)
+        return self._snapshot.by_name.get(name)
 
     def __iter__(self) -> Iterable[Equipment]:
-        return iter(self._equipments.values())
+        return iter(self._snapshot.equipments)
@@ -0,0 +1,425 @@
+"""저장해 두고 다시 쓰는 사격 계획.
+
+목표 목록과 계산한 해를 파일 하나에 저장한다. 첫 줄(머리)은 JSON으로 장비, 사수 고도,
+탄도별 장약 목록과 결과가 기대는 표마다의 내용 해시(1차원 표, 있으면 2차원 표와
+보정표까지)·사거리 범위를 두고, 나머지는 목표마다 한 행인 CSV로 해와 탄도별
+``depth``를 둔다.
+
+장약은 번호 순으로 시도하므로 한 목표의 결과는 ``depth``번째 장약까지의 표에만
+기댄다(``limit``개를 채운 장약까지, 못 채웠으면 모든 장약). 계획을 다시 열면 표 해시를
+비교해, 바뀐 표를 들여다봤고 거리가 그 표의 예전·새 사거리 범위 안에 있는 목표만 다시
+계산한다. 장약 목록 자체가 바뀐 탄도는 모두 다시 계산한다.
+
+    python -m afcs.fire_plan create M109A6 targets.csv mission.plan --my-alt 120
+    python -m afcs.fire_plan refresh mission.plan
+    python -m afcs.fire_plan show mission.plan
+"""
+import argparse
+import csv
+import dataclasses
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from afcs.altitude_grid import grid_path_for
+from afcs.bulk import BulkTarget, format_bulk, parse_targets
+from afcs.corrections import Conditions, correction_table_path
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.range_tables import _table_path, find_solutions_batch, get_range_table, resolve_charges
+from afcs.records import Solution
+
+FORMAT_VERSION = 1
+TRAJECTORIES = ("low", "high")
+DEFAULT_LIMIT = 3
+# 한 번에 find_solutions_batch로 넘기는 목표 수
+CHUNK_TARGETS = 5000
+BUFFER_SIZE = 1 << 16
+BODY_COLUMNS = ("name", "distance", "target_alt", "low_depth", "high_depth", "low", "high")
+
+# (min_range, max_range). 표 파일이 없으면 None.
+Bounds = Optional[Tuple[float, float]]
+
+
+class PlanEntry:
+    """목표 하나의 결과. ``depth[trajectory]``는 결과를 정할 때 들여다본 마지막 장약의 순번이다.
+
+    파일에서 읽은 해는 글자 그대로 두었다가 ``low``/``high``를 처음 읽을 때 풀고,
+    다시 계산하지 않은 목표는 저장할 때도 그 글자를 그대로 쓴다.
+    """
+
+    __slots__ = ("index", "target", "altitude_delta", "depth", "_texts", "_low", "_high")
+
+    def __init__(
+        self,
+        index: int,
+        target: BulkTarget,
+        altitude_delta: float,
+        depth: Optional[Dict[str, int]] = None,
+        texts: Tuple[Optional[str], Optional[str]] = (None, None),
+    ):
+        self.index = index
+        self.target = target
+        self.altitude_delta = altitude_delta
+        self.depth = depth if depth is not None else {}
+        # 탄도별 저장 글자. None이면 그 탄도의 해는 목록 쪽이 최신이다.
+        self._texts = list(texts)
+        self._low: Optional[List[Solution]] = None
+        self._high: Optional[List[Solution]] = None
+
+    @property
+    def low(self) -> List[Solution]:
+        if self._low is None:
+            self._low = _decode(self._texts[0] or "")
+        return self._low
+
+    @property
+    def high(self) -> List[Solution]:
+        if self._high is None:
+            self._high = _decode(self._texts[1] or "")
+        return self._high
+
+    def solutions(self, trajectory: str) -> List[Solution]:
+        return self.low if trajectory == "low" else self.high
+
+    def set_solutions(self, trajectory: str, solutions: List[Solution]):
+        if trajectory == "low":
+            self._low, self._texts[0] = solutions, None
+        else:
+            self._high, self._texts[1] = solutions, None
+
+    def texts(self) -> Tuple[str, str]:
+        """저장할 (저각, 고각) 글자. 다시 계산한 탄도만 새로 만든다."""
+
+        low, high = self._texts
+        return (
+            _encode(self.low) if low is None else low,
+            _encode(self.high) if high is None else high,
+        )
+
+
+@dataclass
+class FirePlan:
+    equipment: str
+    my_alt: float
+    limit: int = DEFAULT_LIMIT
+    conditions: Optional[Conditions] = None
+    entries: List[PlanEntry] = field(default_factory=list)
+    # 탄도 -> 계산할 때의 장약 목록
+    charges: Dict[str, List[int]] = field(default_factory=dict)
+    # "탄도/장약" -> 표 내용 해시
+    hashes: Dict[str, str] = field(default_factory=dict)
+    # "탄도/장약" -> 계산할 때의 사거리 범위
+    bounds: Dict[str, Bounds] = field(default_factory=dict)
+
+
+@dataclass
+class RefreshReport:
+    changed_tables: List[str] = field(default_factory=list)
+    # 탄도 -> 다시 계산한 목표 수
+    recomputed: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.recomputed.values())
+
+
+def _table_key(trajectory: str, charge: int) -> str:
+    return f"{trajectory}/{charge}"
+
+
+def table_hash(
+    equipment: Equipment, trajectory: str, charge: int, with_corrections: bool = False
+) -> str:
+    """장약 하나의 결과에 영향을 주는 파일들의 내용 해시. 파일이 없으면 그 자리를 비워 둔다."""
+
+    table = _table_path(equipment, trajectory, charge)
+    paths = [table, grid_path_for(table)]
+    if with_corrections:
+        paths.append(correction_table_path(equipment, trajectory, charge))
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            digest.update(path.read_bytes())
+        except FileNotFoundError:
+            digest.update(b"-")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _table_bounds(equipment: Equipment, trajectory: str, charge: int) -> Bounds:
+    try:
+        table = get_range_table(equipment, trajectory, charge)
+    except FileNotFoundError:
+        return None
+    if not table.rows:
+        return None
+    return table.min_range, table.max_range
+
+
+def _scan_tables(equipment: Equipment, trajectory: str, charges: List[int], with_corrections: bool):
+    """탄도 하나의 장약별 (해시, 사거리 범위)."""
+
+    hashes: Dict[str, str] = {}
+    bounds: Dict[str, Bounds] = {}
+    for charge in charges:
+        key = _table_key(trajectory, charge)
+        hashes[key] = table_hash(equipment, trajectory, charge, with_corrections)
+        bounds[key] = _table_bounds(equipment, trajectory, charge)
+    return hashes, bounds
+
+
+def _encode(solutions: List[Solution]) -> str:
+    """해 목록을 ``장약 밀 ETA 기준밀 diff100m[ 편각]``을 ``;``로 이은 한 칸으로 만든다."""
+
+    cells = []
+    for solution in solutions:
+        values = [solution.charge, solution.mill, solution.eta, solution.base_mill, solution.diff100m]
+        if solution.deflection is not None:
+            values.append(solution.deflection)
+        cells.append(" ".join(map(repr, values)))
+    return ";".join(cells)
+
+
+def _decode(text: str) -> List[Solution]:
+    solutions = []
+    for cell in text.split(";") if text else ():
+        charge, mill, eta, base_mill, diff100m, *rest = cell.split(" ")
+        solutions.append(
+            Solution(
+                float(mill),
+                float(eta),
+                int(charge),
+                float(base_mill),
+                float(diff100m),
+                float(rest[0]) if rest else None,
+            )
+        )
+    return solutions
+
+
+def _solve(
+    entries: List[PlanEntry],
+    trajectory: str,
+    equipment: Equipment,
+    charges: List[int],
+    limit: int,
+    conditions: Optional[Conditions],
+):
+    """``entries``의 ``trajectory`` 결과와 ``depth``를 다시 채운다."""
+
+    position = {charge: i for i, charge in enumerate(charges)}
+    last = len(charges) - 1
+    for start in range(0, len(entries), CHUNK_TARGETS):
+        chunk = entries[start:start + CHUNK_TARGETS]
+        block = find_solutions_batch(
+            [entry.target.distance for entry in chunk],
+            [entry.altitude_delta for entry in chunk],
+            trajectory,
+            equipment,
+            limit,
+            charges,
+            conditions,
+        )
+        for entry, solutions in zip(chunk, block):
+            entry.set_solutions(trajectory, solutions)
+            entry.depth[trajectory] = (
+                position[solutions[-1].charge] if len(solutions) >= limit else last
+            )
+
+
+def _altitude_delta(my_alt: float, target: BulkTarget) -> float:
+    return my_alt - (my_alt if target.target_alt is None else target.target_alt)
+
+
+def build_plan(
+    targets: Iterable[BulkTarget],
+    equipment: Equipment,
+    my_alt: float,
+    limit: int = DEFAULT_LIMIT,
+    conditions: Optional[Conditions] = None,
+) -> FirePlan:
+    """모든 목표를 계산해 새 계획을 만든다."""
+
+    plan = FirePlan(equipment.name, my_alt, limit, conditions)
+    plan.entries = [
+        PlanEntry(index, target, _altitude_delta(my_alt, target)) for index, target in enumerate(targets)
+    ]
+    for trajectory in TRAJECTORIES:
+        charges = resolve_charges(equipment, trajectory)
+        hashes, bounds = _scan_tables(equipment, trajectory, charges, conditions is not None)
+        plan.charges[trajectory] = charges
+        plan.hashes.update(hashes)
+        plan.bounds.update(bounds)
+        _solve(plan.entries, trajectory, equipment, charges, limit, conditions)
+    return plan
+
+
+def _inside(distance: float, bounds: Bounds) -> bool:
+    return bounds is not None and bounds[0] <= distance <= bounds[1]
+
+
+def refresh_plan(plan: FirePlan, equipment: Equipment) -> RefreshReport:
+    """표가 바뀐 뒤 영향을 받는 목표만 다시 계산하고 머리의 장약 목록·해시·범위를 갱신한다.
+
+    바뀐 장약 ``c``(순번 ``i``)에 대해 ``depth >= i``이고 거리가 ``c``의 예전 범위나 새 범위
+    안에 있는 목표만 다시 푼다. 두 범위 밖의 목표에는 그 표가 전후 모두 해를 내지 않았고,
+    ``depth < i``인 목표는 ``c``를 보기 전에 ``limit``개를 채웠기 때문이다.
+    """
+
+    report = RefreshReport()
+    with_corrections = plan.conditions is not None
+    for trajectory in TRAJECTORIES:
+        charges = resolve_charges(equipment, trajectory)
+        hashes, bounds = _scan_tables(equipment, trajectory, charges, with_corrections)
+        if charges != plan.charges.get(trajectory):
+            # 장약이 늘거나 줄면 순번이 바뀌므로 깊이로는 가를 수 없다.
+            report.changed_tables.append(
+                f"{trajectory}: 장약 목록 {plan.charges.get(trajectory)} -> {charges}"
+            )
+            dirty = plan.entries
+        else:
+            changed = []
+            for i, charge in enumerate(charges):
+                key = _table_key(trajectory, charge)
+                if plan.hashes.get(key) != hashes[key]:
+                    changed.append((i, plan.bounds.get(key), bounds[key]))
+                    report.changed_tables.append(key)
+            if not changed:
+                report.recomputed[trajectory] = 0
+                continue
+            dirty = [
+                entry
+                for entry in plan.entries
+                if any(
+                    entry.depth.get(trajectory, i) >= i
+                    and (_inside(entry.target.distance, old) or _inside(entry.target.distance, new))
+                    for i, old, new in changed
+                )
+            ]
+        _solve(dirty, trajectory, equipment, charges, plan.limit, plan.conditions)
+        report.recomputed[trajectory] = len(dirty)
+        plan.charges[trajectory] = charges
+        for table_map, current in ((plan.hashes, hashes), (plan.bounds, bounds)):
+            for key in [key for key in table_map if key.startswith(f"{trajectory}/")]:
+                del table_map[key]
+            table_map.update(current)
+    return report
+
+
+def save_plan(plan: FirePlan, path: Path):
+    """첫 줄은 JSON 머리, 나머지는 ``BODY_COLUMNS`` CSV다."""
+
+    header = {
+        "format": FORMAT_VERSION,
+        "equipment": plan.equipment,
+        "my_alt": plan.my_alt,
+        "limit": plan.limit,
+        "conditions": dataclasses.asdict(plan.conditions) if plan.conditions else None,
+        "charges": plan.charges,
+        "hashes": plan.hashes,
+        "bounds": plan.bounds,
+    }
+    with Path(path).open("w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as out:
+        out.write(json.dumps(header, ensure_ascii=False) + "\n")
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(BODY_COLUMNS)
+        writer.writerows(
+            (
+                entry.target.name,
+                repr(entry.target.distance),
+                "" if entry.target.target_alt is None else repr(entry.target.target_alt),
+                entry.depth.get("low", ""),
+                entry.depth.get("high", ""),
+                *entry.texts(),
+            )
+            for entry in plan.entries
+        )
+
+
+def load_plan(path: Path) -> FirePlan:
+    """계획 파일을 읽는다. 해는 처음 쓸 때 풀므로 갱신만 할 때는 거리·고도·깊이만 읽는다."""
+
+    with Path(path).open("r", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 계획 파일 형식입니다: {header.get('format')}")
+        conditions = header.get("conditions")
+        plan = FirePlan(
+            header["equipment"],
+            header["my_alt"],
+            header["limit"],
+            Conditions(**conditions) if conditions else None,
+            charges=header["charges"],
+            hashes=header["hashes"],
+            bounds={key: tuple(value) if value else None for key, value in header["bounds"].items()},
+        )
+        reader = csv.reader(f)
+        columns = next(reader, None)
+        if tuple(columns or ()) != BODY_COLUMNS:
+            raise ValueError(f"계획 파일의 열이 {','.join(BODY_COLUMNS)}가 아닙니다")
+        my_alt = plan.my_alt
+        entries = plan.entries
+        for index, (name, distance, target_alt, low_depth, high_depth, low, high) in enumerate(reader):
+            target = BulkTarget(name, float(distance), float(target_alt) if target_alt else None)
+            depth = {}
+            if low_depth:
+                depth["low"] = int(low_depth)
+            if high_depth:
+                depth["high"] = int(high_depth)
+            entries.append(PlanEntry(index, target, _altitude_delta(my_alt, target), depth, (low, high)))
+    return plan
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="저장된 사격 계획 만들기·갱신")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="목표 파일로 새 계획을 만든다")
+    create.add_argument("equipment", help="장비 이름(예: M109A6)")
+    create.add_argument("targets", help="name,distance[,target_alt] CSV 또는 거리 목록 파일")
+    create.add_argument("plan", help="저장할 계획 파일")
+    create.add_argument("--my-alt", type=float, default=0.0, help="사수 고도(m)")
+    create.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="탄도별 최대 해 개수")
+    refresh = commands.add_parser("refresh", help="바뀐 표에 기대는 목표만 다시 계산한다")
+    refresh.add_argument("plan")
+    show = commands.add_parser("show", help="계획의 목표별 첫 번째 해를 출력한다")
+    show.add_argument("plan")
+    args = parser.parse_args(argv)
+
+    registry = EquipmentRegistry()
+    if args.command == "create":
+        equipment = registry.get(args.equipment)
+        if equipment is None:
+            parser.error(f"'{args.equipment}' 장비 정보를 찾을 수 없습니다.")
+        try:
+            targets = parse_targets(Path(args.targets).read_text(encoding="utf-8"))
+        except ValueError as exc:
+            parser.error(f"{args.targets}: {exc}")
+        plan = build_plan(targets, equipment, args.my_alt, args.limit)
+        save_plan(plan, Path(args.plan))
+        print(f"목표 {len(plan.entries)}개를 계산해 {args.plan}에 저장했습니다")
+        return 0
+
+    plan = load_plan(Path(args.plan))
+    if args.command == "show":
+        print(format_bulk(plan.entries))
+        return 0
+
+    equipment = registry.get(plan.equipment)
+    if equipment is None:
+        parser.error(f"'{plan.equipment}' 장비 정보를 찾을 수 없습니다.")
+    report = refresh_plan(plan, equipment)
+    if report.changed_tables:
+        print("바뀐 표: " + ", ".join(report.changed_tables))
+        save_plan(plan, Path(args.plan))
+    print(
+        f"목표 {len(plan.entries)}개 중 {report.total}건 다시 계산 "
+        + " ".join(f"{trajectory.upper()} {count}" for trajectory, count in report.recomputed.items())
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
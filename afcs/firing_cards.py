@@ -0,0 +1,242 @@
+"""사격 제원 카드(거리별 밀·ETA 일람표) 생성.
+
+장비의 모든 장약·탄도에 대해 일정 간격의 거리 격자를 ``RangeTable.sweep``으로 한 번에
+훑고, 결과를 메모리에 모으지 않은 채 CSV, JSONL 또는 단일 HTML 파일로 내보낸다.
+
+    python -m afcs.firing_cards M109A6 --start 1000 --stop 20000 --step 10 -o cards.html
+    python -m afcs.firing_cards M119 --altitude 150 --format csv -o m119_150.csv
+"""
+import argparse
+import csv
+import html
+import json
+import math
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.range_tables import available_charges, get_range_table
+
+TRAJECTORIES = ("low", "high")
+FORMATS = ("csv", "jsonl", "html")
+FIELDS = ("trajectory", "charge", "range", "mill", "eta")
+DEFAULT_STEP = 10.0
+# 파일에 한 번에 쓰는 행 수. 행마다 write를 호출하지 않도록 묶어서 내보낸다.
+CHUNK_ROWS = 2000
+
+
+def grid(start: float, stop: float, step: float) -> List[float]:
+    """``start``부터 ``stop``까지(포함) ``step`` 간격의 거리 목록."""
+
+    if step <= 0:
+        raise ValueError("간격은 0보다 커야 합니다")
+    if stop < start:
+        return []
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    return [start + step * i for i in range(count)]
+
+
+def _clip(distances: List[float], low: float, high: float) -> List[float]:
+    """격자에서 사거리표가 지원하는 구간만 남긴다(격자 값은 그대로 유지)."""
+
+    return distances[bisect_left(distances, low):bisect_right(distances, high)]
+
+
+def sweep_equipment(
+    equipment: Equipment,
+    start: float,
+    stop: float,
+    step: float = DEFAULT_STEP,
+    altitude_delta: float = 0.0,
+    trajectories: Sequence[str] = TRAJECTORIES,
+    charges: Optional[Iterable[int]] = None,
+) -> Iterator[Dict]:
+    """탄도 → 장약 → 거리 순으로 카드 행을 하나씩 내보낸다.
+
+    각 장약은 자기 사거리표가 지원하는 격자 지점만 포함한다.
+    """
+
+    distances = grid(start, stop, step)
+    wanted = set(charges) if charges is not None else None
+    for trajectory in trajectories:
+        for charge in available_charges(equipment, trajectory):
+            if wanted is not None and charge not in wanted:
+                continue
+            table = get_range_table(equipment, trajectory, charge)
+            if not table.rows:
+                continue
+            covered = _clip(distances, table.min_range, table.max_range)
+            for distance, result in zip(covered, table.sweep(covered, altitude_delta)):
+                yield {
+                    "trajectory": trajectory,
+                    "charge": charge,
+                    "range": distance,
+                    "mill": result.mill,
+                    "eta": result.eta,
+                }
+
+
+def _format_row(row: Dict) -> tuple:
+    return (
+        row["trajectory"],
+        row["charge"],
+        f"{row['range']:g}",
+        f"{row['mill']:.2f}",
+        f"{row['eta']:.1f}",
+    )
+
+
+def _chunks(rows: Iterable[Dict], size: int = CHUNK_ROWS) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(rows: Iterable[Dict], out: TextIO) -> int:
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(FIELDS)
+    count = 0
+    for chunk in _chunks(rows):
+        writer.writerows(_format_row(row) for row in chunk)
+        count += len(chunk)
+    return count
+
+
+def write_jsonl(rows: Iterable[Dict], out: TextIO) -> int:
+    count = 0
+    for chunk in _chunks(rows):
+        out.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk))
+        count += len(chunk)
+    return count
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 16px; color: #111; }}
+h1 {{ font-size: 18px; }}
+h2 {{ font-size: 15px; margin: 20px 0 6px; page-break-before: auto; }}
+table {{ border-collapse: collapse; font-size: 12px; }}
+th, td {{ border: 1px solid #999; padding: 2px 8px; text-align: right; }}
+th {{ background: #eee; }}
+section {{ page-break-inside: avoid; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+"""
+_HTML_TABLE_OPEN = (
+    "<section>\n<h2>{trajectory} / 장약 {charge}</h2>\n"
+    "<table>\n<tr><th>거리(m)</th><th>밀</th><th>ETA(s)</th></tr>\n"
+)
+_HTML_TABLE_CLOSE = "</table>\n</section>\n"
+_HTML_FOOT = "</body>\n</html>\n"
+
+
+def write_html(rows: Iterable[Dict], out: TextIO, title: str = "사격 제원 카드") -> int:
+    """장약·탄도마다 표 하나를 갖는 단일 HTML 문서를 쓴다. 외부 파일을 참조하지 않는다."""
+
+    out.write(_HTML_HEAD.format(title=html.escape(title)))
+    count = 0
+    current = None
+    for chunk in _chunks(rows):
+        parts = []
+        for row in chunk:
+            key = (row["trajectory"], row["charge"])
+            if key != current:
+                if current is not None:
+                    parts.append(_HTML_TABLE_CLOSE)
+                parts.append(_HTML_TABLE_OPEN.format(trajectory=key[0].upper(), charge=key[1]))
+                current = key
+            _, _, distance, mill, eta = _format_row(row)
+            parts.append(f"<tr><td>{distance}</td><td>{mill}</td><td>{eta}</td></tr>\n")
+        out.write("".join(parts))
+        count += len(chunk)
+    if current is not None:
+        out.write(_HTML_TABLE_CLOSE)
+    out.write(_HTML_FOOT)
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "html": write_html}
+
+
+def export_cards(
+    equipment: Equipment,
+    path: Path,
+    fmt: str = "html",
+    start: float = 0.0,
+    stop: float = 100000.0,
+    step: float = DEFAULT_STEP,
+    altitude_delta: float = 0.0,
+    trajectories: Sequence[str] = TRAJECTORIES,
+) -> int:
+    """카드를 ``path``에 저장하고 기록한 행 수를 반환한다."""
+
+    if fmt not in WRITERS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    rows = sweep_equipment(equipment, start, stop, step, altitude_delta, trajectories)
+    with Path(path).open("w", encoding="utf-8", newline="") as out:
+        if fmt == "html":
+            title = f"{equipment.name} 사격 제원 카드 (고도차 {altitude_delta:g} m, {step:g} m 간격)"
+            return write_html(rows, out, title)
+        return WRITERS[fmt](rows, out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="장비별 사격 제원 카드 생성")
+    parser.add_argument("equipment", help="장비 이름(예: M109A6)")
+    parser.add_argument("--start", type=float, default=0.0, help="시작 거리(m)")
+    parser.add_argument("--stop", type=float, default=100000.0, help="끝 거리(m)")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP, help="거리 간격(m)")
+    parser.add_argument("--altitude", type=float, default=0.0, help="사수 고도 - 목표 고도(m)")
+    parser.add_argument("--trajectory", action="append", choices=TRAJECTORIES)
+    parser.add_argument("--format", choices=FORMATS, help="출력 형식(기본: 파일 확장자 또는 csv)")
+    parser.add_argument("-o", "--output", help="저장 경로(생략하면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    equipment = EquipmentRegistry().get(args.equipment)
+    if equipment is None:
+        print(f"장비를 찾을 수 없습니다: {args.equipment}")
+        return 1
+    trajectories = args.trajectory or TRAJECTORIES
+    fmt = args.format
+    if fmt is None:
+        suffix = Path(args.output).suffix.lstrip(".").lower() if args.output else ""
+        fmt = suffix if suffix in FORMATS else "csv"
+
+    started = time.perf_counter()
+    if args.output:
+        count = export_cards(
+            equipment,
+            Path(args.output),
+            fmt,
+            args.start,
+            args.stop,
+            args.step,
+            args.altitude,
+            trajectories,
+        )
+    else:
+        rows = sweep_equipment(
+            equipment, args.start, args.stop, args.step, args.altitude, trajectories
+        )
+        count = WRITERS[fmt](rows, sys.stdout)
+    elapsed = time.perf_counter() - started
+    print(f"{count}행, {elapsed * 1000.0:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""격자 좌표(동거/북거 + 고도)로부터 사격 기하를 구한다.
+
+사수와 목표의 좌표에서 수평 거리, 방위각(밀, 한 바퀴 6400), 고도 차를 계산해
+``find_solutions``에 바로 넘길 수 있게 한다. 목표 목록에 대한 일괄 계산은 축별
+목록을 한 번에 훑어 보간 비용에 비해 무시할 만한 시간 안에 끝난다.
+"""
+import math
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from afcs.equipment import Equipment
+from afcs.range_tables import find_solutions
+from afcs.records import Solution
+
+MILS_PER_CIRCLE = 6400.0
+MILS_PER_RADIAN = MILS_PER_CIRCLE / (2.0 * math.pi)
+
+
+@dataclass
+class GridPoint:
+    """격자 좌표(m). ``easting``은 동쪽, ``northing``은 북쪽 방향 증가."""
+
+    easting: float
+    northing: float
+    altitude: float = 0.0
+
+
+@dataclass
+class FireGeometry:
+    distance: float
+    azimuth_mils: float
+    # 사수 고도 - 목표 고도. calculate_and_display와 같은 부호를 쓴다.
+    altitude_delta: float
+
+
+def _azimuth_mils(dx: float, dy: float) -> float:
+    """격자 북쪽에서 시계 방향으로 잰 방위각(0 이상 6400 미만)."""
+
+    mils = math.atan2(dx, dy) * MILS_PER_RADIAN
+    if mils < 0.0:
+        mils += MILS_PER_CIRCLE
+    return 0.0 if mils >= MILS_PER_CIRCLE else mils
+
+
+def solve_geometry(gun: GridPoint, target: GridPoint) -> FireGeometry:
+    dx = target.easting - gun.easting
+    dy = target.northing - gun.northing
+    return FireGeometry(
+        distance=math.hypot(dx, dy),
+        azimuth_mils=_azimuth_mils(dx, dy),
+        altitude_delta=gun.altitude - target.altitude,
+    )
+
+
+def solve_geometries(gun: GridPoint, targets: Iterable[GridPoint]) -> List[FireGeometry]:
+    """사수 한 곳에서 여러 목표까지의 기하를 입력 순서대로 반환한다."""
+
+    targets = list(targets)
+    return solve_geometry_columns(
+        gun,
+        [target.easting for target in targets],
+        [target.northing for target in targets],
+        [target.altitude for target in targets],
+    )
+
+
+def solve_geometry_columns(
+    gun: GridPoint,
+    eastings: Sequence[float],
+    northings: Sequence[float],
+    altitudes: Sequence[float],
+) -> List[FireGeometry]:
+    """축별 목록으로 받은 목표 좌표를 한 번에 처리한다(CSV 열을 그대로 넘길 때 사용)."""
+
+    ge, gn, ga = gun.easting, gun.northing, gun.altitude
+    dxs = [easting - ge for easting in eastings]
+    dys = [northing - gn for northing in northings]
+    distances = list(map(math.hypot, dxs, dys))
+    azimuths = list(map(_azimuth_mils, dxs, dys))
+    return [
+        FireGeometry(distance, azimuth, ga - altitude)
+        for distance, azimuth, altitude in zip(distances, azimuths, altitudes)
+    ]
+
+
+def parse_grid(text: str, altitude: float = 0.0) -> GridPoint:
+    """``"동거 북거"`` 또는 ``"동거,북거[,고도]"`` 형식의 문자열을 읽는다."""
+
+    parts = text.replace(",", " ").split()
+    if len(parts) not in (2, 3):
+        raise ValueError(f"좌표 형식이 올바르지 않습니다: {text!r}")
+    values = [float(part) for part in parts]
+    return GridPoint(values[0], values[1], values[2] if len(values) == 3 else altitude)
+
+
+def find_solutions_for_grid(
+    gun: GridPoint,
+    target: GridPoint,
+    trajectory: str,
+    equipment: Equipment,
+    limit: int = 3,
+    charges: Optional[List[int]] = None,
+) -> Tuple[FireGeometry, List[Solution]]:
+    """좌표에서 기하를 구해 ``find_solutions``에 넘기고 (기하, 해 목록)을 반환한다."""
+
+    geometry = solve_geometry(gun, target)
+    solutions = find_solutions(
+        geometry.distance,
+        geometry.altitude_delta,
+        trajectory,
+        equipment=equipment,
+        limit=limit,
+        charges=charges,
+    )
+    return geometry, solutions
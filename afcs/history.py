@@ -0,0 +1,186 @@
+"""사격 기록(계산 기록) 내보내기.
+
+GUI의 ``log_entries``처럼 ``LogEntry``를 담은 저장소에서 장비 필터와 시간 범위에
+맞는 항목을 생성기로 하나씩 꺼내, 일정 개수씩 묶어 버퍼를 둔 파일에 CSV 또는
+JSONL로 쓴다. 항목 목록 전체를 문자열로 만들지 않으므로 기록이 많아도 메모리
+사용량은 묶음 크기만큼만 늘어난다.
+"""
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from afcs.records import LogEntry, Solution
+
+FORMATS = ("csv", "jsonl")
+# CSV는 해 하나당 한 줄이다. 해가 없는 탄도는 빈 장약 칸으로 한 줄을 남긴다.
+CSV_FIELDS = (
+    "timestamp", "system", "my_alt", "target_alt", "distance", "trajectory", "charge", "mill", "eta"
+)
+TRAJECTORIES = ("low", "high")
+ALL_EQUIPMENT = "전체"
+# 한 번에 파일로 넘기는 항목 수와 파일 버퍼 크기
+CHUNK_ENTRIES = 500
+BUFFER_SIZE = 1 << 16
+
+# 진행 콜백: (기록한 항목 수, 전체 항목 수)
+ProgressCallback = Callable[[int, int], None]
+
+
+class ExportCancelled(Exception):
+    """``should_cancel``이 참을 반환해 내보내기를 멈췄을 때 발생한다."""
+
+
+def iter_entries(
+    entries: Iterable[LogEntry],
+    equipment: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Iterator[LogEntry]:
+    """장비(``None`` 또는 ``"전체"``면 모두)와 ``start <= 시각 <= end``에 맞는 항목을 내보낸다."""
+
+    if equipment == ALL_EQUIPMENT:
+        equipment = None
+    for entry in entries:
+        if equipment is not None and entry.system != equipment:
+            continue
+        if start is not None and entry.timestamp < start:
+            continue
+        if end is not None and entry.timestamp > end:
+            continue
+        yield entry
+
+
+def _solution_fields(solution: Solution) -> Dict:
+    return {"charge": solution.charge, "mill": solution.mill, "eta": solution.eta}
+
+
+def entry_to_dict(entry: LogEntry) -> Dict:
+    return {
+        "timestamp": entry.timestamp.isoformat(timespec="seconds"),
+        "system": entry.system,
+        "my_alt": entry.my_alt,
+        "target_alt": entry.target_alt,
+        "distance": entry.distance,
+        "low": [_solution_fields(solution) for solution in entry.low],
+        "high": [_solution_fields(solution) for solution in entry.high],
+    }
+
+
+def entry_rows(entry: LogEntry) -> Iterator[List]:
+    head = [
+        entry.timestamp.isoformat(timespec="seconds"),
+        entry.system,
+        f"{entry.my_alt:g}",
+        f"{entry.target_alt:g}",
+        f"{entry.distance:g}",
+    ]
+    for trajectory in TRAJECTORIES:
+        solutions = entry.solutions(trajectory)
+        if not solutions:
+            yield head + [trajectory, "", "", ""]
+        for solution in solutions:
+            yield head + [trajectory, solution.charge, f"{solution.mill:.2f}", f"{solution.eta:.1f}"]
+
+
+def _chunks(entries: Iterable[LogEntry], size: int = CHUNK_ENTRIES) -> Iterator[List[LogEntry]]:
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_chunks(
+    entries: Iterable[LogEntry],
+    write_chunk: Callable[[List[LogEntry]], None],
+    total: int,
+    on_progress: Optional[ProgressCallback],
+    should_cancel: Optional[Callable[[], bool]],
+) -> int:
+    count = 0
+    for chunk in _chunks(entries):
+        if should_cancel is not None and should_cancel():
+            raise ExportCancelled()
+        write_chunk(chunk)
+        count += len(chunk)
+        if on_progress is not None:
+            on_progress(count, total)
+    return count
+
+
+def write_csv(
+    entries: Iterable[LogEntry],
+    out: TextIO,
+    total: int = 0,
+    on_progress: Optional[ProgressCallback] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> int:
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(CSV_FIELDS)
+
+    def _write(chunk):
+        writer.writerows(row for entry in chunk for row in entry_rows(entry))
+
+    return _write_chunks(entries, _write, total, on_progress, should_cancel)
+
+
+def write_jsonl(
+    entries: Iterable[LogEntry],
+    out: TextIO,
+    total: int = 0,
+    on_progress: Optional[ProgressCallback] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> int:
+    def _write(chunk):
+        out.write(
+            "".join(json.dumps(entry_to_dict(entry), ensure_ascii=False) + "\n" for entry in chunk)
+        )
+
+    return _write_chunks(entries, _write, total, on_progress, should_cancel)
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
+
+
+def export_history(
+    entries: Iterable[LogEntry],
+    path: Path,
+    fmt: Optional[str] = None,
+    equipment: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> int:
+    """조건에 맞는 기록을 ``path``에 저장하고 기록한 항목 수를 반환한다.
+
+    ``fmt``를 생략하면 확장자로 고른다. 작업 스레드에서 부를 수 있도록 ``entries``는
+    먼저 목록으로 복사해 두고 쓰는 동안 UI 스레드가 항목을 추가해도 영향을 받지 않는다.
+    같은 폴더의 임시 파일에 쓴 뒤 끝까지 썼을 때만 ``path``로 바꿔 놓으므로, 취소
+    (``ExportCancelled``)나 오류로 멈추면 임시 파일을 지우고 기존 ``path``는 그대로 둔다.
+    """
+
+    path = Path(path)
+    fmt = fmt or path.suffix.lstrip(".").lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    snapshot = list(entries)
+    total = sum(1 for _ in iter_entries(snapshot, equipment, start, end))
+    selected = iter_entries(snapshot, equipment, start, end)
+    # 프로세스·스레드별 이름이라 동시에 내보내도 겹치지 않고, 권한은 일반 파일처럼 umask를 따른다.
+    temp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with temp.open("w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as out:
+            count = WRITERS[fmt](selected, out, total, on_progress, should_cancel)
+        temp.replace(path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return count
@@ -0,0 +1,282 @@
+"""밀/ETA → 거리 역조회 색인.
+
+수정 사격 시 "이 장약으로 쏜 밀이 몇 m에 해당하는가"를 빠르게 답하기 위해
+``RangeTable``이 읽은 열을 그대로 사용해 단조 색인을 만든다. 고각 사격처럼 밀이
+거리에 따라 감소하는 표도 처리한다.
+
+2차원 표(``RangeTable.grid``)가 덮는 지점에서는 ``RangeTable.calculate``처럼 격자 값을
+쓰므로, 고도차별 색인과 구간 안의 근 찾기 모두 격자와 ``diff100m`` 모델을 이어 붙인
+값을 기준으로 한다.
+"""
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from afcs.equipment import Equipment
+from afcs.range_tables import RangeTable, get_range_table
+
+MAX_ITERATIONS = 60
+# 역조회 결과를 정방향으로 다시 계산했을 때 허용하는 상대 잔차
+RESIDUAL_TOLERANCE = 1e-6
+_ADJUSTED_CACHE_SIZE = 8
+
+# (이웃 행 범위, 시작 거리, 끝 거리, 시작 값, 끝 값). 값은 증가 방향으로 맞춘 값이다.
+Piece = Tuple[Tuple[int, int], float, float, float, float]
+
+
+class InverseIndex:
+    """사거리표 하나의 ``key`` 열(밀 또는 ETA)에 대한 역조회 색인.
+
+    단조로운 열은 이분 탐색으로 O(log n)에 답한다. 그 구간에 근이 없거나 단조롭지 않은
+    열(검증 경고가 난 표)이면 모든 조각을 거리순으로 훑어 거리가 가장 짧은 해를 반환한다.
+    """
+
+    def __init__(self, table: RangeTable, key: str = "mill"):
+        if key not in ("mill", "eta"):
+            raise ValueError(f"역조회를 지원하지 않는 열입니다: {key}")
+        self.table = table
+        self.key = key
+        self._adjusted: Dict[float, Tuple[bool, bool, List[float]]] = {}
+        self._pieces_cache: Dict[float, List[Piece]] = {}
+        self._base = self._build(table.columns[key])
+
+    @staticmethod
+    def _build(values: List[float]) -> Tuple[bool, bool, List[float]]:
+        """(감소 여부, 단조 여부, 증가 방향으로 맞춘 값 목록)을 만든다."""
+
+        descending = len(values) > 1 and values[-1] < values[0]
+        oriented = [-value for value in values] if descending else list(values)
+        monotone = all(a <= b for a, b in zip(oriented, oriented[1:]))
+        return descending, monotone, oriented
+
+    @property
+    def monotone(self) -> bool:
+        return self._base[1]
+
+    def _grid_value(self, distance: float, altitude_delta: float) -> Optional[float]:
+        """2차원 표가 덮는 지점이면 격자 값, 아니면 ``None``."""
+
+        table = self.table
+        if not table.uses_grid(distance, altitude_delta):
+            return None
+        mill, eta = table.grid.lookup(distance, altitude_delta)
+        return mill if self.key == "mill" else eta
+
+    def _index_for(self, altitude_delta: float) -> Tuple[bool, bool, List[float]]:
+        grid = self.table.grid
+        gridded = grid is not None and grid.min_altitude <= altitude_delta <= grid.max_altitude
+        if not gridded and (altitude_delta == 0.0 or self.key != "mill"):
+            return self._base
+        cached = self._adjusted.get(altitude_delta)
+        if cached is None:
+            columns = self.table.columns
+            if self.key == "mill":
+                scale = altitude_delta / 100.0
+                adjusted = [
+                    mill + scale * diff for mill, diff in zip(columns["mill"], columns["diff100m"])
+                ]
+            else:
+                adjusted = list(columns["eta"])
+            if gridded:
+                for i, distance in enumerate(self.table.ranges):
+                    value = self._grid_value(distance, altitude_delta)
+                    if value is not None:
+                        adjusted[i] = value
+            if len(self._adjusted) >= _ADJUSTED_CACHE_SIZE:
+                self._adjusted.pop(next(iter(self._adjusted)))
+            cached = self._adjusted[altitude_delta] = self._build(adjusted)
+        return cached
+
+    def _value(self, span: Tuple[int, int], distance: float, altitude_delta: float) -> float:
+        value = self._grid_value(distance, altitude_delta)
+        if value is not None:
+            return value
+        table = self.table
+        value = table._interpolate_span(span, self.key, distance)
+        if self.key == "mill" and altitude_delta:
+            value += (altitude_delta / 100.0) * table._interpolate_span(span, "diff100m", distance)
+        return value
+
+    def _pieces(self, idx: int) -> List[Tuple[Tuple[int, int], float, float]]:
+        """구간 [ranges[idx-1], ranges[idx]]를 같은 이웃 행을 쓰는 조각으로 나눈다.
+
+        세 번째 이웃은 거리에 따라 바뀌므로 보간식은 구간 안에서 한 번 끊길 수 있다.
+        """
+
+        ranges = self.table.ranges
+        lo, hi = ranges[idx - 1], ranges[idx]
+        if idx - 2 >= 0 and idx + 1 < len(ranges):
+            split = (ranges[idx - 2] + ranges[idx + 1]) / 2.0
+            if lo < split < hi:
+                return [((idx - 2, 3), lo, split), ((idx - 1, 3), split, hi)]
+            if split >= hi:
+                return [((idx - 2, 3), lo, hi)]
+            return [((idx - 1, 3), lo, hi)]
+        return [(self.table._neighbor_span(hi), lo, hi)]
+
+    def _monotone_pieces(self, altitude_delta: float) -> List[Piece]:
+        """모든 구간의 보간 조각을 값이 한 방향으로만 변하는 토막으로 나눈다.
+
+        3점 보간식은 행 사이에서 행 값을 넘어 휠 수 있으므로, 조각마다 세 점으로 맞춘
+        포물선의 꼭짓점에서 한 번 더 나눈다. 결과는 거리순이며 고도차별로 캐시한다.
+        """
+
+        cached = self._pieces_cache.get(altitude_delta)
+        if cached is not None:
+            return cached
+        sign = -1.0 if self._index_for(altitude_delta)[0] else 1.0
+        pieces: List[Piece] = []
+        for idx in range(1, len(self.table.ranges)):
+            for span, lo, hi in self._pieces(idx):
+                v_lo = sign * self._value(span, lo, altitude_delta)
+                v_hi = sign * self._value(span, hi, altitude_delta)
+                half = (hi - lo) / 2.0
+                v_mid = sign * self._value(span, lo + half, altitude_delta)
+                curvature = v_hi - 2.0 * v_mid + v_lo
+                vertex = lo + half - half * (v_hi - v_lo) / (2.0 * curvature) if curvature else lo
+                if lo < vertex < hi:
+                    v_vertex = sign * self._value(span, vertex, altitude_delta)
+                    pieces.append((span, lo, vertex, v_lo, v_vertex))
+                    pieces.append((span, vertex, hi, v_vertex, v_hi))
+                else:
+                    pieces.append((span, lo, hi, v_lo, v_hi))
+        if len(self._pieces_cache) >= _ADJUSTED_CACHE_SIZE:
+            self._pieces_cache.pop(next(iter(self._pieces_cache)))
+        self._pieces_cache[altitude_delta] = pieces
+        return pieces
+
+    def range_for(self, value: float, altitude_delta: float = 0.0) -> Optional[float]:
+        """``value``에 해당하는 거리를 반환한다.
+
+        보간식이 ``value``에 닿지 않거나 찾은 거리의 잔차가 허용치를 넘으면 ``None``.
+        """
+
+        ranges = self.table.ranges
+        if not ranges:
+            return None
+        descending, monotone, oriented = self._index_for(altitude_delta)
+        target = -value if descending else value
+        sign = -1.0 if descending else 1.0
+
+        if monotone and oriented[0] <= target <= oriented[-1]:
+            idx = bisect_left(oriented, target)
+            if idx == 0 or oriented[idx - 1] == target:
+                return ranges[max(idx - 1, 0)]
+            # 행 값으로 고른 구간에서 먼저 풀고, 보간식이 휘어 근이 없으면 전체를 훑는다.
+            for span, lo, hi in self._pieces(idx):
+                found = self._root(span, lo, hi, target, sign, altitude_delta)
+                if found is not None:
+                    return found
+
+        for span, lo, hi, v_lo, v_hi in self._monotone_pieces(altitude_delta):
+            if v_lo <= target <= v_hi or v_hi <= target <= v_lo:
+                found = self._root(span, lo, hi, target, sign, altitude_delta, v_lo, v_hi)
+                if found is not None:
+                    return found
+        return None
+
+    def _root(
+        self, span, lo, hi, target, sign, altitude_delta, v_lo=None, v_hi=None
+    ) -> Optional[float]:
+        """조각 [lo, hi]의 양 끝이 목표값을 사이에 두면 근을 찾는다."""
+
+        if v_lo is None:
+            v_lo = sign * self._value(span, lo, altitude_delta)
+            v_hi = sign * self._value(span, hi, altitude_delta)
+        direction = 1.0 if v_hi >= v_lo else -1.0
+        f_lo = direction * (v_lo - target)
+        f_hi = direction * (v_hi - target)
+        if not f_lo <= 0.0 <= f_hi:
+            return None
+        return self._solve(
+            span, lo, hi, f_lo, f_hi, direction * target, sign * direction, altitude_delta
+        )
+
+    def _solve(self, span, lo, hi, f_lo, f_hi, target, sign, altitude_delta) -> Optional[float]:
+        """구간 [lo, hi]에서 보간식이 목표값을 지나는 거리를 가위치법으로 찾는다."""
+
+        if f_hi == 0.0:
+            return hi
+        if f_lo == 0.0:
+            return lo
+        tolerance = 1e-9 * max(1.0, abs(target))
+        side = 0
+        for _ in range(MAX_ITERATIONS):
+            mid = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+            if not lo < mid < hi:
+                mid = (lo + hi) / 2.0
+            f_mid = sign * self._value(span, mid, altitude_delta) - target
+            if abs(f_mid) <= tolerance:
+                return mid
+            if hi - lo <= 1e-9:
+                break
+            if f_mid < 0.0:
+                lo, f_lo = mid, f_mid
+                if side == -1:
+                    f_hi /= 2.0
+                side = -1
+            else:
+                hi, f_hi = mid, f_mid
+                if side == 1:
+                    f_lo /= 2.0
+                side = 1
+        mid = (lo + hi) / 2.0
+        residual = sign * self._value(span, mid, altitude_delta) - target
+        # 수렴하지 못한 점(보간식이 끊기는 곳 등)을 제원으로 내주지 않는다.
+        return mid if abs(residual) <= RESIDUAL_TOLERANCE * max(1.0, abs(target)) else None
+
+    def ranges_for(
+        self, values: Iterable[float], altitude_delta: float = 0.0
+    ) -> List[Optional[float]]:
+        return [self.range_for(value, altitude_delta) for value in values]
+
+
+# (CSV 경로, 열 이름) -> 색인. 사거리표가 다시 읽히면 색인도 새로 만든다.
+_INDEX_CACHE: Dict[Tuple[Path, str], InverseIndex] = {}
+
+
+def get_inverse_index(
+    equipment: Equipment, trajectory: str, charge: int, key: str = "mill"
+) -> InverseIndex:
+    table = get_range_table(equipment, trajectory, charge)
+    cache_key = (table.path, key)
+    index = _INDEX_CACHE.get(cache_key)
+    if index is None or index.table is not table:
+        index = _INDEX_CACHE[cache_key] = InverseIndex(table, key)
+    return index
+
+
+def range_for_mill(
+    equipment: Equipment, trajectory: str, charge: int, mill: float, altitude_delta: float = 0.0
+) -> Optional[float]:
+    """사격한 밀(고도 보정 포함)로부터 거리를 구한다."""
+
+    return get_inverse_index(equipment, trajectory, charge, "mill").range_for(mill, altitude_delta)
+
+
+def ranges_for_mills(
+    equipment: Equipment,
+    trajectory: str,
+    charge: int,
+    mills: Iterable[float],
+    altitude_delta: float = 0.0,
+) -> List[Optional[float]]:
+    return get_inverse_index(equipment, trajectory, charge, "mill").ranges_for(mills, altitude_delta)
+
+
+def range_for_eta(
+    equipment: Equipment, trajectory: str, charge: int, eta: float, altitude_delta: float = 0.0
+) -> Optional[float]:
+    """비행 시간(ETA)으로부터 거리를 구한다. 고도차는 2차원 표가 덮을 때만 결과에 영향을 준다."""
+
+    return get_inverse_index(equipment, trajectory, charge, "eta").range_for(eta, altitude_delta)
+
+
+def ranges_for_etas(
+    equipment: Equipment,
+    trajectory: str,
+    charge: int,
+    etas: Iterable[float],
+    altitude_delta: float = 0.0,
+) -> List[Optional[float]]:
+    return get_inverse_index(equipment, trajectory, charge, "eta").ranges_for(etas, altitude_delta)
@@ -0,0 +1,270 @@
+"""프로세스 내부 지표(카운터·히스토그램) 레지스트리.
+
+장시간 실행되는 GUI나 ``afcs.range_tables``를 감싼 서비스에서 사거리표 로드,
+캐시 적중, 보간 분기, 범위 밖 거절, 계산 지연 시간을 관찰할 수 있도록 한다.
+``serve_metrics()``를 호출하면 localhost에서 Prometheus 텍스트 형식으로 노출한다.
+"""
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+METRICS_PORT_ENV_VAR = "AFCS_METRICS_PORT"
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, args, kwargs) -> Tuple[str, ...]:
+        if kwargs:
+            args = tuple(kwargs[name] for name in self.labelnames)
+        if len(args) != len(self.labelnames):
+            raise ValueError(f"{self.name} 지표의 레이블 개수가 맞지 않습니다")
+        return tuple(str(value) for value in args)
+
+    def labels(self, *args, **kwargs) -> "_BoundMetric":
+        """레이블 값을 고정한 하위 지표를 반환한다. 핫패스에서는 미리 만들어 둔다."""
+
+        return _BoundMetric(self, self._key(args, kwargs))
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _BoundMetric:
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric: _Metric, key: Tuple[str, ...]):
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0):
+        self._metric._inc(self._key, amount)
+
+    def observe(self, value: float):
+        self._metric._observe(self._key, value)
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_target", "_started")
+
+    def __init__(self, target):
+        self._target = target
+        self._started = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._target.observe(time.perf_counter() - self._started)
+        return False
+
+
+class Counter(_Metric):
+    """단조 증가 카운터."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0):
+        self._inc((), amount)
+
+    def _inc(self, key: Tuple[str, ...], amount: float):
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다")
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *args, **kwargs) -> float:
+        key = self._key(args, kwargs)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """고정 구간 히스토그램."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [구간별 개수..., 합계, 전체 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float):
+        self._observe((), value)
+
+    def time(self):
+        return _Timer(self)
+
+    def _observe(self, key: Tuple[str, ...], value: float):
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            if idx < len(self.buckets):
+                state[idx] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, *args, **kwargs) -> float:
+        key = self._key(args, kwargs)
+        with self._lock:
+            state = self._values.get(key)
+            return state[-1] if state else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {_format_value(state[-1])}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{plain} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """이름으로 지표를 등록·조회하는 스레드 안전 레지스트리."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_type, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_type(name, *args, **kwargs)
+            elif not isinstance(metric, metric_type):
+                raise ValueError(f"'{name}' 지표가 다른 유형으로 이미 등록되어 있습니다")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(0.0.4)으로 모든 지표를 직렬화한다."""
+
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY):
+    """``/metrics`` 경로로 지표를 노출하는 HTTP 서버를 백그라운드 스레드에서 시작한다."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in {"/", "/metrics"}:
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            return
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="afcs-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,235 @@
+"""화면과 무관한 사격 임무 계산.
+
+입력 칸의 문자열(사수 고도, 목표 고도, 거리)과 장비 이름을 받아 장약 목록을 정하고
+저각·고각 해를 찾아, 표시할 상태 문구와 고도 차이까지 담은 ``MissionResult``를
+돌려준다. GUI는 이 결과를 그리기만 하므로 같은 경로를 터미널과 성능 측정에서
+디스플레이 없이 그대로 돌릴 수 있다.
+
+    python -m afcs.mission M109A6 --my-alt 120 --target-alt 80 --distance 12000
+    python -m afcs.mission M109A6 targets.csv --my-alt 120 --repeat 100
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import zip_longest
+from pathlib import Path
+from typing import List, Optional, Union
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.profiling import profiler
+from afcs.range_tables import available_charges, find_solutions
+from afcs.records import LogEntry, Solution
+from afcs.selection import CRITERION_LABELS, select_solutions
+from afcs.sensitivity import Band, solution_bands
+
+TRAJECTORIES = ("low", "high")
+TRAJECTORY_NAMES = {"low": "저각", "high": "고각"}
+SOLUTION_LIMIT = 3
+
+Number = Union[str, float]
+
+
+@dataclass
+class TrajectoryOutcome:
+    """탄도 하나의 해와 표 아래에 보일 상태 문구. ``bands``는 해마다 입력 오차에 따른 ± 폭이다."""
+
+    solutions: List[Solution] = field(default_factory=list)
+    message: Optional[str] = None
+    bands: List[Band] = field(default_factory=list)
+
+
+@dataclass
+class MissionResult:
+    """한 번의 계산 결과. ``error``가 있으면 나머지 값은 채워지지 않는다."""
+
+    system: str
+    my_alt: float = 0.0
+    target_alt: float = 0.0
+    distance: float = 0.0
+    altitude_delta: float = 0.0
+    equipment: Optional[Equipment] = None
+    low: TrajectoryOutcome = field(default_factory=TrajectoryOutcome)
+    high: TrajectoryOutcome = field(default_factory=TrajectoryOutcome)
+    error_title: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def delta_text(self) -> str:
+        return f"고도 차이(사수-목표): {self.altitude_delta:+.1f} m"
+
+    def outcome(self, trajectory: str) -> TrajectoryOutcome:
+        return self.low if trajectory == "low" else self.high
+
+    def to_log_entry(self, timestamp: Optional[datetime] = None) -> LogEntry:
+        return LogEntry(
+            timestamp or datetime.now(),
+            self.my_alt,
+            self.target_alt,
+            self.distance,
+            self.system,
+            self.low.solutions,
+            self.high.solutions,
+        )
+
+
+def ranking_message(solutions: List[Solution], criterion: str) -> Optional[str]:
+    if not solutions or criterion == "charge":
+        return None
+    return f"{CRITERION_LABELS[criterion]} 순위"
+
+
+class FireMissionController:
+    """장비 목록을 공유하며 입력 문자열에서 ``MissionResult``를 만든다.
+
+    Tk에 의존하지 않으므로 작업 스레드나 성능 측정에서도 그대로 부를 수 있다.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[EquipmentRegistry] = None,
+        limit: int = SOLUTION_LIMIT,
+        with_bands: bool = True,
+    ):
+        self.registry = registry if registry is not None else EquipmentRegistry()
+        self.limit = limit
+        self.with_bands = with_bands
+
+    def calculate(
+        self,
+        system: str,
+        my_alt: Number,
+        target_alt: Number,
+        distance: Number,
+        criterion: str = "charge",
+    ) -> MissionResult:
+        result = MissionResult(system)
+        try:
+            with profiler.span("parse"):
+                result.my_alt = float(my_alt)
+                result.target_alt = float(target_alt)
+                result.distance = float(distance)
+        except (TypeError, ValueError):
+            result.error_title, result.error = "입력 오류", "숫자만 입력하세요."
+            return result
+
+        result.altitude_delta = result.my_alt - result.target_alt
+        equipment = self.registry.get(system)
+        if equipment is None:
+            result.error_title = "장비 오류"
+            result.error = f"'{system}' 장비 정보를 찾을 수 없습니다."
+            return result
+        result.equipment = equipment
+
+        for trajectory in TRAJECTORIES:
+            with profiler.span("charges"):
+                overrides = equipment.charges_override
+                override = overrides.get(trajectory) if overrides else None
+                charges = override if override is not None else available_charges(equipment, trajectory)
+            outcome = result.outcome(trajectory)
+            if charges:
+                outcome.solutions = self._solve(
+                    result.distance, result.altitude_delta, trajectory, equipment, charges, criterion
+                )
+                outcome.message = ranking_message(outcome.solutions, criterion)
+                if self.with_bands:
+                    with profiler.span("sensitivity"):
+                        outcome.bands = solution_bands(
+                            outcome.solutions, result.distance, result.altitude_delta, trajectory, equipment
+                        )
+            elif override is not None:
+                outcome.message = f"해당 장비는 {TRAJECTORY_NAMES[trajectory]} 사격을 지원하지 않습니다"
+            else:
+                outcome.message = f"{TRAJECTORY_NAMES[trajectory]} 데이터가 없습니다. rangeTables를 확인하세요"
+        return result
+
+    def _solve(self, distance, altitude_delta, trajectory, equipment, charges, criterion: str):
+        """장약 순이면 ``find_solutions``를, 아니면 기준별 상위 ``limit``개를 고른다."""
+
+        if criterion == "charge":
+            return find_solutions(
+                distance, altitude_delta, trajectory, equipment=equipment, limit=self.limit, charges=charges
+            )
+        return select_solutions(
+            distance, altitude_delta, trajectory, equipment, self.limit, criterion, charges
+        )
+
+
+def _band_text(band: Optional[Band], key: str) -> str:
+    if band is None:
+        return ""
+    return f" ±{getattr(band, key):.1f}"
+
+
+def format_result(result: MissionResult) -> str:
+    if not result.ok:
+        return f"{result.error_title}: {result.error}"
+    lines = [f"{result.system} 거리 {result.distance:g} m · {result.delta_text}"]
+    for trajectory in TRAJECTORIES:
+        outcome = result.outcome(trajectory)
+        cells = [
+            f"CH{solution.charge} {solution.mill:.2f}{_band_text(band, 'mill')} mil "
+            f"{solution.eta:.1f}{_band_text(band, 'eta')} s"
+            for solution, band in zip_longest(outcome.solutions, outcome.bands[: len(outcome.solutions)])
+        ]
+        if outcome.message:
+            cells.append(outcome.message)
+        lines.append(f"  {trajectory.upper():<4} " + (" / ".join(cells) or "해 없음"))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="사격 임무 계산(GUI와 같은 경로)")
+    parser.add_argument("equipment", help="장비 이름(예: M109A6)")
+    parser.add_argument(
+        "targets", nargs="?", help="name,distance[,target_alt] CSV 또는 거리 목록 파일(생략하면 --distance)"
+    )
+    parser.add_argument("--my-alt", default="0", help="사수 고도(m)")
+    parser.add_argument("--target-alt", default=None, help="목표 고도(m, 생략하면 사수 고도)")
+    parser.add_argument("--distance", default=None, help="목표 거리(m)")
+    parser.add_argument(
+        "--criterion", default="charge", choices=sorted(CRITERION_LABELS), help="해 정렬 기준"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="전체 계산을 반복해 초당 계산 횟수를 함께 출력한다"
+    )
+    args = parser.parse_args(argv)
+
+    if args.targets:
+        from afcs.bulk import parse_targets
+
+        missions = [
+            (
+                target.distance,
+                args.my_alt if target.target_alt is None else target.target_alt,
+            )
+            for target in parse_targets(Path(args.targets).read_text(encoding="utf-8"))
+        ]
+    elif args.distance is not None:
+        missions = [(args.distance, args.target_alt if args.target_alt is not None else args.my_alt)]
+    else:
+        parser.error("목표 파일이나 --distance를 지정하세요.")
+
+    controller = FireMissionController()
+    started = time.perf_counter()
+    for _ in range(max(args.repeat, 1)):
+        results = [
+            controller.calculate(args.equipment, args.my_alt, target_alt, distance, args.criterion)
+            for distance, target_alt in missions
+        ]
+    elapsed = time.perf_counter() - started
+    for result in results:
+        print(format_result(result))
+    if args.repeat > 1:
+        calls = len(missions) * args.repeat
+        print(f"{calls}회 계산, {elapsed:.3f}초 (초당 {calls / elapsed:,.0f}회)")
+    return 0 if all(result.ok and (result.low.solutions or result.high.solutions) for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""계산 파이프라인 단계별 지연 시간 계측.
+
+``AFCS_PROFILE=1`` 환경 변수 또는 GUI 숨김 단축키로 켤 수 있다. 꺼져 있을 때
+``span()``은 공유된 빈 컨텍스트를 돌려주므로 비용이 거의 없다.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ENV_VAR = "AFCS_PROFILE"
+CAPACITY_ENV_VAR = "AFCS_PROFILE_SIZE"
+DEFAULT_CAPACITY = 200
+
+
+class _NullSpan:
+    """계측이 꺼져 있을 때 사용하는 빈 컨텍스트."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_record", "_stage", "_started")
+
+    def __init__(self, record: "CalculationRecord", stage: str):
+        self._record = record
+        self._stage = stage
+        self._started = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._record.add(self._stage, time.perf_counter() - self._started)
+        return False
+
+
+class CalculationRecord:
+    """한 번의 계산에서 측정된 단계별 소요 시간."""
+
+    __slots__ = ("label", "timestamp", "stages", "counts", "total", "finished")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.timestamp = datetime.now()
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.total = 0.0
+        # 마지막 구간이 끝난 ``perf_counter`` 시각. 다른 스레드로 넘길 때 대기 시간을 잰다.
+        self.finished = 0.0
+
+    def add(self, stage: str, elapsed: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def to_dict(self):
+        return {
+            "label": self.label,
+            "timestamp": self.timestamp.isoformat(timespec="milliseconds"),
+            "total_ms": self.total * 1000.0,
+            "stages_ms": {stage: elapsed * 1000.0 for stage, elapsed in self.stages.items()},
+            "counts": dict(self.counts),
+        }
+
+    def summary(self) -> str:
+        parts = " · ".join(
+            f"{stage} {elapsed * 1000.0:.2f}" for stage, elapsed in self.stages.items()
+        )
+        return f"{self.timestamp.strftime('%H:%M:%S')} {self.label} {self.total * 1000.0:.2f}ms | {parts}"
+
+
+class _Calculation:
+    __slots__ = ("_profiler", "_record", "_started", "_publish")
+
+    def __init__(self, profiler: "StageProfiler", record: CalculationRecord, publish: bool = True):
+        self._profiler = profiler
+        self._record = record
+        self._started = 0.0
+        self._publish = publish
+
+    def __enter__(self):
+        self._profiler._local.record = self._record
+        self._started = time.perf_counter()
+        return self._record
+
+    def __exit__(self, exc_type, exc, tb):
+        record = self._record
+        record.finished = time.perf_counter()
+        record.total += record.finished - self._started
+        self._profiler._local.record = None
+        if self._publish:
+            self._profiler._publish(record)
+        return False
+
+
+class StageProfiler:
+    """단계별 소요 시간을 링 버퍼에 모으는 계측기."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, enabled: bool = False):
+        self.enabled = enabled
+        self._records = deque(maxlen=capacity)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[CalculationRecord], None]] = []
+
+    def calculation(self, label: str = "calculate", publish: bool = True):
+        """한 번의 계산 구간을 연다. 내부의 ``span()``이 이 기록에 누적된다.
+
+        ``publish=False``면 끝나도 기록을 내보내지 않으므로, ``with ... as record``로 받은
+        기록을 다른 스레드의 ``resume()``에 넘겨 이어서 잰다.
+        """
+
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Calculation(self, CalculationRecord(label), publish)
+
+    def resume(self, record):
+        """``publish=False``로 끝난 기록을 현재 스레드에서 이어 열고, 끝나면 내보낸다.
+
+        넘겨받기까지 기다린 시간은 ``queue`` 단계로 더한다. ``record``가 계측이 꺼진 채
+        만든 빈 컨텍스트면 아무것도 재지 않는다.
+        """
+
+        if not self.enabled or not isinstance(record, CalculationRecord):
+            return _NULL_SPAN
+        waited = time.perf_counter() - record.finished
+        record.add("queue", waited)
+        record.total += waited
+        return _Calculation(self, record)
+
+    def span(self, stage: str):
+        """현재 계산 기록에 ``stage`` 구간을 추가한다."""
+
+        if not self.enabled:
+            return _NULL_SPAN
+        record = getattr(self._local, "record", None)
+        if record is None:
+            return _NULL_SPAN
+        return _Span(record, stage)
+
+    def toggle(self) -> bool:
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def add_listener(self, callback: Callable[[CalculationRecord], None]):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[CalculationRecord], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _publish(self, record: CalculationRecord):
+        with self._lock:
+            self._records.append(record)
+        for callback in list(self._listeners):
+            callback(record)
+
+    def recent(self, count: Optional[int] = None) -> List[CalculationRecord]:
+        with self._lock:
+            records = list(self._records)
+        return records if count is None else records[-count:]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(
+            [record.to_dict() for record in self.recent()], ensure_ascii=False, indent=2
+        )
+
+    def dump(self, path) -> int:
+        """링 버퍼 내용을 JSON 파일로 저장하고 기록 개수를 반환한다."""
+
+        records = self.recent()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([record.to_dict() for record in records], f, ensure_ascii=False, indent=2)
+        return len(records)
+
+
+def _capacity_from_env() -> int:
+    try:
+        return max(int(os.environ.get(CAPACITY_ENV_VAR, DEFAULT_CAPACITY)), 1)
+    except ValueError:
+        return DEFAULT_CAPACITY
+
+
+profiler = StageProfiler(
+    capacity=_capacity_from_env(),
+    enabled=os.environ.get(ENV_VAR, "").strip().lower() in {"1", "true", "yes", "on"},
+)
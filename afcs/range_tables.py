@@ -1,128 +1,464 @@
-import csv
-from bisect import bisect_left
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import List, Optional
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
+from afcs.altitude_grid import AltitudeGrid, grid_path_for
+from afcs.corrections import DEFAULT_PIPELINE, Conditions, CorrectionPipeline, broadcast
 from afcs.equipment import Equipment
+from afcs.metrics import REGISTRY
+from afcs.profiling import profiler
+from afcs.records import Solution, SolutionBlock
+from afcs.validation import ERROR, ValidationReport, normalize_table
+
+_TABLE_LOADS = REGISTRY.counter(
+    "afcs_table_loads_total", "CSV에서 사거리표를 읽은 횟수", ("equipment", "trajectory")
+)
+_TABLE_LOAD_SECONDS = REGISTRY.histogram("afcs_table_load_seconds", "사거리표 CSV 로드 시간")
+_CACHE_HITS = REGISTRY.counter("afcs_table_cache_hits_total", "사거리표 캐시 적중 횟수")
+_CACHE_MISSES = REGISTRY.counter("afcs_table_cache_misses_total", "사거리표 캐시 미스 횟수")
+_INTERPOLATIONS = REGISTRY.counter(
+    "afcs_interpolations_total", "보간 분기별 호출 횟수", ("branch",)
+)
+_INTERP_SINGLE = _INTERPOLATIONS.labels("single")
+_INTERP_LINEAR = _INTERPOLATIONS.labels("linear")
+_INTERP_QUADRATIC = _INTERPOLATIONS.labels("quadratic")
+_OUT_OF_RANGE = REGISTRY.counter(
+    "afcs_out_of_range_total", "find_solutions에서 범위 밖으로 제외된 장약 수", ("equipment", "trajectory")
+)
+_SOLVE_SECONDS = REGISTRY.histogram(
+    "afcs_solve_seconds", "find_solutions 호출 지연 시간", ("trajectory",)
+)
+
+# (폴더, 탄도) -> (폴더 수정 시각, 장약 목록). 파일이 추가·삭제되면 폴더 수정 시각이 바뀐다.
+# 값은 튜플로 통째로 바꿔 넣으므로 읽는 쪽은 잠그지 않는다.
+_CHARGES_CACHE: Dict[Tuple[Path, str], Tuple[int, Tuple[int, ...]]] = {}
+# 2차원 표(afcs.altitude_grid)의 보간 방식: "bilinear" 또는 "biquadratic"
+GRID_BLEND = "bilinear"
+# 스냅숏을 새로 만들어 바꿔 끼우는 쪽(미스·다시 읽기·비우기)만 잠근다. 읽는 쪽은 잠그지 않는다.
+_TABLE_CACHE_LOCK = threading.Lock()
 
 
 class RangeTable:
+    """장비·탄도·장약 조합 하나의 사거리표.
+
+    행은 ``afcs.validation``으로 정규화되어 거리가 엄격히 증가하므로, 조회는
+    미리 만들어 둔 열(column) 목록에 대한 이분 탐색만으로 끝난다.
+
+    같은 폴더에 ``_2d.csv`` 격자(``AltitudeGrid``)가 있으면 격자가 덮는 (거리, 고도차)는
+    격자에서 밀과 ETA를 보간하고, 나머지는 ``diff100m`` 선형 보정을 쓴다.
+    """
+
     def __init__(self, equipment: Equipment, trajectory: str, charge: int):
         self.equipment = equipment
         self.trajectory = trajectory
         self.charge = charge
         prefix = equipment.prefix
         self.path = equipment.range_table_dir / f"{prefix}_rangeTable_{trajectory}_{charge}.csv"
-        self.rows = self._load_rows()
+        self.validation: Optional[ValidationReport] = None
+        self._index_rows(self._load_rows())
+        self.grid: Optional[AltitudeGrid] = self._load_grid()
 
     def _load_rows(self):
-        with self.path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            rows = []
-            for line_no, row in enumerate(reader, start=1):
-                cleaned = {
-                    (key.strip() if key else ""): (value.strip() if value is not None else "")
-                    for key, value in row.items()
-                }
-                try:
-                    r = float(cleaned.get("range", ""))
-                    mill = float(cleaned.get("mill", ""))
-                    diff100m = float(cleaned.get("diff100m", ""))
-                    eta = float(cleaned.get("eta", ""))
-                except (ValueError, TypeError):
-                    continue
-                rows.append({"range": r, "mill": mill, "diff100m": diff100m, "eta": eta})
-        return rows
+        _TABLE_LOADS.labels(self.equipment.name, self.trajectory).inc()
+        with _TABLE_LOAD_SECONDS.time():
+            self.validation = normalize_table(self.path, self.trajectory)
+        return self.validation.rows
+
+    def _load_grid(self) -> Optional[AltitudeGrid]:
+        """2차원 표가 있으면 읽는다. 읽을 수 없으면 검증 오류로 남기고 1차원 표만 쓴다."""
+
+        path = grid_path_for(self.path)
+        if not path.exists():
+            return None
+        try:
+            return AltitudeGrid(path, GRID_BLEND)
+        except ValueError as exc:
+            self.validation.add(ERROR, "grid", None, str(exc))
+            return None
+
+    def uses_grid(self, distance: float, altitude_delta: float) -> bool:
+        return self.grid is not None and self.grid.covers(distance, altitude_delta)
+
+    def _index_rows(self, rows):
+        """보간에 쓰는 열 목록과 거리 범위를 미리 계산한다.
+
+        표는 캐시 스냅숏에 실린 뒤 여러 스레드가 잠금 없이 읽으므로 열은 튜플로 둔다.
+        """
+
+        self.rows = tuple(rows)
+        self.ranges = tuple(row["range"] for row in rows)
+        columns = {key: tuple(row[key] for row in rows) for key in ("mill", "diff100m", "eta")}
+        columns["range"] = self.ranges
+        self.columns = MappingProxyType(columns)
+        self.min_range = self.ranges[0] if rows else None
+        self.max_range = self.ranges[-1] if rows else None
 
     def supports_range(self, distance: float) -> bool:
         if not self.rows:
             return False
-        distances = [row["range"] for row in self.rows]
-        return min(distances) <= distance <= max(distances)
+        return self.min_range <= distance <= self.max_range
 
     def calculate(self, distance: float, altitude_delta: float):
         if not self.supports_range(distance):
             raise ValueError("거리 밖입니다")
 
-        base_mill = self._interpolate("mill", distance)
-        diff100m = self._interpolate("diff100m", distance)
-        eta = self._interpolate("eta", distance)
+        span = self._neighbor_span(distance)
+        base_mill = self._interpolate_span(span, "mill", distance)
+        diff100m = self._interpolate_span(span, "diff100m", distance)
+        eta = self._interpolate_span(span, "eta", distance)
 
-        mill_adjust = (altitude_delta / 100.0) * diff100m
-        final_mill = base_mill + mill_adjust
+        grid = self.grid
+        if grid is not None and grid.covers(distance, altitude_delta):
+            final_mill, eta = grid.lookup(distance, altitude_delta)
+        else:
+            final_mill = base_mill + (altitude_delta / 100.0) * diff100m
 
-        return {
-            "mill": final_mill,
-            "eta": eta,
-            "charge": self.charge,
-            "base_mill": base_mill,
-            "diff100m": diff100m,
-        }
+        return Solution(final_mill, eta, self.charge, base_mill, diff100m)
 
-    def _neighbor_rows(self, distance: float):
-        ranges = [row["range"] for row in self.rows]
-        idx = bisect_left(ranges, distance)
+    def _neighbor_span(self, distance: float) -> Tuple[int, int]:
+        """보간에 사용할 이웃 행의 (시작 인덱스, 개수)를 반환한다.
+
+        ``afcs.reference``의 이웃 선택 규칙과 같다. 거리 양옆의 두 행을 고르고,
+        그 바깥 두 후보 중 더 가까운 행(같으면 아래쪽)을 세 번째로 더한다.
+        """
+
+        return self._span_at(bisect_left(self.ranges, distance), distance)
 
-        neighbors = []
-        if idx > 0:
-            neighbors.append(self.rows[idx - 1])
-        if idx < len(self.rows):
-            neighbors.append(self.rows[idx])
+    def _span_at(self, idx: int, distance: float) -> Tuple[int, int]:
+        """``idx = bisect_left(ranges, distance)``가 이미 있을 때의 이웃 행 범위."""
 
-        remaining = []
+        ranges = self.ranges
+        count = len(ranges)
+        if count == 0:
+            return 0, 0
+        if idx == 0:
+            return 0, min(count, 2)
+        if idx == count:
+            return max(count - 2, 0), min(count, 2)
+        if idx + 1 < count:
+            if idx - 2 >= 0 and abs(ranges[idx - 2] - distance) <= abs(ranges[idx + 1] - distance):
+                return idx - 2, 3
+            return idx - 1, 3
         if idx - 2 >= 0:
-            remaining.append(self.rows[idx - 2])
-        if idx + 1 < len(self.rows):
-            remaining.append(self.rows[idx + 1])
-
-        remaining.sort(key=lambda r: abs(r["range"] - distance))
-        for row in remaining:
-            if row not in neighbors:
-                neighbors.append(row)
-            if len(neighbors) >= 3:
-                break
+            return idx - 2, 3
+        return idx - 1, 2
+
+    def sweep(
+        self, distances: Iterable[float], altitude_delta: float = 0.0
+    ) -> Iterator[Optional[Solution]]:
+        """거리 목록을 차례로 계산해 ``calculate``와 같은 결과를 내보낸다(범위 밖은 ``None``).
+
+        오름차순 격자를 가정해 직전 위치부터 이분 탐색하고, 이웃 행과 보간 가중치를
+        세 열(밀, diff100m, ETA)에 한 번만 계산해 함께 쓴다. 결과는 ``calculate``와
+        비트 단위로 같다.
+        """
+
+        scale = altitude_delta / 100.0
+        charge = self.charge
+        grid = self.grid
+        if grid is None:
+            for row in self._sweep_rows(distances):
+                if row is None:
+                    yield None
+                    continue
+                base_mill, diff100m, eta = row
+                yield Solution(base_mill + scale * diff100m, eta, charge, base_mill, diff100m)
+            return
+
+        distances = list(distances)
+        for distance, row in zip(distances, self._sweep_rows(distances)):
+            if row is None:
+                yield None
+                continue
+            base_mill, diff100m, eta = row
+            if grid.covers(distance, altitude_delta):
+                mill, eta = grid.lookup(distance, altitude_delta)
+            else:
+                mill = base_mill + scale * diff100m
+            yield Solution(mill, eta, charge, base_mill, diff100m)
+
+    def _sweep_rows(
+        self, distances: Iterable[float]
+    ) -> Iterator[Optional[Tuple[float, float, float]]]:
+        """``sweep``의 보간 부분. (base_mill, diff100m, eta) 튜플을 내보낸다."""
+
+        ranges = self.ranges
+        count = len(ranges)
+        mills = self.columns["mill"]
+        diffs = self.columns["diff100m"]
+        etas = self.columns["eta"]
+        low, high = self.min_range, self.max_range
+        idx = 0
+        previous = None
+        single = linear = quadratic = 0
+        try:
+            for distance in distances:
+                if not count or not low <= distance <= high:
+                    yield None
+                    continue
+                lo = idx if previous is not None and distance >= previous else 0
+                idx = bisect_left(ranges, distance, lo)
+                previous = distance
+                start, span = self._span_at(idx, distance)
+
+                if span == 1:
+                    single += 1
+                    yield mills[start], diffs[start], etas[start]
+                elif span == 2:
+                    linear += 1
+                    lower = ranges[start]
+                    ratio = (distance - lower) / (ranges[start + 1] - lower)
+                    yield (
+                        mills[start] + ratio * (mills[start + 1] - mills[start]),
+                        diffs[start] + ratio * (diffs[start + 1] - diffs[start]),
+                        etas[start] + ratio * (etas[start + 1] - etas[start]),
+                    )
+                else:
+                    quadratic += 1
+                    x0, x1, x2 = ranges[start], ranges[start + 1], ranges[start + 2]
+                    t0 = ((distance - x1) / (x0 - x1)) * ((distance - x2) / (x0 - x2))
+                    t1 = ((distance - x0) / (x1 - x0)) * ((distance - x2) / (x1 - x2))
+                    t2 = ((distance - x0) / (x2 - x0)) * ((distance - x1) / (x2 - x1))
+                    yield (
+                        mills[start] * t0 + mills[start + 1] * t1 + mills[start + 2] * t2,
+                        diffs[start] * t0 + diffs[start + 1] * t1 + diffs[start + 2] * t2,
+                        etas[start] * t0 + etas[start + 1] * t1 + etas[start + 2] * t2,
+                    )
+        finally:
+            # 열 하나당 한 번 보간한 것으로 세어 calculate와 같은 기준을 유지한다.
+            if single:
+                _INTERP_SINGLE.inc(3 * single)
+            if linear:
+                _INTERP_LINEAR.inc(3 * linear)
+            if quadratic:
+                _INTERP_QUADRATIC.inc(3 * quadratic)
 
-        neighbors.sort(key=lambda r: r["range"])
-        return neighbors
+    def slopes(self, distance: float) -> Tuple[float, float, float]:
+        """``distance``에서 (mill, diff100m, eta)의 거리 미분(1 m당).
+
+        ``_interpolate``와 같은 이웃 행을 골라 그 보간식(선형 또는 3점 라그랑주)을 해석적으로
+        미분한다. 행이 하나뿐이면 0이다.
+        """
+
+        start, count = self._neighbor_span(distance)
+        if count == 0:
+            raise ValueError("적절한 범위를 찾을 수 없습니다")
+        if count == 1:
+            return 0.0, 0.0, 0.0
+        mills, diffs, etas = self.columns["mill"], self.columns["diff100m"], self.columns["eta"]
+        ranges = self.ranges
+        if count == 2:
+            width = ranges[start + 1] - ranges[start]
+            return (
+                (mills[start + 1] - mills[start]) / width,
+                (diffs[start + 1] - diffs[start]) / width,
+                (etas[start + 1] - etas[start]) / width,
+            )
+
+        x0, x1, x2 = ranges[start], ranges[start + 1], ranges[start + 2]
+        w0 = ((distance - x1) + (distance - x2)) / ((x0 - x1) * (x0 - x2))
+        w1 = ((distance - x0) + (distance - x2)) / ((x1 - x0) * (x1 - x2))
+        w2 = ((distance - x0) + (distance - x1)) / ((x2 - x0) * (x2 - x1))
+        return (
+            mills[start] * w0 + mills[start + 1] * w1 + mills[start + 2] * w2,
+            diffs[start] * w0 + diffs[start + 1] * w1 + diffs[start + 2] * w2,
+            etas[start] * w0 + etas[start + 1] * w1 + etas[start + 2] * w2,
+        )
+
+    def _neighbor_rows(self, distance: float):
+        start, count = self._neighbor_span(distance)
+        return self.rows[start:start + count]
 
     def _interpolate(self, key: str, distance: float) -> float:
-        neighbors = self._neighbor_rows(distance)
-        if not neighbors:
+        return self._interpolate_span(self._neighbor_span(distance), key, distance)
+
+    def _interpolate_span(self, span: Tuple[int, int], key: str, distance: float) -> float:
+        start, count = span
+        if count == 0:
             raise ValueError("적절한 범위를 찾을 수 없습니다")
 
-        if len(neighbors) == 1:
-            return neighbors[0][key]
-        if len(neighbors) == 2 or neighbors[0]["range"] == neighbors[1]["range"]:
-            lower, upper = neighbors[0], neighbors[1]
-            if upper["range"] == lower["range"]:
-                return lower[key]
-            ratio = (distance - lower["range"]) / (upper["range"] - lower["range"])
-            return lower[key] + ratio * (upper[key] - lower[key])
+        values = self.columns[key]
+        if count == 1:
+            _INTERP_SINGLE.inc()
+            return values[start]
 
-        x0, x1, x2 = (row["range"] for row in neighbors[:3])
-        y0, y1, y2 = (row[key] for row in neighbors[:3])
+        ranges = self.ranges
+        if count == 2:
+            _INTERP_LINEAR.inc()
+            lower = ranges[start]
+            ratio = (distance - lower) / (ranges[start + 1] - lower)
+            return values[start] + ratio * (values[start + 1] - values[start])
 
-        def basis(x, a, b):
-            return (x - a) / (b - a) if b != a else 0.0
+        _INTERP_QUADRATIC.inc()
+        x0, x1, x2 = ranges[start], ranges[start + 1], ranges[start + 2]
+        y0, y1, y2 = values[start], values[start + 1], values[start + 2]
 
-        t0 = basis(distance, x1, x0) * basis(distance, x2, x0)
-        t1 = basis(distance, x0, x1) * basis(distance, x2, x1)
-        t2 = basis(distance, x0, x2) * basis(distance, x1, x2)
+        t0 = ((distance - x1) / (x0 - x1)) * ((distance - x2) / (x0 - x2))
+        t1 = ((distance - x0) / (x1 - x0)) * ((distance - x2) / (x1 - x2))
+        t2 = ((distance - x0) / (x2 - x0)) * ((distance - x1) / (x2 - x1))
         return y0 * t0 + y1 * t1 + y2 * t2
 
 
+class TableSnapshot:
+    """캐시된 사거리표 전체의 불변 스냅숏. 경로 -> (파일 수정 시각, RangeTable).
+
+    표를 새로 읽거나 다시 읽을 때는 기존 스냅숏을 고치지 않고 새 스냅숏을 만들어
+    모듈 변수 하나를 바꿔 끼운다. 참조 대입은 원자적이므로 읽는 쪽은 잠금 없이
+    ``table_snapshot()``으로 얻은 스냅숏을 끝까지 일관되게 쓸 수 있다.
+    """
+
+    __slots__ = ("entries", "version")
+
+    def __init__(self, entries: Mapping[Path, Tuple[int, RangeTable]], version: int = 0):
+        self.entries = MappingProxyType(dict(entries))
+        self.version = version
+
+    def get(self, path: Path) -> Optional[Tuple[int, RangeTable]]:
+        return self.entries.get(path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+_TABLE_SNAPSHOT = TableSnapshot({})
+
+
+def table_snapshot() -> TableSnapshot:
+    """현재 게시된 사거리표 스냅숏."""
+
+    return _TABLE_SNAPSHOT
+
+
+def _publish(changes: Mapping[Path, Tuple[int, RangeTable]], replace: bool = False):
+    """``_TABLE_CACHE_LOCK``을 잡은 채로 호출한다. 새 스냅숏을 만들어 바꿔 끼운다."""
+
+    global _TABLE_SNAPSHOT
+    current = _TABLE_SNAPSHOT
+    entries = {} if replace else dict(current.entries)
+    entries.update(changes)
+    _TABLE_SNAPSHOT = TableSnapshot(entries, current.version + 1)
+
+
+# (prefix, table_root, 탄도, 장약) -> CSV 경로. Path 결합이 적중 경로 비용의 대부분이라 한 번만 만든다.
+_TABLE_PATHS: Dict[Tuple[str, Optional[Path], str, int], Path] = {}
+
+
+def _table_path(equipment: Equipment, trajectory: str, charge: int) -> Path:
+    key = (equipment.prefix, equipment.table_root, trajectory, charge)
+    path = _TABLE_PATHS.get(key)
+    if path is None:
+        path = equipment.range_table_dir / f"{equipment.prefix}_rangeTable_{trajectory}_{charge}.csv"
+        _TABLE_PATHS[key] = path
+    return path
+
+
+def _is_fresh(cached: Optional[Tuple[int, RangeTable]], mtime: int) -> bool:
+    """캐시 항목이 최신인지 본다. 2차원 표는 이미 읽어 둔 표만 수정 시각을 확인한다.
+
+    없던 ``_2d.csv``를 새로 두면 다음에 표를 다시 읽을 때(1차원 표 변경,
+    ``reload_tables``, ``clear_table_cache``) 반영된다. 표가 없는 대부분의 조합에서
+    적중 경로에 실패하는 ``stat``을 더하지 않기 위해서다.
+    """
+
+    if cached is None or cached[0] != mtime:
+        return False
+    grid = cached[1].grid
+    if grid is None:
+        return True
+    try:
+        return os.stat(grid.path).st_mtime_ns == grid.mtime
+    except FileNotFoundError:
+        return False
+
+
+def get_range_table(equipment: Equipment, trajectory: str, charge: int) -> RangeTable:
+    """캐시된 사거리표를 반환한다. 파일(읽어 둔 2차원 표 포함)이 바뀌었거나 처음이면 새로 읽는다."""
+
+    path = _table_path(equipment, trajectory, charge)
+    mtime = path.stat().st_mtime_ns
+    cached = _TABLE_SNAPSHOT.get(path)
+    if _is_fresh(cached, mtime):
+        _CACHE_HITS.inc()
+        return cached[1]
+
+    with _TABLE_CACHE_LOCK:
+        cached = _TABLE_SNAPSHOT.get(path)
+        if _is_fresh(cached, mtime):
+            _CACHE_HITS.inc()
+            return cached[1]
+        _CACHE_MISSES.inc()
+        table = RangeTable(equipment, trajectory, charge)
+        _publish({path: (mtime, table)})
+        return table
+
+
+def reload_tables(equipment: Optional[Equipment] = None) -> int:
+    """캐시된 표(``equipment``를 주면 그 장비의 표만)를 모두 다시 읽어 한 번에 바꿔 끼운다.
+
+    새 표는 잠금 밖에서 만들므로 그동안 읽는 쪽은 이전 스냅숏을 그대로 쓴다. 다시 읽은
+    표 수를 반환한다.
+    """
+
+    snapshot = _TABLE_SNAPSHOT
+    rebuilt: Dict[Path, Tuple[int, RangeTable]] = {}
+    for path, (_, table) in snapshot.entries.items():
+        if equipment is not None and table.equipment.range_table_dir != equipment.range_table_dir:
+            continue
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        rebuilt[path] = (mtime, RangeTable(table.equipment, table.trajectory, table.charge))
+    with _TABLE_CACHE_LOCK:
+        _publish(rebuilt)
+    return len(rebuilt)
+
+
+def clear_table_cache():
+    with _TABLE_CACHE_LOCK:
+        _publish({}, replace=True)
+    _CHARGES_CACHE.clear()
+
+
 def available_charges(equipment: Equipment, trajectory: str) -> List[int]:
-    equipment.ensure_range_table_dir()
+    """폴더의 CSV 이름에서 장약 번호를 찾는다. 폴더 수정 시각이 같으면 이전 결과를 쓴다."""
+
+    directory = equipment.range_table_dir
+    try:
+        mtime = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        equipment.ensure_range_table_dir()
+        mtime = directory.stat().st_mtime_ns
+    key = (directory, trajectory)
+    cached = _CHARGES_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+
     pattern = f"{equipment.prefix}_rangeTable_{trajectory}_"
     charges = []
-    for csv_path in equipment.range_table_dir.glob(f"{pattern}*.csv"):
+    for csv_path in directory.glob(f"{pattern}*.csv"):
         name = csv_path.stem
         if not name.startswith(pattern):
             continue
         suffix = name.replace(pattern, "", 1)
         if suffix.isdigit():
             charges.append(int(suffix))
-    return sorted(set(charges))
+    charges = tuple(sorted(set(charges)))
+    _CHARGES_CACHE[key] = (mtime, charges)
+    return list(charges)
+
+
+def resolve_charges(equipment: Equipment, trajectory: str) -> List[int]:
+    """장비 설정의 ``charges_override``가 있으면 그것을, 없으면 CSV에서 찾은 장약 목록을 반환한다."""
+
+    override = equipment.charges_override.get(trajectory) if equipment.charges_override else None
+    if override is not None:
+        return list(override)
+    return available_charges(equipment, trajectory)
 
 
 def find_solutions(
@@ -132,29 +468,146 @@ def find_solutions(
     equipment: Equipment,
     limit: int = 3,
     charges: Optional[List[int]] = None,
+    conditions: Optional[Conditions] = None,
+    pipeline: CorrectionPipeline = DEFAULT_PIPELINE,
 ):
-    solutions = []
+    """거리를 지원하는 장약을 번호 순으로 최대 ``limit``개 계산한다.
+
+    ``conditions``를 주면 기상·장약 온도 보정을 ``pipeline``으로 더하고 각 해에
+    ``deflection``을 붙인다.
+    """
+
+    started = time.perf_counter()
+    try:
+        solutions = []
+        if charges is None:
+            with profiler.span("charges"):
+                charges = available_charges(equipment, trajectory)
+        if not charges:
+            return solutions
+        for charge in charges:
+            try:
+                with profiler.span("table_load"):
+                    table = get_range_table(equipment, trajectory, charge)
+            except FileNotFoundError:
+                continue
+            if not table.supports_range(distance):
+                _OUT_OF_RANGE.labels(equipment.name, trajectory).inc()
+                continue
+            try:
+                with profiler.span("interpolate"):
+                    solution = table.calculate(distance, altitude_delta)
+            except ValueError:
+                continue
+            if conditions is not None:
+                # 2차원 표로 구한 밀에는 고도 보정이 이미 들어 있으므로 고도차 0으로 넘긴다.
+                gridded = table.uses_grid(distance, altitude_delta)
+                batch = pipeline.apply(
+                    equipment,
+                    trajectory,
+                    charge,
+                    [distance],
+                    [solution.mill if gridded else solution.base_mill],
+                    [solution.diff100m],
+                    [0.0 if gridded else altitude_delta],
+                    [conditions],
+                )
+                solution.mill = batch.mills[0]
+                solution.deflection = batch.deflections[0]
+            solutions.append(solution)
+            if len(solutions) >= limit:
+                break
+        return solutions
+    finally:
+        _SOLVE_SECONDS.labels(trajectory).observe(time.perf_counter() - started)
+
+
+def find_solution(distance: float, altitude_delta: float, trajectory: str, equipment: Equipment):
+    solutions = find_solutions(distance, altitude_delta, trajectory, equipment=equipment, limit=1)
+    return solutions[0] if solutions else None
+
+
+def find_solutions_batch(
+    distances: List[float],
+    altitude_deltas: List[float],
+    trajectory: str,
+    equipment: Equipment,
+    limit: Optional[int] = 3,
+    charges: Optional[List[int]] = None,
+    conditions: Union[None, Conditions, Sequence[Conditions]] = None,
+    pipeline: CorrectionPipeline = DEFAULT_PIPELINE,
+) -> SolutionBlock:
+    """여러 (거리, 고도차)에 대한 ``find_solutions`` 결과를 입력 순서대로 반환한다.
+
+    장약마다 사거리표를 한 번만 가져와, 표가 지원하고 아직 ``limit``개를 채우지 못한
+    지점을 ``RangeTable.sweep``으로 함께 훑고 보정 파이프라인도 그 묶음 단위로 한 번
+    실행한다. ``limit=None``이면 모든 장약을 담는다. ``conditions``는 모든 지점에 같은
+    조건 하나 또는 지점별 목록이다. 결과 ``SolutionBlock``의 ``block[i]``가 ``i``번
+    지점의 해 목록이다.
+    """
+
+    conditions = broadcast(conditions, len(distances))
     if charges is None:
         charges = available_charges(equipment, trajectory)
-    if not charges:
-        return solutions
+    counts = [0] * len(distances)
+    owners: List[int] = []
+    charge_column: List[int] = []
+    mills: List[float] = []
+    etas: List[float] = []
+    base_mills: List[float] = []
+    diffs: List[float] = []
+    deflections: Optional[List[float]] = [] if conditions is not None else None
+    # 지점을 거리순으로 한 번만 정렬해 두고, 장약마다 지원 구간을 이분 탐색으로 잘라 쓴다.
+    order = sorted(range(len(distances)), key=distances.__getitem__)
+    ordered = [distances[i] for i in order]
     for charge in charges:
         try:
-            table = RangeTable(equipment, trajectory, charge)
+            table = get_range_table(equipment, trajectory, charge)
         except FileNotFoundError:
             continue
-        if not table.supports_range(distance):
+        if not table.rows:
             continue
-        try:
-            solution = table.calculate(distance, altitude_delta)
-        except ValueError:
+        lo = bisect_left(ordered, table.min_range)
+        hi = bisect_right(ordered, table.max_range)
+        covered = order[lo:hi]
+        if limit is not None:
+            covered = [i for i in covered if counts[i] < limit]
+        if not covered:
             continue
-        solutions.append(solution)
-        if len(solutions) >= limit:
-            break
-    return solutions
-
-
-def find_solution(distance: float, altitude_delta: float, trajectory: str, equipment: Equipment):
-    solutions = find_solutions(distance, altitude_delta, trajectory, equipment=equipment, limit=1)
-    return solutions[0] if solutions else None
+        points = [distances[i] for i in covered]
+        # 지원 구간 안의 지점만 넘기므로 None 없이 (base_mill, diff100m, eta) 열로 나뉜다.
+        charge_base, charge_diff, charge_eta = zip(*table._sweep_rows(points))
+        # 지점마다 고도차가 다르므로 고도 보정은 파이프라인의 고도 단계에서 calculate와
+        # 같은 식으로 더한다.
+        start_mills = charge_base
+        point_deltas = [altitude_deltas[i] for i in covered]
+        if table.grid is not None:
+            # 2차원 표가 덮는 지점은 격자 밀(고도 보정 포함)에서 시작하고 고도차를 0으로 둔다.
+            start_mills, charge_eta = list(charge_base), list(charge_eta)
+            for k, (distance, delta) in enumerate(zip(points, point_deltas)):
+                if table.grid.covers(distance, delta):
+                    start_mills[k], charge_eta[k] = table.grid.lookup(distance, delta)
+                    point_deltas[k] = 0.0
+        batch = pipeline.apply(
+            equipment,
+            trajectory,
+            charge,
+            points,
+            start_mills,
+            charge_diff,
+            point_deltas,
+            [conditions[i] for i in covered] if conditions is not None else None,
+        )
+        owners.extend(covered)
+        charge_column.extend([charge] * len(covered))
+        mills.extend(batch.mills)
+        etas.extend(charge_eta)
+        base_mills.extend(charge_base)
+        diffs.extend(charge_diff)
+        if deflections is not None:
+            deflections.extend(batch.deflections)
+        for i in covered:
+            counts[i] += 1
+    return SolutionBlock.from_rows(
+        len(distances), owners, (charge_column, mills, etas, base_mills, diffs), deflections
+    )
@@ -0,0 +1,194 @@
+"""계산 결과와 기록 항목의 압축 표현.
+
+해 하나마다 키 다섯 개짜리 dict를 만드는 대신 ``__slots__`` 객체를 쓰고, 일괄 계산
+결과는 지점별 해를 ``array`` 열에 이어 붙인 ``SolutionBlock``으로 돌려준다. 기존
+코드와 외부 사용자를 위해 ``solution["mill"]`` 같은 키 접근도 그대로 지원한다.
+"""
+from array import array
+from collections import Counter
+from itertools import accumulate
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# dict로 바꿀 때 항상 들어가는 키. 나머지 선택 필드는 값이 있을 때만 넣는다.
+SOLUTION_KEYS = ("mill", "eta", "charge", "base_mill", "diff100m")
+OPTIONAL_KEYS = ("deflection", "score", "trajectory")
+
+
+class Solution:
+    """장약 하나의 사격 제원."""
+
+    __slots__ = SOLUTION_KEYS + OPTIONAL_KEYS
+
+    def __init__(
+        self,
+        mill: float,
+        eta: float,
+        charge: int,
+        base_mill: float,
+        diff100m: float,
+        deflection: Optional[float] = None,
+        score: Optional[float] = None,
+        trajectory: Optional[str] = None,
+    ):
+        self.mill = mill
+        self.eta = eta
+        self.charge = charge
+        self.base_mill = base_mill
+        self.diff100m = diff100m
+        self.deflection = deflection
+        self.score = score
+        self.trajectory = trajectory
+
+    def __getitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        if key in OPTIONAL_KEYS:
+            return getattr(self, key) is not None
+        return key in SOLUTION_KEYS
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        return [key for key in self.__slots__ if key in self]
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def replace(self, **changes) -> "Solution":
+        values = {key: getattr(self, key) for key in self.__slots__}
+        values.update(changes)
+        return Solution(**values)
+
+    def __eq__(self, other):
+        if isinstance(other, Solution):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Solution({', '.join(f'{key}={getattr(self, key)!r}' for key in self.keys())})"
+
+
+class SolutionBlock:
+    """일괄 계산 결과. 해는 계산한 순서대로 열 배열에 쌓고, 지점 ``i``의 행 번호는
+    ``index[offsets[i]:offsets[i + 1]]``이다.
+
+    지점마다 해 목록이 필요하면 ``block[i]``로 ``Solution``을 만들어 받고, 많은
+    지점을 훑을 때는 ``rows(i)``와 열 배열을 직접 읽어 객체 생성을 피한다.
+    """
+
+    __slots__ = (
+        "offsets", "index", "charges", "mills", "etas", "base_mills", "diff100m", "deflections"
+    )
+
+    def __init__(self, points: int = 0):
+        self.offsets = array("l", [0] * (points + 1))
+        self.index = array("l")
+        self.charges = array("l")
+        self.mills = array("d")
+        self.etas = array("d")
+        self.base_mills = array("d")
+        self.diff100m = array("d")
+        self.deflections: Optional[array] = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        points: int,
+        owners: Sequence[int],
+        columns: Tuple[Sequence[int], Sequence[float], Sequence[float], Sequence[float], Sequence[float]],
+        deflections: Optional[Sequence[float]] = None,
+    ) -> "SolutionBlock":
+        """행 ``r``이 ``owners[r]``번 지점의 해인 열들로 블록을 만든다.
+
+        같은 지점의 행은 주어진 순서를 유지한다. 열은 옮기지 않고 지점별 행 번호 색인만
+        만든다.
+        """
+
+        block = cls()
+        counts = Counter(owners)
+        block.offsets = array("l", accumulate((counts[i] for i in range(points)), initial=0))
+        # 안정 정렬이라 같은 지점의 행은 원래 순서(장약 순)를 유지한다.
+        block.index = array("l", sorted(range(len(owners)), key=owners.__getitem__))
+        charges, mills, etas, base_mills, diffs = columns
+        block.charges = array("l", charges)
+        block.mills = array("d", mills)
+        block.etas = array("d", etas)
+        block.base_mills = array("d", base_mills)
+        block.diff100m = array("d", diffs)
+        if deflections is not None:
+            block.deflections = array("d", deflections)
+        return block
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def rows(self, index: int) -> Sequence[int]:
+        return self.index[self.offsets[index]:self.offsets[index + 1]]
+
+    def solution(self, row: int) -> Solution:
+        return Solution(
+            self.mills[row],
+            self.etas[row],
+            self.charges[row],
+            self.base_mills[row],
+            self.diff100m[row],
+            self.deflections[row] if self.deflections is not None else None,
+        )
+
+    def __getitem__(self, index: int) -> List[Solution]:
+        if index < 0:
+            index += len(self)
+        return [self.solution(row) for row in self.rows(index)]
+
+    def __iter__(self) -> Iterator[List[Solution]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class LogEntry:
+    """계산 기록 한 건. 해 목록은 바뀌지 않도록 튜플로 보관한다."""
+
+    __slots__ = ("timestamp", "my_alt", "target_alt", "distance", "system", "low", "high")
+
+    def __init__(
+        self,
+        timestamp: datetime,
+        my_alt: float,
+        target_alt: float,
+        distance: float,
+        system: str,
+        low: Sequence[Solution] = (),
+        high: Sequence[Solution] = (),
+    ):
+        self.timestamp = timestamp
+        self.my_alt = my_alt
+        self.target_alt = target_alt
+        self.distance = distance
+        self.system = system
+        self.low = tuple(low)
+        self.high = tuple(high)
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def solutions(self, trajectory: str) -> Tuple[Solution, ...]:
+        return self.low if trajectory == "low" else self.high
@@ -0,0 +1,120 @@
+"""고정된 기준 보간기(reference oracle).
+
+``RangeTable``의 최초 구현을 그대로 옮겨 둔 것으로, 최적화된 엔진이 사격 제원을
+바꾸지 않았는지 비교할 때 정답으로 사용한다. 이 파일은 속도를 위해 수정하지 않는다.
+
+CSV 읽기도 최초 구현(정렬·중복 정리·행 제외 없이 읽은 순서 그대로)을 복사해 두어,
+이후의 로더·정규화 변경이 사격 제원을 바꾸면 기준과의 차이로 드러나게 한다.
+"""
+import csv
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional
+
+Row = Dict[str, float]
+
+
+def reference_load_rows(path: Path) -> List[Row]:
+    """최초 ``RangeTable._load_rows``와 같은 방식으로 CSV를 읽는다."""
+
+    with Path(path).open("r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = []
+        for line_no, row in enumerate(reader, start=1):
+            cleaned = {
+                (key.strip() if key else ""): (value.strip() if value is not None else "")
+                for key, value in row.items()
+            }
+            try:
+                r = float(cleaned.get("range", ""))
+                mill = float(cleaned.get("mill", ""))
+                diff100m = float(cleaned.get("diff100m", ""))
+                eta = float(cleaned.get("eta", ""))
+            except (ValueError, TypeError):
+                continue
+            rows.append({"range": r, "mill": mill, "diff100m": diff100m, "eta": eta})
+    return rows
+
+
+def reference_supports_range(rows: List[Row], distance: float) -> bool:
+    if not rows:
+        return False
+    distances = [row["range"] for row in rows]
+    return min(distances) <= distance <= max(distances)
+
+
+def reference_neighbor_rows(rows: List[Row], distance: float) -> List[Row]:
+    ranges = [row["range"] for row in rows]
+    idx = bisect_left(ranges, distance)
+
+    neighbors = []
+    if idx > 0:
+        neighbors.append(rows[idx - 1])
+    if idx < len(rows):
+        neighbors.append(rows[idx])
+
+    remaining = []
+    if idx - 2 >= 0:
+        remaining.append(rows[idx - 2])
+    if idx + 1 < len(rows):
+        remaining.append(rows[idx + 1])
+
+    remaining.sort(key=lambda r: abs(r["range"] - distance))
+    for row in remaining:
+        if row not in neighbors:
+            neighbors.append(row)
+        if len(neighbors) >= 3:
+            break
+
+    neighbors.sort(key=lambda r: r["range"])
+    return neighbors
+
+
+def reference_interpolate(rows: List[Row], key: str, distance: float) -> float:
+    neighbors = reference_neighbor_rows(rows, distance)
+    if not neighbors:
+        raise ValueError("적절한 범위를 찾을 수 없습니다")
+
+    if len(neighbors) == 1:
+        return neighbors[0][key]
+    if len(neighbors) == 2 or neighbors[0]["range"] == neighbors[1]["range"]:
+        lower, upper = neighbors[0], neighbors[1]
+        if upper["range"] == lower["range"]:
+            return lower[key]
+        ratio = (distance - lower["range"]) / (upper["range"] - lower["range"])
+        return lower[key] + ratio * (upper[key] - lower[key])
+
+    x0, x1, x2 = (row["range"] for row in neighbors[:3])
+    y0, y1, y2 = (row[key] for row in neighbors[:3])
+
+    def basis(x, a, b):
+        return (x - a) / (b - a) if b != a else 0.0
+
+    t0 = basis(distance, x1, x0) * basis(distance, x2, x0)
+    t1 = basis(distance, x0, x1) * basis(distance, x2, x1)
+    t2 = basis(distance, x0, x2) * basis(distance, x1, x2)
+    return y0 * t0 + y1 * t1 + y2 * t2
+
+
+def reference_calculate(
+    rows: List[Row], charge: int, distance: float, altitude_delta: float
+) -> Optional[Dict[str, float]]:
+    """범위 밖이면 ``None``, 아니면 ``RangeTable.calculate``와 같은 형태의 결과를 반환한다."""
+
+    if not reference_supports_range(rows, distance):
+        return None
+
+    base_mill = reference_interpolate(rows, "mill", distance)
+    diff100m = reference_interpolate(rows, "diff100m", distance)
+    eta = reference_interpolate(rows, "eta", distance)
+
+    mill_adjust = (altitude_delta / 100.0) * diff100m
+    final_mill = base_mill + mill_adjust
+
+    return {
+        "mill": final_mill,
+        "eta": eta,
+        "charge": charge,
+        "base_mill": base_mill,
+        "diff100m": diff100m,
+    }
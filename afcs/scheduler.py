@@ -0,0 +1,150 @@
+"""여러 임무 탭이 나눠 쓰는 계산 작업 스레드.
+
+탭(키)마다 대기열을 두고 작업 스레드 하나가 대기 중인 탭을 돌아가며 한 건씩
+처리한다. 한 탭이 작업을 많이 쌓아도 다른 탭의 작업은 많아야 탭 수만큼만 기다린다.
+스레드는 첫 작업이 들어올 때 한 번만 만들어지고, 사거리표 캐시와 장비 목록은
+프로세스 전체에서 공유하므로 탭을 늘려도 메모리와 시작 비용이 늘지 않는다.
+
+완료·오류 콜백은 작업 스레드에서 불리므로 Tk 위젯은 ``after``로 넘겨 갱신한다.
+"""
+import threading
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+
+class Job:
+    __slots__ = ("key", "func", "on_done", "on_error", "cancelled")
+
+    def __init__(
+        self,
+        key: Hashable,
+        func: Callable[[], Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ):
+        self.key = key
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+
+class FairScheduler:
+    """탭별 대기열을 라운드 로빈으로 비우는 단일 작업 스레드."""
+
+    def __init__(self, name: str = "afcs-mission-worker"):
+        self.name = name
+        self._queues: Dict[Hashable, Deque[Job]] = {}
+        # 대기 중인 작업이 있는 키의 순번. 한 건을 꺼내면 남은 작업이 있을 때 맨 뒤로 보낸다.
+        self._turns: Deque[Hashable] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.completed = 0
+
+    def submit(
+        self,
+        key: Hashable,
+        func: Callable[[], Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        replace: bool = False,
+    ) -> Job:
+        """``key`` 대기열에 작업을 넣는다. ``replace``면 같은 키의 대기 작업을 버리고 이것만 남긴다."""
+
+        job = Job(key, func, on_done, on_error)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("작업 스레드가 이미 종료되었습니다")
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+                self._turns.append(key)
+            elif replace:
+                for pending in queue:
+                    pending.cancelled = True
+                queue.clear()
+            queue.append(job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return job
+
+    def cancel(self, key: Hashable) -> int:
+        """``key``의 대기 작업을 모두 버리고 버린 수를 반환한다. 실행 중인 작업은 끝까지 돈다."""
+
+        with self._condition:
+            queue = self._queues.pop(key, None)
+            if not queue:
+                return 0
+            self._turns.remove(key)
+            for job in queue:
+                job.cancelled = True
+            return len(queue)
+
+    def pending(self, key: Optional[Hashable] = None) -> int:
+        with self._condition:
+            if key is not None:
+                return len(self._queues.get(key, ()))
+            return sum(len(queue) for queue in self._queues.values())
+
+    def close(self, timeout: Optional[float] = None):
+        """대기 작업을 버리고 스레드를 멈춘다."""
+
+        with self._condition:
+            self._closed = True
+            for queue in self._queues.values():
+                for job in queue:
+                    job.cancelled = True
+            self._queues.clear()
+            self._turns.clear()
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _next(self) -> Optional[Job]:
+        with self._condition:
+            while not self._turns and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                return None
+            key = self._turns.popleft()
+            queue = self._queues[key]
+            job = queue.popleft()
+            if queue:
+                self._turns.append(key)
+            else:
+                del self._queues[key]
+            return job
+
+    def _run(self):
+        try:
+            while True:
+                job = self._next()
+                if job is None:
+                    return
+                try:
+                    result = job.func()
+                except Exception as exc:  # 작업 하나의 실패로 스레드가 멈추지 않도록 콜백으로 넘긴다.
+                    callback, value = job.on_error, exc
+                else:
+                    callback, value = job.on_done, result
+                self._callback(callback, value)
+                self.completed += 1
+        finally:
+            # 그래도 스레드가 끝나면 다음 ``submit``이 새 스레드를 띄우도록 비워 둔다.
+            with self._condition:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    @staticmethod
+    def _callback(callback: Optional[Callable[[Any], None]], value: Any):
+        # Tk 루트가 이미 닫혀 ``after``가 실패하는 경우 등 콜백 오류로 공유 스레드를 잃지 않는다.
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception:
+            traceback.print_exc()
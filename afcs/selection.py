@@ -0,0 +1,187 @@
+"""기준(criterion)에 따른 상위 k개 장약 선택.
+
+``find_solutions``는 거리를 지원하는 장약을 번호 순으로 앞에서 ``limit``개 고른다.
+여기서는 지원하는 모든 장약을 기준 함수로 점수화해 점수가 낮은 k개를 크기 k의
+힙으로 유지한다. 장약별 사거리 범위 색인으로 거리를 지원하지 않는 장약은 표를
+열지 않고 건너뛴다.
+"""
+import heapq
+from bisect import bisect_right
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from afcs.corrections import DEFAULT_PIPELINE, Conditions, CorrectionPipeline
+from afcs.equipment import Equipment
+from afcs.profiling import profiler
+from afcs.range_tables import RangeTable, get_range_table, resolve_charges
+from afcs.records import Solution
+
+# 기준: (table, distance, solution) -> 점수. 낮을수록 좋다.
+Criterion = Callable[[RangeTable, float, Solution], float]
+
+
+def _by_charge(table: RangeTable, distance: float, solution: Solution) -> float:
+    return float(solution.charge)
+
+
+def _min_eta(table: RangeTable, distance: float, solution: Solution) -> float:
+    return solution.eta
+
+
+def _max_margin(table: RangeTable, distance: float, solution: Solution) -> float:
+    # 표 양 끝에서 멀수록(중앙에 가까울수록) 보간이 안정적이다.
+    return -min(distance - table.min_range, table.max_range - distance)
+
+
+def _min_sensitivity(table: RangeTable, distance: float, solution: Solution) -> float:
+    # 고도 오차 100 m당 밀 변화가 작을수록 고도 측정 오차에 덜 민감하다.
+    return abs(solution.diff100m)
+
+
+CRITERIA: Dict[str, Criterion] = {
+    "charge": _by_charge,
+    "min_eta": _min_eta,
+    "max_margin": _max_margin,
+    "min_sensitivity": _min_sensitivity,
+}
+
+CRITERION_LABELS = {
+    "charge": "장약 순",
+    "min_eta": "최단 ETA",
+    "max_margin": "표 중앙",
+    "min_sensitivity": "고도 민감도 최소",
+}
+
+
+def register_criterion(name: str, criterion: Criterion, label: Optional[str] = None):
+    """선택 기준을 추가한다."""
+
+    CRITERIA[name] = criterion
+    CRITERION_LABELS[name] = label or name
+
+
+class ChargeBoundsIndex:
+    """장비·탄도 하나의 장약별 (최소 거리, 최대 거리) 색인.
+
+    최소 거리 오름차순으로 정렬해 두고 ``bisect``로 최소 거리가 목표 이하인 장약만
+    추린 뒤 최대 거리를 확인한다.
+    """
+
+    def __init__(self, tables: Dict[int, RangeTable]):
+        self.tables = tables
+        entries = sorted(
+            (table.min_range, table.max_range, charge)
+            for charge, table in tables.items()
+            if table.rows
+        )
+        self._mins = [entry[0] for entry in entries]
+        self._entries = entries
+
+    def covering(self, distance: float) -> List[int]:
+        """``distance``를 지원하는 장약 번호(오름차순)."""
+
+        end = bisect_right(self._mins, distance)
+        return sorted(charge for _, high, charge in self._entries[:end] if high >= distance)
+
+
+# (사거리표 폴더, 탄도, 장약 목록) -> 색인. 표가 다시 읽히면 색인도 새로 만든다.
+_INDEX_CACHE: Dict[Tuple[Path, str, Tuple[int, ...]], ChargeBoundsIndex] = {}
+
+
+def get_bounds_index(
+    equipment: Equipment, trajectory: str, charges: Optional[List[int]] = None
+) -> ChargeBoundsIndex:
+    if charges is None:
+        charges = resolve_charges(equipment, trajectory)
+    key = (equipment.range_table_dir, trajectory, tuple(charges))
+    index = _INDEX_CACHE.get(key)
+    if index is None:
+        tables = {}
+        for charge in charges:
+            try:
+                tables[charge] = get_range_table(equipment, trajectory, charge)
+            except FileNotFoundError:
+                continue
+        index = _INDEX_CACHE[key] = ChargeBoundsIndex(tables)
+    return index
+
+
+def select_solutions(
+    distance: float,
+    altitude_delta: float,
+    trajectory: str,
+    equipment: Equipment,
+    k: int = 3,
+    criterion: str = "min_eta",
+    charges: Optional[List[int]] = None,
+    conditions: Optional[Conditions] = None,
+    pipeline: CorrectionPipeline = DEFAULT_PIPELINE,
+) -> List[Solution]:
+    """``criterion`` 점수가 낮은 순으로 최대 ``k``개의 해를 반환한다.
+
+    각 해에는 ``score``가 추가된다. ``criterion="charge"``는 ``find_solutions``와 같은
+    결과를 낸다. ``conditions``를 주면 ``find_solutions``처럼 기상·장약 온도 보정을
+    더하고 ``deflection``을 붙인다. 기준 점수는 보정과 무관하므로 고른 k개에만 적용한다.
+    """
+
+    score = CRITERIA[criterion]
+    with profiler.span("charges"):
+        index = get_bounds_index(equipment, trajectory, charges)
+
+    # 최대 힙(부호 반전)으로 지금까지의 상위 k개만 유지한다.
+    heap: List[Tuple[float, int, Solution]] = []
+    for charge in index.covering(distance):
+        with profiler.span("table_load"):
+            table = get_range_table(equipment, trajectory, charge)
+        if table is not index.tables.get(charge):
+            # CSV가 바뀌어 다시 읽혔으면 색인을 버리고 새 범위로 다시 고른다.
+            _INDEX_CACHE.clear()
+            return select_solutions(
+                distance, altitude_delta, trajectory, equipment, k, criterion, charges,
+                conditions, pipeline,
+            )
+        with profiler.span("interpolate"):
+            solution = table.calculate(distance, altitude_delta)
+        value = score(table, distance, solution)
+        item = (-value, -charge, solution, table)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    ranked = sorted(heap, reverse=True)
+    results = []
+    for negative, _, solution, table in ranked:
+        solution.score = -negative
+        if conditions is not None:
+            _apply_corrections(
+                table, solution, distance, altitude_delta, trajectory, equipment, conditions, pipeline
+            )
+        results.append(solution)
+    return results
+
+
+def _apply_corrections(
+    table: RangeTable,
+    solution: Solution,
+    distance: float,
+    altitude_delta: float,
+    trajectory: str,
+    equipment: Equipment,
+    conditions: Conditions,
+    pipeline: CorrectionPipeline,
+):
+    # 2차원 표로 구한 밀에는 고도 보정이 이미 들어 있으므로 고도차 0으로 넘긴다.
+    gridded = table.uses_grid(distance, altitude_delta)
+    batch = pipeline.apply(
+        equipment,
+        trajectory,
+        solution.charge,
+        [distance],
+        [solution.mill if gridded else solution.base_mill],
+        [solution.diff100m],
+        [0.0 if gridded else altitude_delta],
+        [conditions],
+    )
+    solution.mill = batch.mills[0]
+    solution.deflection = batch.deflections[0]
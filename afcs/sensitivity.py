@@ -0,0 +1,227 @@
+"""사격 제원의 입력 오차 민감도와 분산 추정.
+
+거리 추정이 ±``RANGE_ERROR`` m, 고도차가 ±``ALTITUDE_ERROR`` m 틀렸을 때 밀과 ETA가 얼마나
+달라지는지를 구한다.
+
+* 해석적 방식: ``RangeTable.slopes``가 보간에 쓰는 이웃 행에서 d mill/d range,
+  d eta/d range를 미분식으로 구하고, 고도차 미분은 ``diff100m``(2차원 표가 덮으면 격자
+  기울기)을 쓴다. 띠 폭은 |미분| × 오차의 합이므로 해 하나당 비용이 보간 한 번 정도다.
+* 몬테카를로 방식: 거리·고도차를 정규분포로 수천 번 뽑아 거리순으로 정렬한 뒤
+  ``_sweep_rows`` 한 번으로 모두 보간하고 분위수로 구간을 낸다.
+
+    python -m afcs.sensitivity M109A6 12000 15000 --altitude-delta 40 --monte-carlo 5000
+"""
+import argparse
+import random
+import statistics
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.range_tables import RangeTable, get_range_table, resolve_charges
+from afcs.records import Solution
+
+TRAJECTORIES = ("low", "high")
+RANGE_ERROR = 50.0
+ALTITUDE_ERROR = 20.0
+MONTE_CARLO_DRAWS = 2000
+COVERAGE = 0.95
+
+
+@dataclass
+class Sensitivity:
+    """해 하나의 입력별 편미분(1 m당)."""
+
+    dmill_drange: float
+    deta_drange: float
+    dmill_daltitude: float
+    deta_daltitude: float = 0.0
+
+    def band(self, range_error: float = RANGE_ERROR, altitude_error: float = ALTITUDE_ERROR) -> "Band":
+        return Band(
+            abs(self.dmill_drange) * range_error + abs(self.dmill_daltitude) * altitude_error,
+            abs(self.deta_drange) * range_error + abs(self.deta_daltitude) * altitude_error,
+        )
+
+
+@dataclass
+class Band:
+    """밀과 ETA의 ± 폭."""
+
+    mill: float
+    eta: float
+
+
+@dataclass
+class Dispersion:
+    """몬테카를로 표본의 요약. ``low``/``high``는 ``coverage`` 구간의 양 끝이다."""
+
+    draws: int
+    outside: int
+    mill_mean: float
+    mill_std: float
+    mill_low: float
+    mill_high: float
+    eta_mean: float
+    eta_std: float
+    eta_low: float
+    eta_high: float
+
+
+def table_sensitivity(
+    table: RangeTable, distance: float, altitude_delta: float, diff100m: Optional[float] = None
+) -> Sensitivity:
+    """``table``로 계산한 해의 편미분. ``diff100m``을 주면 보간을 다시 하지 않는다."""
+
+    if table.uses_grid(distance, altitude_delta):
+        (dmill_dr, deta_dr), (dmill_da, deta_da) = table.grid.gradient(distance, altitude_delta)
+        return Sensitivity(dmill_dr, deta_dr, dmill_da, deta_da)
+    dbase, ddiff, deta = table.slopes(distance)
+    if diff100m is None:
+        diff100m = table.calculate(distance, altitude_delta).diff100m
+    return Sensitivity(dbase + (altitude_delta / 100.0) * ddiff, deta, diff100m / 100.0)
+
+
+def solution_bands(
+    solutions: Sequence[Solution],
+    distance: float,
+    altitude_delta: float,
+    trajectory: str,
+    equipment: Equipment,
+    range_error: float = RANGE_ERROR,
+    altitude_error: float = ALTITUDE_ERROR,
+) -> List[Band]:
+    """해 목록과 같은 순서로 ± 폭을 반환한다. 표는 ``get_range_table`` 캐시에서 가져온다."""
+
+    bands = []
+    for solution in solutions:
+        table = get_range_table(equipment, trajectory, solution.charge)
+        bands.append(
+            table_sensitivity(table, distance, altitude_delta, solution.diff100m).band(
+                range_error, altitude_error
+            )
+        )
+    return bands
+
+
+def _interval(values: List[float], coverage: float):
+    ordered = sorted(values)
+    tail = (1.0 - coverage) / 2.0
+    last = len(ordered) - 1
+    return ordered[int(tail * last)], ordered[int(round((1.0 - tail) * last))]
+
+
+def monte_carlo(
+    table: RangeTable,
+    distance: float,
+    altitude_delta: float,
+    range_sigma: float = RANGE_ERROR,
+    altitude_sigma: float = ALTITUDE_ERROR,
+    draws: int = MONTE_CARLO_DRAWS,
+    seed: Optional[int] = None,
+    coverage: float = COVERAGE,
+) -> Dispersion:
+    """거리·고도차를 정규분포(표준편차 ``range_sigma``/``altitude_sigma``)로 뽑아 분산을 추정한다.
+
+    표본은 거리순으로 정렬해 ``_sweep_rows``로 한 번에 보간한다. 표 범위 밖으로 나간
+    표본은 ``outside``로 세고 통계에서 뺀다.
+    """
+
+    rng = random.Random(seed)
+    samples = sorted(
+        (rng.gauss(distance, range_sigma), rng.gauss(altitude_delta, altitude_sigma))
+        for _ in range(draws)
+    )
+    grid = table.grid
+    mills: List[float] = []
+    etas: List[float] = []
+    rows = table._sweep_rows([sample[0] for sample in samples])
+    for (point, delta), row in zip(samples, rows):
+        if row is None:
+            continue
+        base_mill, diff100m, eta = row
+        if grid is not None and grid.covers(point, delta):
+            mill, eta = grid.lookup(point, delta)
+        else:
+            mill = base_mill + (delta / 100.0) * diff100m
+        mills.append(mill)
+        etas.append(eta)
+    if not mills:
+        raise ValueError("표본이 모두 사거리표 범위 밖입니다")
+    mill_low, mill_high = _interval(mills, coverage)
+    eta_low, eta_high = _interval(etas, coverage)
+    return Dispersion(
+        draws,
+        draws - len(mills),
+        statistics.fmean(mills),
+        statistics.pstdev(mills),
+        mill_low,
+        mill_high,
+        statistics.fmean(etas),
+        statistics.pstdev(etas),
+        eta_low,
+        eta_high,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="사격 제원의 거리·고도 오차 민감도")
+    parser.add_argument("equipment", help="장비 이름(예: M109A6)")
+    parser.add_argument("distances", nargs="+", type=float, help="목표 거리(m)")
+    parser.add_argument("--altitude-delta", type=float, default=0.0, help="고도차(사수-목표, m)")
+    parser.add_argument("--range-error", type=float, default=RANGE_ERROR, help="거리 오차(m)")
+    parser.add_argument("--altitude-error", type=float, default=ALTITUDE_ERROR, help="고도 오차(m)")
+    parser.add_argument(
+        "--monte-carlo", type=int, default=0, metavar="N", help="N개 표본으로 분산도 추정한다"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    equipment = EquipmentRegistry().get(args.equipment)
+    if equipment is None:
+        parser.error(f"'{args.equipment}' 장비 정보를 찾을 수 없습니다.")
+    found = False
+    for distance in args.distances:
+        print(f"거리 {distance:g} m, 고도차 {args.altitude_delta:+g} m")
+        for trajectory in TRAJECTORIES:
+            for charge in resolve_charges(equipment, trajectory):
+                try:
+                    table = get_range_table(equipment, trajectory, charge)
+                except FileNotFoundError:
+                    continue
+                if not table.supports_range(distance):
+                    continue
+                found = True
+                solution = table.calculate(distance, args.altitude_delta)
+                sensitivity = table_sensitivity(
+                    table, distance, args.altitude_delta, solution.diff100m
+                )
+                band = sensitivity.band(args.range_error, args.altitude_error)
+                line = (
+                    f"  {trajectory.upper():<4} CH{charge:<2} {solution.mill:9.2f} ±{band.mill:<6.2f} mil "
+                    f"{solution.eta:6.1f} ±{band.eta:<5.2f} s  "
+                    f"(dmill/dr {sensitivity.dmill_drange:+.4f}, dmill/dalt {sensitivity.dmill_daltitude:+.4f})"
+                )
+                if args.monte_carlo:
+                    dispersion = monte_carlo(
+                        table,
+                        distance,
+                        args.altitude_delta,
+                        args.range_error,
+                        args.altitude_error,
+                        args.monte_carlo,
+                        args.seed,
+                    )
+                    line += (
+                        f"\n        몬테카를로 {dispersion.draws}회: 밀 {dispersion.mill_low:.2f}"
+                        f"~{dispersion.mill_high:.2f} (σ {dispersion.mill_std:.2f}), ETA "
+                        f"{dispersion.eta_low:.1f}~{dispersion.eta_high:.1f} (σ {dispersion.eta_std:.2f})"
+                        f", 범위 밖 {dispersion.outside}회"
+                    )
+                print(line)
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""사거리표·장비 스냅숏 동시성 부하 검사.
+
+여러 읽기 스레드가 ``get_range_table``과 ``EquipmentRegistry``를 쉬지 않고 읽는 동안
+쓰기 스레드가 표를 다시 읽어 스냅숏을 바꿔 끼우고(``reload_tables``), 레지스트리를
+새로 스캔하고, 선택하면 CSV 수정 시각을 바꿔 읽는 쪽의 미스 경로까지 일으킨다.
+
+표 내용은 바뀌지 않으므로 읽은 값이 미리 계산한 값과 다르거나 표의 열 길이가 서로
+맞지 않으면 찢어진 읽기(torn read)로 센다. 먼저 쓰기 스레드 없이 기준 지연 시간을
+재고, 교체 중의 지연 시간 분포와 비교한다. 원본 ``rangeTables``는 건드리지 않고 임시
+폴더에 복사해 쓴다.
+
+    python -m afcs.stress --readers 8 --seconds 5
+    python -m afcs.stress M119 --touch --reload-hz 50
+"""
+import argparse
+import dataclasses
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from afcs.equipment import Equipment, EquipmentRegistry
+from afcs.range_tables import (
+    clear_table_cache,
+    get_range_table,
+    reload_tables,
+    resolve_charges,
+    table_snapshot,
+)
+
+TRAJECTORIES = ("low", "high")
+DEFAULT_READERS = 8
+DEFAULT_SECONDS = 3.0
+DEFAULT_RELOAD_HZ = 20.0
+DEFAULT_SPIKE_MS = 100.0
+DEFAULT_TOLERANCE = 3.0
+SAMPLES_PER_TABLE = 16
+
+# (탄도, 장약, 거리) -> (mill, eta)
+Expected = Dict[Tuple[str, int, float], Tuple[float, float]]
+
+
+@dataclass
+class PhaseStats:
+    """한 구간(기준 또는 교체 중)의 읽기 결과."""
+
+    reads: int = 0
+    torn_reads: int = 0
+    spikes: int = 0
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self, label: str) -> str:
+        us = 1_000_000.0
+        return (
+            f"{label}: 읽기 {self.reads}회 · 지연(µs) p50 {self.percentile(0.5) * us:.1f} · "
+            f"p99 {self.percentile(0.99) * us:.1f} · p99.9 {self.percentile(0.999) * us:.1f} · "
+            f"최대 {max(self.latencies, default=0.0) * us:.1f} · 급증 {self.spikes}건 · "
+            f"찢어진 읽기 {self.torn_reads}건"
+        )
+
+
+@dataclass
+class StressReport:
+    """``baseline``은 쓰기 스레드 없이, ``loaded``는 교체가 일어나는 동안 잰 값이다.
+
+    읽기 스레드끼리 GIL을 나눠 쓰는 것만으로도 가끔 긴 지연이 생기므로, 교체 중의
+    p99 지연이 기준 p99의 ``tolerance``배를 넘을 때만 지연 급증으로 판정한다.
+    """
+
+    baseline: PhaseStats = field(default_factory=PhaseStats)
+    loaded: PhaseStats = field(default_factory=PhaseStats)
+    tolerance: float = 3.0
+    reloads: int = 0
+    refreshes: int = 0
+    touches: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def torn_reads(self) -> int:
+        return self.baseline.torn_reads + self.loaded.torn_reads
+
+    @property
+    def latency_regressed(self) -> bool:
+        return self.loaded.percentile(0.99) > self.baseline.percentile(0.99) * self.tolerance
+
+    @property
+    def ok(self) -> bool:
+        return not self.torn_reads and not self.latency_regressed and not self.errors
+
+    def summary(self) -> str:
+        lines = [
+            self.baseline.summary("기준"),
+            self.loaded.summary("교체 중"),
+            f"스냅숏 교체 {self.reloads}회, 레지스트리 갱신 {self.refreshes}회, 수정 시각 변경 {self.touches}회",
+            f"찢어진 읽기 {self.torn_reads}건, p99 지연 {'증가' if self.latency_regressed else '정상'}"
+            f" (허용 {self.tolerance:g}배)",
+        ]
+        lines.extend(f"오류: {error}" for error in self.errors[:10])
+        return "\n".join(lines)
+
+
+def _expected_values(equipment: Equipment, rng: random.Random) -> Expected:
+    expected: Expected = {}
+    for trajectory in TRAJECTORIES:
+        for charge in resolve_charges(equipment, trajectory):
+            try:
+                table = get_range_table(equipment, trajectory, charge)
+            except FileNotFoundError:
+                continue
+            if not table.rows:
+                continue
+            for _ in range(SAMPLES_PER_TABLE):
+                distance = rng.uniform(table.min_range, table.max_range)
+                solution = table.calculate(distance, 0.0)
+                expected[(trajectory, charge, distance)] = (solution.mill, solution.eta)
+    return expected
+
+
+def _consistent(table) -> bool:
+    count = len(table.ranges)
+    return (
+        all(len(column) == count for column in table.columns.values())
+        and (not count or (table.ranges[0] == table.min_range and table.ranges[-1] == table.max_range))
+    )
+
+
+def run_stress(
+    equipment: Equipment,
+    readers: int = DEFAULT_READERS,
+    seconds: float = DEFAULT_SECONDS,
+    reload_hz: float = DEFAULT_RELOAD_HZ,
+    touch: bool = False,
+    spike_ms: float = DEFAULT_SPIKE_MS,
+    seed: int = 0,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> StressReport:
+    """임시 폴더에 복사한 ``equipment``의 표로 기준 구간(``seconds``의 절반)과 교체 구간을 잰다."""
+
+    report = StressReport(tolerance=tolerance)
+    workdir = Path(tempfile.mkdtemp(prefix="afcs_stress_"))
+    try:
+        shutil.copytree(equipment.range_table_dir, workdir / equipment.prefix)
+        equipment = dataclasses.replace(equipment, table_root=workdir)
+        registry = EquipmentRegistry()
+        clear_table_cache()
+        expected = _expected_values(equipment, random.Random(seed))
+        if not expected:
+            report.errors.append(f"{equipment.name}: 사거리표가 없습니다")
+            return report
+        keys = list(expected)
+        paths = sorted((workdir / equipment.prefix).glob("*.csv"))
+        lock = threading.Lock()
+        spike_seconds = spike_ms / 1000.0
+
+        def _reader(index: int, stop: threading.Event, stats: PhaseStats):
+            rng = random.Random(seed + index + 1)
+            latencies = []
+            torn = spikes = 0
+            errors = []
+            while not stop.is_set():
+                trajectory, charge, distance = key = keys[rng.randrange(len(keys))]
+                started = time.perf_counter()
+                try:
+                    table = get_range_table(equipment, trajectory, charge)
+                    solution = table.calculate(distance, 0.0)
+                    snapshot = registry.snapshot()
+                except Exception as exc:  # 부하 중 어떤 예외든 결과로 보고한다.
+                    errors.append(f"{type(exc).__name__}: {exc}")
+                    continue
+                elapsed = time.perf_counter() - started
+                latencies.append(elapsed)
+                if elapsed > spike_seconds:
+                    spikes += 1
+                if (solution.mill, solution.eta) != expected[key] or not _consistent(table):
+                    torn += 1
+                if len(snapshot.names) != len(snapshot.equipments) or any(
+                    snapshot.by_name.get(name) is not equipment_
+                    for name, equipment_ in zip(snapshot.names, snapshot.equipments)
+                ):
+                    torn += 1
+            with lock:
+                stats.reads += len(latencies)
+                stats.torn_reads += torn
+                stats.spikes += spikes
+                stats.latencies.extend(latencies)
+                report.errors.extend(errors)
+
+        def _writer(stop: threading.Event):
+            rng = random.Random(seed)
+            interval = 1.0 / reload_hz if reload_hz > 0 else 0.0
+            while not stop.is_set():
+                action = rng.random()
+                if touch and action < 0.3:
+                    path = paths[rng.randrange(len(paths))]
+                    stat = path.stat()
+                    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                    report.touches += 1
+                elif action < 0.8:
+                    reload_tables(equipment)
+                    report.reloads += 1
+                else:
+                    registry.refresh()
+                    report.refreshes += 1
+                if interval:
+                    stop.wait(interval)
+
+        def _phase(duration: float, stats: PhaseStats, with_writer: bool):
+            stop = threading.Event()
+            threads = [
+                threading.Thread(target=_reader, args=(i, stop, stats), daemon=True)
+                for i in range(readers)
+            ]
+            if with_writer:
+                threads.append(threading.Thread(target=_writer, args=(stop,), daemon=True))
+            for thread in threads:
+                thread.start()
+            stop.wait(duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        _phase(seconds / 2.0, report.baseline, with_writer=False)
+        _phase(seconds, report.loaded, with_writer=True)
+        return report
+    finally:
+        clear_table_cache()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="사거리표 스냅숏 동시 읽기·교체 부하 검사")
+    parser.add_argument("equipment", nargs="?", default="M109A6", help="장비 이름")
+    parser.add_argument("--readers", type=int, default=DEFAULT_READERS, help="읽기 스레드 수")
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS, help="실행 시간(초)")
+    parser.add_argument(
+        "--reload-hz", type=float, default=DEFAULT_RELOAD_HZ, help="초당 교체 횟수(0이면 쉬지 않음)"
+    )
+    parser.add_argument(
+        "--touch", action="store_true", help="CSV 수정 시각도 바꿔 읽는 쪽의 다시 읽기 경로를 일으킨다"
+    )
+    parser.add_argument(
+        "--spike-ms", type=float, default=DEFAULT_SPIKE_MS, help="지연 급증으로 볼 읽기 시간(ms)"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="교체 중 p99 지연의 허용 배수"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    equipment = EquipmentRegistry().get(args.equipment)
+    if equipment is None:
+        parser.error(f"'{args.equipment}' 장비 정보를 찾을 수 없습니다.")
+    report = run_stress(
+        equipment,
+        args.readers,
+        args.seconds,
+        args.reload_hz,
+        args.touch,
+        args.spike_ms,
+        args.seed,
+        args.tolerance,
+    )
+    print(report.summary())
+    print(f"최종 스냅숏 버전 {table_snapshot().version}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""확장성 검증용 합성 사거리표 생성기.
+
+실제 표와 같은 ``<prefix>/<prefix>_rangeTable_<trajectory>_<charge>.csv`` 구조로
+물리적으로 그럴듯한(탄도 공식 기반) 표를 만들고, 표 크기에 따른 로드 시간,
+메모리, 조회 지연 시간을 측정한다.
+
+    python -m afcs.synthetic generate out/ --rows 100000 --charges 200
+    python -m afcs.synthetic scale --sizes 100 1000 10000 100000 1000000
+"""
+import argparse
+import csv
+import json
+import math
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from afcs.equipment import Equipment
+from afcs.range_tables import RangeTable
+
+GRAVITY = 9.80665
+MILS_PER_RADIAN = 6400 / (2 * math.pi)
+# 공기 저항으로 진공 사거리가 줄어드는 비율(단순 근사)
+DRAG_FACTOR = 0.7
+MIN_VELOCITY = 200.0
+MAX_VELOCITY = 800.0
+TRAJECTORIES = ("low", "high")
+HEADER = ("range", "mill", "diff100m", "eta")
+
+
+def charge_velocity(charge: int, charge_count: int) -> float:
+    """장약 번호에 따라 포구 속도를 선형으로 늘린다."""
+
+    if charge_count <= 1:
+        return MAX_VELOCITY
+    return MIN_VELOCITY + (MAX_VELOCITY - MIN_VELOCITY) * charge / (charge_count - 1)
+
+
+def synthetic_rows(trajectory: str, velocity: float, row_count: int) -> Iterable[tuple]:
+    """거리 오름차순의 (range, mill, diff100m, eta) 행을 생성한다."""
+
+    max_range = DRAG_FACTOR * velocity * velocity / GRAVITY
+    low = max_range * 0.05
+    high = max_range * 0.98
+    step = (high - low) / max(row_count - 1, 1)
+    for i in range(row_count):
+        distance = low + step * i
+        ratio = min(distance / max_range, 1.0)
+        if trajectory == "low":
+            angle = math.asin(ratio) / 2.0
+        else:
+            angle = (math.pi - math.asin(ratio)) / 2.0
+        mill = angle * MILS_PER_RADIAN
+        # 고도차(사수 - 목표) 100 m당 밀 변화(근사). 실제 표처럼 저각은 음수, 고각은 양수다.
+        diff100m = 100.0 / distance * MILS_PER_RADIAN * (-1.0 if trajectory == "low" else 0.25)
+        eta = 2.0 * velocity * math.sin(angle) / GRAVITY * DRAG_FACTOR
+        yield distance, mill, diff100m, eta
+
+
+def write_table(path: Path, rows: Iterable[tuple]) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for distance, mill, diff100m, eta in rows:
+            writer.writerow((f"{distance:.4f}", f"{mill:.4f}", f"{diff100m:.4f}", f"{eta:.3f}"))
+            count += 1
+    return count
+
+
+def write_equipment_module(path: Path, name: str, prefix: str):
+    """``afcs/equipment``에 그대로 넣을 수 있는 장비 정의 모듈을 쓴다."""
+
+    path.write_text(
+        "from .base import Equipment\n\n"
+        f'EQUIPMENT = Equipment(name="{name}", prefix="{prefix}")\n',
+        encoding="utf-8",
+    )
+
+
+def generate_equipment(
+    output_root: Path,
+    name: str = "SYN",
+    prefix: Optional[str] = None,
+    rows: int = 1000,
+    charges: int = 5,
+    trajectories: Sequence[str] = TRAJECTORIES,
+) -> Equipment:
+    """합성 표를 ``output_root/<prefix>`` 아래에 쓰고 해당 장비 객체를 반환한다."""
+
+    prefix = prefix or name
+    output_root = Path(output_root)
+    equipment = Equipment(name=name, prefix=prefix, table_root=output_root)
+    for trajectory in trajectories:
+        for charge in range(charges):
+            velocity = charge_velocity(charge, charges)
+            path = equipment.range_table_dir / f"{prefix}_rangeTable_{trajectory}_{charge}.csv"
+            write_table(path, synthetic_rows(trajectory, velocity, rows))
+    write_equipment_module(output_root / f"{prefix.lower()}.py", name, prefix)
+    return equipment
+
+
+def _measure_size(root: Path, size: int, queries: int, budget: float, rng: random.Random) -> Dict:
+    equipment = generate_equipment(
+        root / f"n{size}", name=f"SYN{size}", rows=size, charges=1, trajectories=("low",)
+    )
+
+    started = time.perf_counter()
+    table = RangeTable(equipment, "low", 0)
+    load_seconds = time.perf_counter() - started
+
+    # tracemalloc은 로드를 크게 느리게 하므로 메모리는 별도로 한 번 더 읽어서 잰다.
+    del table
+    tracemalloc.start()
+    table = RangeTable(equipment, "low", 0)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ranges = [row["range"] for row in table.rows]
+    low, high = min(ranges), max(ranges)
+    samples = []
+    deadline = time.perf_counter() + budget
+    for i in range(queries):
+        distance = rng.uniform(low, high)
+        started = time.perf_counter()
+        if table.supports_range(distance):
+            table.calculate(distance, 0.0)
+        samples.append(time.perf_counter() - started)
+        if i >= 4 and time.perf_counter() > deadline:
+            break
+
+    return {
+        "rows": size,
+        "load_ms": load_seconds * 1000.0,
+        "memory_mb": retained / (1024 * 1024),
+        "peak_memory_mb": peak / (1024 * 1024),
+        "query_us": statistics.median(samples) * 1e6,
+        "queries": len(samples),
+    }
+
+
+def run_scaling(
+    sizes: Sequence[int], queries: int = 2000, budget: float = 2.0, seed: int = 0
+) -> List[Dict]:
+    rng = random.Random(seed)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="afcs_synthetic_") as tmp:
+        for size in sizes:
+            results.append(_measure_size(Path(tmp), size, queries, budget, rng))
+    return results
+
+
+def format_chart(results: List[Dict], key: str, unit: str, width: int = 40) -> str:
+    """표 크기별 값을 막대 그래프 문자열로 만든다."""
+
+    peak = max((result[key] for result in results), default=0.0) or 1.0
+    lines = [f"{key} ({unit})"]
+    for result in results:
+        bar = "█" * max(1, round(result[key] / peak * width))
+        lines.append(f"{result['rows']:>9} | {bar} {result[key]:.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="합성 사거리표 생성 및 확장성 측정")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="합성 사거리표를 생성합니다")
+    gen.add_argument("output", help="생성할 rangeTables 루트 경로")
+    gen.add_argument("--name", default="SYN")
+    gen.add_argument("--prefix")
+    gen.add_argument("--rows", type=int, default=1000, help="표당 행 수")
+    gen.add_argument("--charges", type=int, default=5, help="탄도별 장약 수")
+    gen.add_argument("--trajectory", action="append", choices=TRAJECTORIES)
+
+    scale = sub.add_parser("scale", help="표 크기별 확장성을 측정합니다")
+    scale.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    scale.add_argument("--queries", type=int, default=2000, help="크기별 최대 조회 횟수")
+    scale.add_argument("--budget", type=float, default=2.0, help="크기별 조회 시간 한도(초)")
+    scale.add_argument("--output", help="결과를 저장할 JSON 경로")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        equipment = generate_equipment(
+            Path(args.output),
+            name=args.name,
+            prefix=args.prefix,
+            rows=args.rows,
+            charges=args.charges,
+            trajectories=args.trajectory or TRAJECTORIES,
+        )
+        print(f"{equipment.range_table_dir} 에 생성했습니다")
+        return 0
+
+    results = run_scaling(args.sizes, args.queries, args.budget)
+    for key, unit in (("load_ms", "ms"), ("memory_mb", "MB"), ("query_us", "us")):
+        print(format_chart(results, key, unit))
+        print()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
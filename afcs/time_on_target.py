@@ -0,0 +1,273 @@
+"""동시 탄착(Time on Target) 사격 계획.
+
+여러 사격 단위(포)와 목표가 있고 목표마다 원하는 탄착 시각이 정해져 있을 때, 보간한
+비행 시간(ETA)으로 포별 발사 시각(탄착 시각 - ETA)을 구한다. 목표는 우선순위 큐에서
+우선순위가 높고 탄착 시각이 이른 순으로 꺼내 탐욕적으로 배정하고, 한 포가
+``min_interval``초 안에 두 번 쏘아야 하는 충돌은 다른 포·장약·탄도로 돌리거나 배정
+실패로 보고한다.
+
+    python -m afcs.time_on_target units.csv targets.csv --interval 20
+"""
+import argparse
+import csv
+import heapq
+import sys
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from afcs.equipment import EquipmentRegistry
+from afcs.geometry import GridPoint, solve_geometry, solve_geometry_columns
+from afcs.range_tables import find_solutions_batch, resolve_charges
+
+TRAJECTORIES = ("low", "high")
+# 같은 포가 연속으로 발사할 때 필요한 최소 간격(초, 장전·방렬 시간)
+DEFAULT_MIN_INTERVAL = 20.0
+
+
+@dataclass
+class FireUnit:
+    name: str
+    equipment: str
+    position: GridPoint
+
+
+@dataclass
+class TotTarget:
+    """``impact_time``은 기준 시각(H시) 이후의 초. ``guns``문이 동시에 탄착해야 한다."""
+
+    name: str
+    position: GridPoint
+    impact_time: float
+    guns: int = 1
+    priority: int = 0
+
+
+@dataclass
+class FireOrder:
+    fire_time: float
+    unit: str
+    target: str
+    trajectory: str
+    charge: int
+    mill: float
+    eta: float
+    azimuth_mils: float
+    distance: float
+
+
+@dataclass
+class TotPlan:
+    orders: List[FireOrder] = field(default_factory=list)
+    # (목표 이름, 사유)
+    unassigned: List[Tuple[str, str]] = field(default_factory=list)
+
+
+# 선택지: (eta, 포 인덱스, 탄도, 장약, 밀). 튜플이라 그대로 정렬하면 ETA가 짧은 순이 된다.
+_Option = Tuple[float, int, str, int, float]
+
+
+class _UnitTimeline:
+    """포 하나의 발사 시각 목록. 이분 탐색으로 ``min_interval`` 안의 충돌을 확인한다."""
+
+    def __init__(self):
+        self.times: List[float] = []
+
+    def is_free(self, fire_time: float, min_interval: float) -> bool:
+        i = bisect_left(self.times, fire_time - min_interval)
+        return i == len(self.times) or self.times[i] > fire_time + min_interval - 1e-9
+
+    def book(self, fire_time: float):
+        insort(self.times, fire_time)
+
+
+def _options(
+    units: List[FireUnit], targets: List[TotTarget], registry: EquipmentRegistry
+) -> List[List[_Option]]:
+    """목표별로 모든 (포, 탄도, 장약) 선택지를 ETA 오름차순으로 만든다.
+
+    같은 장비의 포와 모든 목표 쌍을 한데 모아 ``find_solutions_batch``로 한 번에 푼다.
+    """
+
+    options: List[List[_Option]] = [[] for _ in targets]
+    eastings = [target.position.easting for target in targets]
+    northings = [target.position.northing for target in targets]
+    altitudes = [target.position.altitude for target in targets]
+
+    by_equipment: Dict[str, List[int]] = {}
+    for index, unit in enumerate(units):
+        by_equipment.setdefault(unit.equipment, []).append(index)
+
+    for name, unit_indices in by_equipment.items():
+        equipment = registry.get(name)
+        if equipment is None:
+            continue
+        pairs = []
+        distances = []
+        deltas = []
+        for unit_index in unit_indices:
+            geometries = solve_geometry_columns(
+                units[unit_index].position, eastings, northings, altitudes
+            )
+            for target_index, geometry in enumerate(geometries):
+                pairs.append((unit_index, target_index))
+                distances.append(geometry.distance)
+                deltas.append(geometry.altitude_delta)
+        for trajectory in TRAJECTORIES:
+            charges = resolve_charges(equipment, trajectory)
+            if not charges:
+                continue
+            block = find_solutions_batch(distances, deltas, trajectory, equipment, None, charges)
+            # 해 객체를 만들지 않고 결과 블록의 열을 바로 읽는다.
+            etas, block_charges, mills = block.etas, block.charges, block.mills
+            for point, (unit_index, target_index) in enumerate(pairs):
+                options[target_index].extend(
+                    (etas[row], unit_index, trajectory, block_charges[row], mills[row])
+                    for row in block.rows(point)
+                )
+    for target_options in options:
+        target_options.sort()
+    return options
+
+
+def plan_time_on_target(
+    units: List[FireUnit],
+    targets: List[TotTarget],
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    registry: Optional[EquipmentRegistry] = None,
+) -> TotPlan:
+    """목표를 (우선순위 높은 순, 탄착 시각 이른 순)으로 꺼내 포를 탐욕적으로 배정한다.
+
+    목표마다 ETA가 짧은 선택지부터 보되, 같은 목표에는 한 포를 한 번만 쓰고 이미
+    ``min_interval`` 안에 발사가 잡힌 포는 건너뛴다. 결과 명령은 발사 시각 순이다.
+    """
+
+    registry = registry or EquipmentRegistry()
+    options = _options(units, targets, registry)
+    timelines = [_UnitTimeline() for _ in units]
+    plan = TotPlan()
+
+    queue = [(-target.priority, target.impact_time, i) for i, target in enumerate(targets)]
+    heapq.heapify(queue)
+    orders: List[Tuple[float, int, FireOrder]] = []
+
+    while queue:
+        _, _, target_index = heapq.heappop(queue)
+        target = targets[target_index]
+        if not options[target_index]:
+            plan.unassigned.append((target.name, "사거리 안의 포가 없습니다"))
+            continue
+
+        chosen: List[Tuple[_Option, float]] = []
+        used_units = set()
+        for option in options[target_index]:
+            eta, unit_index = option[0], option[1]
+            if unit_index in used_units:
+                continue
+            fire_time = target.impact_time - eta
+            if not timelines[unit_index].is_free(fire_time, min_interval):
+                continue
+            chosen.append((option, fire_time))
+            used_units.add(unit_index)
+            if len(chosen) >= target.guns:
+                break
+
+        if len(chosen) < target.guns:
+            plan.unassigned.append(
+                (target.name, f"필요한 {target.guns}문 중 {len(chosen)}문만 시간 충돌 없이 배정 가능")
+            )
+            continue
+
+        unit_positions = {option[1] for option, _ in chosen}
+        geometries = {
+            unit_index: solve_geometry(units[unit_index].position, target.position)
+            for unit_index in unit_positions
+        }
+        for (eta, unit_index, trajectory, charge, mill), fire_time in chosen:
+            timelines[unit_index].book(fire_time)
+            geometry = geometries[unit_index]
+            order = FireOrder(
+                fire_time=fire_time,
+                unit=units[unit_index].name,
+                target=target.name,
+                trajectory=trajectory,
+                charge=charge,
+                mill=mill,
+                eta=eta,
+                azimuth_mils=geometry.azimuth_mils,
+                distance=geometry.distance,
+            )
+            heapq.heappush(orders, (fire_time, len(orders), order))
+
+    while orders:
+        plan.orders.append(heapq.heappop(orders)[2])
+    return plan
+
+
+def read_units(path: Path) -> List[FireUnit]:
+    """``name,equipment,easting,northing,altitude`` 열을 가진 CSV를 읽는다."""
+
+    with Path(path).open("r", encoding="utf-8", newline="") as f:
+        return [
+            FireUnit(
+                row["name"].strip(),
+                row["equipment"].strip(),
+                GridPoint(float(row["easting"]), float(row["northing"]), float(row["altitude"])),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def read_targets(path: Path) -> List[TotTarget]:
+    """``name,easting,northing,altitude,impact_time[,guns,priority]`` 열을 가진 CSV를 읽는다."""
+
+    with Path(path).open("r", encoding="utf-8", newline="") as f:
+        return [
+            TotTarget(
+                row["name"].strip(),
+                GridPoint(float(row["easting"]), float(row["northing"]), float(row["altitude"])),
+                float(row["impact_time"]),
+                int(row.get("guns") or 1),
+                int(row.get("priority") or 0),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def format_plan(plan: TotPlan) -> str:
+    lines = [
+        f"{'발사(s)':>8} {'포':<8} {'목표':<8} {'탄도':<5} {'CH':>3} {'MILL':>9} {'ETA':>6} {'방위(mil)':>9}"
+    ]
+    for order in plan.orders:
+        lines.append(
+            f"{order.fire_time:>8.1f} {order.unit:<8} {order.target:<8} {order.trajectory.upper():<5} "
+            f"{order.charge:>3} {order.mill:>9.2f} {order.eta:>6.1f} {order.azimuth_mils:>9.0f}"
+        )
+    for name, reason in plan.unassigned:
+        lines.append(f"배정 실패 {name}: {reason}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="동시 탄착 사격 계획")
+    parser.add_argument("units", help="사격 단위 CSV")
+    parser.add_argument("targets", help="목표 CSV")
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_MIN_INTERVAL, help="같은 포의 최소 발사 간격(초)"
+    )
+    args = parser.parse_args(argv)
+
+    units = read_units(Path(args.units))
+    targets = read_targets(Path(args.targets))
+    started = time.perf_counter()
+    plan = plan_time_on_target(units, targets, args.interval)
+    elapsed = time.perf_counter() - started
+    print(format_plan(plan))
+    print(f"포 {len(units)}문, 목표 {len(targets)}개, 명령 {len(plan.orders)}건, {elapsed * 1000.0:.1f} ms")
+    return 1 if plan.unassigned else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""사거리표 정규화 및 검증.
+
+``RangeTable``의 빠른 경로는 거리 열이 엄격히 증가한다는 불변식을 전제로 한다.
+이 모듈은 CSV를 한 번 읽을 때 행을 정렬하고, 순서가 어긋난 행과 중복 거리를
+정리하고, 밀과 ETA 열의 단조성을 확인하며, 건너뛴 줄을 보고한다.
+
+    python -m afcs.validation            # rangeTables 전체 검사
+    python -m afcs.validation --write    # 정규화된 CSV로 다시 저장
+"""
+import argparse
+import csv
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from afcs.altitude_grid import GRID_SUFFIX
+from afcs.equipment.base import RANGE_TABLE_ROOT
+
+COLUMNS = ("range", "mill", "diff100m", "eta")
+DUPLICATE_POLICIES = ("first", "mean", "reject")
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class TableValidationError(ValueError):
+    """``duplicates="reject"``일 때 충돌하는 중복 거리를 만나면 발생한다."""
+
+
+@dataclass
+class TableIssue:
+    severity: str
+    kind: str
+    line: Optional[int]
+    message: str
+
+    def __str__(self):
+        where = f"{self.line}행" if self.line else "-"
+        return f"[{self.severity}] {self.kind} ({where}): {self.message}"
+
+
+@dataclass
+class ValidationReport:
+    """정규화된 행과 검사 중 발견한 문제 목록."""
+
+    path: Path
+    rows: List[Dict[str, float]] = field(default_factory=list)
+    issues: List[TableIssue] = field(default_factory=list)
+    skipped_lines: List[int] = field(default_factory=list)
+
+    @property
+    def errors(self) -> List[TableIssue]:
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    @property
+    def warnings(self) -> List[TableIssue]:
+        return [issue for issue in self.issues if issue.severity == WARNING]
+
+    def add(self, severity: str, kind: str, line: Optional[int], message: str):
+        self.issues.append(TableIssue(severity, kind, line, message))
+
+
+def _skip_reason(values: List[str]) -> str:
+    for column, value in zip(COLUMNS, values):
+        if not value:
+            return f"{column} 값이 비어 있습니다"
+        try:
+            float(value)
+        except ValueError:
+            return f"{column} 값 '{value}'을(를) 숫자로 읽을 수 없습니다"
+    return "숫자로 읽을 수 없는 행"
+
+
+def _report_skipped(skipped: List[Tuple[int, str]], report: ValidationReport):
+    """연속된 줄이 같은 이유로 건너뛰어졌으면 한 건으로 묶어 보고한다."""
+
+    run: List[Tuple[int, str]] = []
+
+    def _flush():
+        if not run:
+            return
+        first, reason = run[0]
+        last = run[-1][0]
+        where = f"{first}-{last}행({len(run)}줄)" if len(run) > 1 else f"{first}행"
+        report.add(WARNING, "skipped", first, f"{where} 건너뜀: {reason}")
+
+    for line_no, reason in skipped:
+        report.skipped_lines.append(line_no)
+        if run and (reason != run[-1][1] or line_no != run[-1][0] + 1):
+            _flush()
+            run = []
+        run.append((line_no, reason))
+    _flush()
+
+
+def _read_raw(path: Path, report: ValidationReport) -> List[Tuple[int, Dict[str, float]]]:
+    rows = []
+    skipped = []
+    with path.open("r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader, [])]
+        missing = [column for column in COLUMNS if column not in header]
+        if missing:
+            report.add(ERROR, "missing_column", 1, f"헤더에 {', '.join(missing)} 열이 없습니다")
+            return rows
+        positions = [header.index(column) for column in COLUMNS]
+        range_pos, mill_pos, diff_pos, eta_pos = positions
+
+        for raw in reader:
+            if not raw:
+                continue
+            try:
+                values = {
+                    "range": float(raw[range_pos]),
+                    "mill": float(raw[mill_pos]),
+                    "diff100m": float(raw[diff_pos]),
+                    "eta": float(raw[eta_pos]),
+                }
+            except (ValueError, IndexError):
+                fields = [raw[pos].strip() if pos < len(raw) else "" for pos in positions]
+                if any(fields):
+                    skipped.append((reader.line_num, _skip_reason(fields)))
+                continue
+            rows.append((reader.line_num, values))
+    _report_skipped(skipped, report)
+    return rows
+
+
+def _longest_ordered_run(ranges: List[float]) -> List[int]:
+    """거리가 감소하지 않는 가장 긴 부분 수열의 인덱스."""
+
+    tails: List[float] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(ranges)
+    for i, value in enumerate(ranges):
+        pos = bisect_right(tails, value)
+        if pos == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[pos] = value
+            tail_index[pos] = i
+        previous[i] = tail_index[pos - 1] if pos > 0 else -1
+
+    indices = []
+    current = tail_index[-1] if tail_index else -1
+    while current != -1:
+        indices.append(current)
+        current = previous[current]
+    return indices[::-1]
+
+
+def _drop_out_of_order(rows, report: ValidationReport):
+    """대부분 정렬된 표에서 홀로 순서를 벗어난 행(오타 등)을 걸러낸다.
+
+    감소하지 않는 최장 부분 수열이 절반 이상이면 나머지 행을 오류로 보고 제외하고,
+    그보다 적으면 표 전체가 다른 순서로 작성된 것으로 보고 정렬에 맡긴다.
+    """
+
+    ranges = [values["range"] for _, values in rows]
+    if all(a <= b for a, b in zip(ranges, ranges[1:])):
+        return rows
+    keep = _longest_ordered_run(ranges)
+    if len(keep) == len(rows) or len(keep) * 2 < len(rows):
+        return rows
+
+    kept = set(keep)
+    for i, (line_no, values) in enumerate(rows):
+        if i in kept:
+            continue
+        report.add(
+            ERROR,
+            "out_of_order",
+            line_no,
+            f"거리 {values['range']:g}이(가) 앞뒤 행과 순서가 맞지 않아 제외했습니다",
+        )
+    return [rows[i] for i in keep]
+
+
+def _resolve_duplicates(rows, report: ValidationReport, duplicates: str):
+    resolved = []
+    group: List[Tuple[int, Dict[str, float]]] = []
+
+    def _flush():
+        if not group:
+            return
+        first_line, first = group[0]
+        conflicting = any(values != first for _, values in group[1:])
+        lines = ", ".join(str(line_no) for line_no, _ in group)
+        if not conflicting:
+            if len(group) > 1:
+                report.add(WARNING, "duplicate", first_line, f"같은 행이 반복됩니다({lines}행)")
+            resolved.append((first_line, first))
+            return
+        if duplicates == "reject":
+            raise TableValidationError(
+                f"{report.path.name}: 거리 {first['range']:g}에 서로 다른 값이 있습니다({lines}행)"
+            )
+        message = f"거리 {first['range']:g} 중복({lines}행)"
+        if duplicates == "mean":
+            merged = {
+                column: sum(values[column] for _, values in group) / len(group)
+                for column in COLUMNS
+            }
+            report.add(ERROR, "duplicate_range", first_line, f"{message}, 평균값 사용")
+            resolved.append((first_line, merged))
+        else:
+            report.add(ERROR, "duplicate_range", first_line, f"{message}, 첫 행 사용")
+            resolved.append((first_line, first))
+
+    for line_no, values in rows:
+        if group and values["range"] != group[0][1]["range"]:
+            _flush()
+            group = []
+        group.append((line_no, values))
+    _flush()
+    return resolved
+
+
+def _check_monotone(rows, report: ValidationReport, trajectory: Optional[str], column: str):
+    """저각은 거리에 따라 증가, 고각은 감소해야 하는 열(밀, ETA)의 방향을 확인한다."""
+
+    if len(rows) < 2:
+        return
+    values = [row[column] for _, row in rows]
+    if trajectory == "low":
+        increasing = True
+    elif trajectory == "high":
+        increasing = False
+    else:
+        increasing = values[-1] >= values[0]
+    for (line_no, row), prev in zip(rows[1:], values):
+        if (row[column] < prev) if increasing else (row[column] > prev):
+            direction = "증가" if increasing else "감소"
+            report.add(
+                WARNING,
+                f"{column}_not_monotone",
+                line_no,
+                f"거리 {row['range']:g}의 {column} {row[column]:g}이(가) {direction} 방향을 벗어납니다",
+            )
+
+
+def normalize_table(
+    path: Path, trajectory: Optional[str] = None, duplicates: str = "first"
+) -> ValidationReport:
+    """CSV를 읽어 거리 엄격 증가 불변식을 만족하는 행 목록과 검사 결과를 반환한다."""
+
+    if duplicates not in DUPLICATE_POLICIES:
+        raise ValueError(f"지원하지 않는 중복 처리 방식입니다: {duplicates}")
+
+    report = ValidationReport(path=Path(path))
+    rows = _read_raw(report.path, report)
+    if not rows:
+        report.add(ERROR, "empty", None, "유효한 행이 없습니다")
+        return report
+
+    rows = _drop_out_of_order(rows, report)
+    if any(a[1]["range"] > b[1]["range"] for a, b in zip(rows, rows[1:])):
+        report.add(WARNING, "unsorted", None, "거리 오름차순이 아니어서 정렬했습니다")
+        rows = sorted(rows, key=lambda item: item[1]["range"])
+
+    rows = _resolve_duplicates(rows, report, duplicates)
+    _check_monotone(rows, report, trajectory, "mill")
+    _check_monotone(rows, report, trajectory, "eta")
+    report.rows = [values for _, values in rows]
+    return report
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def write_normalized(report: ValidationReport, path: Optional[Path] = None):
+    """정규화된 행을 원본과 같은 헤더 형식으로 저장한다."""
+
+    target = Path(path or report.path)
+    with target.open("w", encoding="utf-8", newline="") as f:
+        f.write(", ".join(COLUMNS) + "\n")
+        for row in report.rows:
+            f.write(", ".join(_format_number(row[column]) for column in COLUMNS) + "\n")
+
+
+def _trajectory_from_name(path: Path) -> Optional[str]:
+    parts = path.stem.split("_")
+    return parts[-2] if len(parts) >= 3 and parts[-2] in {"low", "high"} else None
+
+
+def validate_tree(root: Path = RANGE_TABLE_ROOT, duplicates: str = "first") -> List[ValidationReport]:
+    """``root`` 아래의 모든 ``*_rangeTable_*.csv``를 검사한다. 2차원 표(``_2d``)는 형식이 달라 제외한다."""
+
+    reports = []
+    for path in sorted(Path(root).glob("*/*_rangeTable_*.csv")):
+        if path.stem.endswith(GRID_SUFFIX):
+            continue
+        reports.append(normalize_table(path, _trajectory_from_name(path), duplicates))
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="사거리표 정규화 및 검증")
+    parser.add_argument("root", nargs="?", default=str(RANGE_TABLE_ROOT), help="rangeTables 경로")
+    parser.add_argument("--duplicates", choices=DUPLICATE_POLICIES, default="first")
+    parser.add_argument("--write", action="store_true", help="정규화된 결과로 CSV를 다시 저장")
+    parser.add_argument("--quiet", action="store_true", help="문제가 있는 표만 출력")
+    args = parser.parse_args(argv)
+
+    try:
+        reports = validate_tree(Path(args.root), args.duplicates)
+    except TableValidationError as e:
+        print(e)
+        return 1
+
+    error_count = 0
+    for report in reports:
+        error_count += len(report.errors)
+        if args.quiet and not report.issues:
+            continue
+        print(f"{report.path} ({len(report.rows)}행)")
+        for issue in report.issues:
+            print(f"  {issue}")
+        if args.write and report.issues:
+            write_normalized(report)
+    print(f"검사한 표 {len(reports)}개, 오류 {error_count}건")
+    return 1 if error_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,24 @@ import threading
 import webbrowser
 from datetime import datetime
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 
 import afcs.ui_theme as ui_theme
+from afcs.adjustment import AdjustmentSession
+from afcs.battery import GunRecord, solve_battery
+from afcs.bulk import iter_bulk_solutions, parse_targets
+from afcs.coverage import sample_curves
+from afcs.comparison import ComparisonEntry, TrajectoryResult, compare_equipment
 from afcs.equipment import EquipmentRegistry
-from afcs.range_tables import available_charges, find_solutions
+from afcs.geometry import GridPoint, solve_geometry
+from afcs.history import ExportCancelled, export_history
+from afcs.metrics import METRICS_PORT_ENV_VAR, serve_metrics
+from afcs.mission import FireMissionController, MissionResult
+from afcs.profiling import profiler
+from afcs.records import LogEntry
+from afcs.scheduler import FairScheduler
+from afcs.selection import CRITERION_LABELS
+from afcs.sensitivity import ALTITUDE_ERROR, RANGE_ERROR
 from afcs.ui_theme import (
     ACCENT_COLOR,
     APP_BG,
@@ -62,6 +75,55 @@ def _sync_theme_constants():
 set_theme("light")
 _sync_theme_constants()
 registry = EquipmentRegistry()
+mission_controller = FireMissionController(registry)
+# 모든 임무 탭이 나눠 쓰는 계산 스레드. 탭마다 대기열을 두고 돌아가며 처리한다.
+mission_scheduler = FairScheduler()
+
+PROFILE_OVERLAY_ROWS = 10
+CHART_WIDTH = 640
+CHART_HEIGHT = 440
+# 왼쪽, 위, 오른쪽, 아래 여백과 두 그래프 사이 간격
+CHART_MARGIN = (64, 16, 48, 28)
+CHART_GAP = 28
+# 장약별 곡선 색. 테마를 바꾸면 팔레트 태그 단위로 색만 바꾼다.
+CHART_PALETTE = {
+    "light": ("#007aff", "#ff9500", "#34c759", "#af52de", "#ff3b30", "#5ac8fa", "#a2845e", "#ff2d55"),
+    "dark": ("#0a84ff", "#ff9f0a", "#30d158", "#bf5af2", "#ff453a", "#64d2ff", "#ac8e68", "#ff375f"),
+}
+ADJUST_DEFAULT_STEP = 50
+MISSION_TAB_TITLE = "임무 {number}"
+HISTORY_TIME_FORMAT = "%Y-%m-%d %H:%M"
+BAND_NOTE = f"± 거리 {RANGE_ERROR:g} m · 고도 {ALTITUDE_ERROR:g} m 오차 기준"
+BATTERY_DEFAULT_GUNS = 6
+BATTERY_COLUMNS = (
+    ("gun", "포", 60),
+    ("equipment", "장비", 80),
+    ("low_ch", "LOW CH", 60),
+    ("low_mill", "MILL", 80),
+    ("low_eta", "ETA", 60),
+    ("high_ch", "HIGH CH", 64),
+    ("high_mill", "MILL", 80),
+    ("high_eta", "ETA", 60),
+)
+BULK_COLUMNS = (
+    ("target", "목표", 70),
+    ("distance", "거리", 70),
+    ("delta", "고도 차", 64),
+    ("low_ch", "LOW CH", 60),
+    ("low_mill", "MILL", 80),
+    ("low_eta", "ETA", 60),
+    ("high_ch", "HIGH CH", 64),
+    ("high_mill", "MILL", 80),
+    ("high_eta", "ETA", 60),
+)
+COMPARISON_COLUMNS = (
+    ("rank", "순위", 48),
+    ("equipment", "장비", 90),
+    ("trajectory", "탄도", 60),
+    ("ch", "CH", 48),
+    ("mill", "MILL", 90),
+    ("eta", "ETA", 70),
+)
 
 
 def format_solution_list(title: str, solutions):
@@ -71,24 +133,29 @@ def format_solution_list(title: str, solutions):
     header = f"{'CH':>2} | {'MILL':>10} | {'ETA':>5}"
     lines = [f"{title}:", header]
     for solution in solutions:
-        lines.append(f"{solution['charge']:>2} | {solution['mill']:>10.2f} | {solution['eta']:>5.1f}")
+        lines.append(f"{solution.charge:>2} | {solution.mill:>10.2f} | {solution.eta:>5.1f}")
     return "\n".join(lines)
 
 
-def update_solution_table(rows, status_label, solutions, message: str | None = None):
+def update_solution_table(rows, status_label, solutions, message: str | None = None, bands=None):
     if message:
         status_label.config(text=message)
     elif not solutions:
         status_label.config(text="지원 범위 밖입니다")
+    elif bands:
+        status_label.config(text=BAND_NOTE)
     else:
         status_label.config(text="")
 
     for idx, row in enumerate(rows):
         if idx < len(solutions):
             solution = solutions[idx]
-            row["ch"].config(text=f"{solution['charge']}", fg=TEXT_COLOR)
-            row["mill"].config(text=f"{solution['mill']:.2f}", fg=TEXT_COLOR)
-            row["eta"].config(text=f"{solution['eta']:.1f}", fg=TEXT_COLOR)
+            band = bands[idx] if bands and idx < len(bands) else None
+            mill_text = f"{solution.mill:.2f}" + (f" ±{band.mill:.1f}" if band else "")
+            eta_text = f"{solution.eta:.1f}" + (f" ±{band.eta:.1f}" if band else "")
+            row["ch"].config(text=f"{solution.charge}", fg=TEXT_COLOR)
+            row["mill"].config(text=mill_text, fg=TEXT_COLOR)
+            row["eta"].config(text=eta_text, fg=TEXT_COLOR)
         else:
             row["ch"].config(text="—", fg=MUTED_COLOR)
             row["mill"].config(text="—", fg=MUTED_COLOR)
@@ -124,14 +191,714 @@ def check_latest_release(root: tk.Tk, version_var: tk.StringVar, title_label: tt
             root.after(0, lambda: _prompt_update(release))
 
     threading.Thread(target=_worker, daemon=True).start()
+
+
+def open_profiler_overlay(root: tk.Tk):
+    """최근 계산의 단계별 소요 시간을 보여주는 디버그 창을 연다."""
+
+    existing = getattr(root, "profiler_overlay", None)
+    if existing is not None and existing.winfo_exists():
+        existing.lift()
+        return existing
+
+    overlay = tk.Toplevel(root)
+    overlay.title("계산 단계 계측")
+    overlay.configure(bg=CARD_BG)
+    overlay.attributes("-topmost", True)
+    overlay.columnconfigure(0, weight=1)
+    overlay.rowconfigure(1, weight=1)
+
+    status = tk.Label(overlay, bg=CARD_BG, fg=MUTED_COLOR, font=BODY_FONT, anchor="w")
+    status.grid(row=0, column=0, sticky="ew", padx=12, pady=(10, 4))
+
+    text = tk.Text(
+        overlay,
+        width=110,
+        height=PROFILE_OVERLAY_ROWS + 1,
+        bg=CARD_BG,
+        fg=TEXT_COLOR,
+        font=MONO_FONT,
+        relief="flat",
+        wrap="none",
+    )
+    text.grid(row=1, column=0, sticky="nsew", padx=12)
+
+    buttons = ttk.Frame(overlay, style="Card.TFrame")
+    buttons.grid(row=2, column=0, sticky="e", padx=12, pady=10)
+
+    def _refresh():
+        state = "켜짐" if profiler.enabled else "꺼짐"
+        status.config(text=f"계측 {state} (Ctrl+Alt+P 전환) · 단위 ms")
+        text.config(state="normal")
+        text.delete("1.0", "end")
+        for record in reversed(profiler.recent(PROFILE_OVERLAY_ROWS)):
+            text.insert("end", record.summary() + "\n")
+        text.config(state="disabled")
+
+    def _on_record(record):
+        root.after(0, _refresh)
+
+    def _save():
+        path = filedialog.asksaveasfilename(
+            parent=overlay,
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            initialfile=f"afcs_profile_{datetime.now():%Y%m%d_%H%M%S}.json",
+        )
+        if not path:
+            return
+        count = profiler.dump(path)
+        status.config(text=f"{count}건 저장: {path}")
+
+    def _clear():
+        profiler.clear()
+        _refresh()
+
+    def _close():
+        profiler.remove_listener(_on_record)
+        root.profiler_overlay = None
+        overlay.destroy()
+
+    ttk.Button(buttons, text="JSON 저장", style="Secondary.TButton", command=_save).grid(
+        row=0, column=0, padx=(0, 8)
+    )
+    ttk.Button(buttons, text="지우기", style="Secondary.TButton", command=_clear).grid(row=0, column=1)
+
+    profiler.add_listener(_on_record)
+    overlay.protocol("WM_DELETE_WINDOW", _close)
+    overlay.refresh = _refresh
+    root.profiler_overlay = overlay
+    _refresh()
+    return overlay
+
+
+def open_comparison_view(root: tk.Tk, my_altitude_entry, target_altitude_entry, distance_entry):
+    """현재 입력값으로 모든 장비를 동시에 계산하고, 끝나는 대로 결과를 채우는 창을 연다."""
+
+    try:
+        my_alt = float(my_altitude_entry.get())
+        target_alt = float(target_altitude_entry.get())
+        distance = float(distance_entry.get())
+    except ValueError:
+        messagebox.showerror("입력 오류", "숫자만 입력하세요.")
+        return None
+
+    altitude_delta = my_alt - target_alt
+    window = tk.Toplevel(root)
+    window.title("전체 장비 비교")
+    window.configure(bg=CARD_BG)
+    window.columnconfigure(0, weight=1)
+    window.rowconfigure(1, weight=1)
+
+    status = tk.Label(window, bg=CARD_BG, fg=MUTED_COLOR, font=BODY_FONT, anchor="w")
+    status.grid(row=0, column=0, sticky="ew", padx=12, pady=(10, 4))
+
+    tree = ttk.Treeview(
+        window,
+        columns=[key for key, _, _ in COMPARISON_COLUMNS],
+        show="headings",
+        height=max(len(registry.names), 1),
+        style="Card.Treeview",
+    )
+    for key, text, width in COMPARISON_COLUMNS:
+        tree.heading(key, text=text)
+        tree.column(key, width=width, anchor="e" if key in ("ch", "mill", "eta") else "w")
+    tree.grid(row=1, column=0, sticky="nsew", padx=12, pady=(0, 12))
+
+    entries = {name: ComparisonEntry(name) for name in registry.names}
+    total = len(entries) * 2
+    done = {"count": 0}
+
+    def _values(entry: ComparisonEntry, position: str = ""):
+        best = entry.best
+        if best is None:
+            pending = len(entry.results) < 2
+            return (position, entry.equipment, "…" if pending else "범위 밖", "—", "—", "—")
+        return (
+            position,
+            entry.equipment,
+            best.trajectory.upper(),
+            best.charge,
+            f"{best.mill:.2f}",
+            f"{best.eta:.1f}",
+        )
+
+    for name, entry in entries.items():
+        tree.insert("", "end", iid=name, values=_values(entry))
+
+    def _on_result(result: TrajectoryResult):
+        if not window.winfo_exists():
+            return
+        entry = entries.setdefault(result.equipment, ComparisonEntry(result.equipment))
+        entry.results[result.trajectory] = result
+        done["count"] += 1
+        if not tree.exists(result.equipment):
+            tree.insert("", "end", iid=result.equipment)
+        tree.item(result.equipment, values=_values(entry))
+        status.config(text=f"{distance:g} m, 고도 차이 {altitude_delta:+.1f} m · {done['count']}/{total} 완료")
+
+    def _on_finished(ranked):
+        if not window.winfo_exists():
+            return
+        for position, entry in enumerate(ranked):
+            label = str(position + 1) if entry.can_engage else "-"
+            tree.item(entry.equipment, values=_values(entry, label))
+            tree.move(entry.equipment, "", position)
+        engaged = sum(1 for entry in ranked if entry.can_engage)
+        status.config(
+            text=f"{distance:g} m, 고도 차이 {altitude_delta:+.1f} m · 사격 가능 {engaged}/{len(ranked)}개 장비"
+        )
+
+    def _worker():
+        ranked = compare_equipment(
+            distance,
+            altitude_delta,
+            registry.equipments,
+            on_result=lambda result: root.after(0, lambda: _on_result(result)),
+        )
+        root.after(0, lambda: _on_finished(ranked))
+
+    status.config(text=f"{distance:g} m, 고도 차이 {altitude_delta:+.1f} m · 계산 중…")
+    threading.Thread(target=_worker, daemon=True).start()
+    return window
+
+
+def _battery_cells(solution):
+    if solution is None:
+        return ("—", "—", "—")
+    return (solution.charge, f"{solution.mill:.2f}", f"{solution.eta:.1f}")
+
+
+def _sort_key(value):
+    try:
+        return (0, float(value), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value))
+
+
+def make_sortable(tree: ttk.Treeview, columns):
+    """열 제목을 누르면 그 열로 정렬한다. 같은 열을 다시 누르면 순서를 뒤집는다."""
+
+    state = {"column": None, "reverse": False}
+
+    def _sort(column):
+        reverse = state["column"] == column and not state["reverse"]
+        state.update(column=column, reverse=reverse)
+        items = [(_sort_key(tree.set(iid, column)), iid) for iid in tree.get_children("")]
+        items.sort(reverse=reverse)
+        for position, (_, iid) in enumerate(items):
+            tree.move(iid, "", position)
+
+    for key, text, _ in columns:
+        tree.heading(key, text=text, command=lambda key=key: _sort(key))
+
+
+def open_bulk_import(root: tk.Tk, system_var: tk.StringVar, my_altitude_entry, append_log):
+    """CSV나 붙여 넣은 목표 목록을 작업 스레드에서 풀어 결과를 표에 채우는 창을 연다.
+
+    끝나면 모든 목표의 기록을 ``append_log``에 한 번에 넘긴다.
+    """
+
+    window = tk.Toplevel(root)
+    window.title("목표 일괄 계산")
+    window.configure(bg=CARD_BG)
+    window.columnconfigure(0, weight=1)
+    window.rowconfigure(3, weight=1)
+
+    ttk.Label(
+        window,
+        text="한 줄에 하나씩 '거리 [목표 고도]' 또는 name,distance,target_alt CSV",
+        style="Muted.TLabel",
+    ).grid(row=0, column=0, sticky="w", padx=12, pady=(12, 4))
+    source = tk.Text(
+        window, height=8, width=48, font=MONO_FONT, bg=INPUT_BG, fg=TEXT_COLOR, relief="flat"
+    )
+    source.grid(row=1, column=0, sticky="ew", padx=12)
+
+    controls = ttk.Frame(window, style="Card.TFrame", padding=(12, 8))
+    controls.grid(row=2, column=0, sticky="ew")
+    controls.columnconfigure(3, weight=1)
+
+    tree = ttk.Treeview(
+        window,
+        columns=[key for key, _, _ in BULK_COLUMNS],
+        show="headings",
+        height=12,
+        style="Card.Treeview",
+    )
+    for key, _, width in BULK_COLUMNS:
+        tree.column(key, width=width, anchor="w" if key == "target" else "e")
+    make_sortable(tree, BULK_COLUMNS)
+    tree.grid(row=3, column=0, sticky="nsew", padx=12)
+
+    progress = ttk.Progressbar(window, mode="determinate", maximum=1)
+    progress.grid(row=4, column=0, sticky="ew", padx=12, pady=(8, 4))
+    status = tk.Label(window, bg=CARD_BG, fg=MUTED_COLOR, font=BODY_FONT, anchor="w")
+    status.grid(row=5, column=0, sticky="ew", padx=12, pady=(0, 12))
+
+    state = {"cancel": False, "running": False}
+
+    def _open_file():
+        path = filedialog.askopenfilename(
+            parent=window, filetypes=[("CSV", "*.csv"), ("텍스트", "*.txt"), ("모든 파일", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError as exc:
+            messagebox.showerror("열기 실패", str(exc), parent=window)
+            return
+        source.delete("1.0", "end")
+        source.insert("1.0", text)
+
+    def _on_chunk(results, done, total):
+        if not window.winfo_exists():
+            return
+        for result in results:
+            low = result.low[0] if result.low else None
+            high = result.high[0] if result.high else None
+            tree.insert(
+                "",
+                "end",
+                values=(
+                    result.target.name,
+                    f"{result.target.distance:g}",
+                    f"{result.altitude_delta:+.1f}",
+                    *_battery_cells(low),
+                    *_battery_cells(high),
+                ),
+            )
+        progress.configure(maximum=max(total, 1), value=done)
+        status.config(text=f"{done}/{total} 목표 계산")
+
+    def _on_finished(entries, total, cancelled, error=None):
+        state["running"] = False
+        if entries:
+            append_log(entries)
+        if not window.winfo_exists():
+            return
+        calculate_button.state(["!disabled"])
+        engaged = sum(1 for entry in entries if entry.low or entry.high)
+        if error is not None:
+            prefix = f"계산 실패({error}) · "
+        else:
+            prefix = "취소됨 · " if cancelled else ""
+        status.config(text=f"{prefix}{len(entries)}/{total} 목표 중 {engaged}개 사격 가능")
+
+    def _worker(targets, equipment, my_alt):
+        entries = []
+        done = 0
+        error = None
+        try:
+            for results in iter_bulk_solutions(
+                targets, equipment, my_alt, should_cancel=lambda: state["cancel"]
+            ):
+                done += len(results)
+                now = datetime.now()
+                entries.extend(
+                    LogEntry(
+                        now,
+                        my_alt,
+                        my_alt - result.altitude_delta,
+                        result.target.distance,
+                        equipment.name,
+                        result.low,
+                        result.high,
+                    )
+                    for result in results
+                )
+                root.after(0, lambda results=results, done=done: _on_chunk(results, done, len(targets)))
+        except Exception as exc:  # 스레드가 조용히 죽으면 버튼이 잠긴 채 남으므로 모두 결과로 알린다.
+            error = f"{type(exc).__name__}: {exc}"
+        # 실패해도 그때까지 계산한 목표는 기록에 남긴다.
+        root.after(0, lambda: _on_finished(entries, len(targets), state["cancel"], error))
+
+    def _calculate():
+        equipment = registry.get(system_var.get())
+        if equipment is None:
+            messagebox.showerror("장비 오류", "선택한 장비 정보를 찾을 수 없습니다.", parent=window)
+            return
+        try:
+            my_alt = float(my_altitude_entry.get() or 0.0)
+            targets = parse_targets(source.get("1.0", "end"))
+        except ValueError as exc:
+            messagebox.showerror("입력 오류", str(exc) or "숫자만 입력하세요.", parent=window)
+            return
+        if not targets:
+            status.config(text="목표를 한 줄 이상 입력하세요")
+            return
+        tree.delete(*tree.get_children())
+        progress.configure(maximum=len(targets), value=0)
+        state.update(cancel=False, running=True)
+        calculate_button.state(["disabled"])
+        status.config(text=f"{equipment.name} · 사수 고도 {my_alt:g} m · 목표 {len(targets)}개 계산 중")
+        threading.Thread(target=_worker, args=(targets, equipment, my_alt), daemon=True).start()
+
+    def _cancel():
+        state["cancel"] = True
+
+    def _close():
+        state["cancel"] = True
+        window.destroy()
+
+    ttk.Button(controls, text="파일 열기", style="Secondary.TButton", command=_open_file).grid(
+        row=0, column=0, sticky="w"
+    )
+    calculate_button = ttk.Button(controls, text="계산", style="Primary.TButton", command=_calculate)
+    calculate_button.grid(row=0, column=1, sticky="w", padx=(8, 0))
+    ttk.Button(controls, text="취소", style="Secondary.TButton", command=_cancel).grid(
+        row=0, column=2, sticky="w", padx=(8, 0)
+    )
+    window.protocol("WM_DELETE_WINDOW", _close)
+    return window
+
+
+def open_battery_panel(root: tk.Tk, system_var: tk.StringVar):
+    """포마다 고도·거리·장비를 입력받아 포대 전체의 LOW/HIGH 해를 한 번에 계산하는 창을 연다."""
+
+    window = tk.Toplevel(root)
+    window.title("포대 계산")
+    window.configure(bg=CARD_BG)
+    window.columnconfigure(0, weight=1)
+    window.rowconfigure(3, weight=1)
+
+    target_row = ttk.Frame(window, style="Card.TFrame", padding=(12, 10, 12, 4))
+    target_row.grid(row=0, column=0, sticky="ew")
+    ttk.Label(target_row, text="Target ALT (m)", style="CardBody.TLabel").grid(
+        row=0, column=0, sticky="w", padx=(0, 10)
+    )
+    target_entry = ttk.Entry(target_row, width=10)
+    target_entry.grid(row=0, column=1, sticky="w")
+
+    guns_frame = ttk.Frame(window, style="Card.TFrame", padding=(12, 4))
+    guns_frame.grid(row=1, column=0, sticky="ew")
+    for col, text in enumerate(("포", "장비", "ALT (m)", "Distance (m)")):
+        ttk.Label(guns_frame, text=text, style="TableHeader.TLabel").grid(
+            row=0, column=col, sticky="w", padx=(0, 8)
+        )
+
+    gun_rows = []
+
+    def _add_gun_row():
+        index = len(gun_rows) + 1
+        name = ttk.Entry(guns_frame, width=6)
+        name.insert(0, str(index))
+        equipment = ttk.Combobox(
+            guns_frame, values=registry.names, state="readonly", width=8, font=BODY_FONT
+        )
+        equipment.set(system_var.get())
+        altitude = ttk.Entry(guns_frame, width=10)
+        distance = ttk.Entry(guns_frame, width=12)
+        for col, widget in enumerate((name, equipment, altitude, distance)):
+            widget.grid(row=index, column=col, sticky="w", padx=(0, 8), pady=2)
+        gun_rows.append((name, equipment, altitude, distance))
+
+    for _ in range(BATTERY_DEFAULT_GUNS):
+        _add_gun_row()
+
+    tree = ttk.Treeview(
+        window,
+        columns=[key for key, _, _ in BATTERY_COLUMNS],
+        show="tree headings",
+        height=BATTERY_DEFAULT_GUNS + 2,
+        style="Card.Treeview",
+    )
+    tree.column("#0", width=24, stretch=False)
+    for key, text, width in BATTERY_COLUMNS:
+        tree.heading(key, text=text)
+        tree.column(key, width=width, anchor="w" if key in ("gun", "equipment") else "e")
+
+    status = tk.Label(window, bg=CARD_BG, fg=MUTED_COLOR, font=BODY_FONT, anchor="w")
+
+    def _read_guns():
+        guns = []
+        for name, equipment, altitude, distance in gun_rows:
+            values = (altitude.get().strip(), distance.get().strip())
+            if not any(values):
+                continue
+            guns.append(
+                GunRecord(
+                    name=name.get().strip() or str(len(guns) + 1),
+                    equipment=equipment.get(),
+                    altitude=float(values[0]),
+                    distance=float(values[1]),
+                )
+            )
+        return guns
+
+    def _calculate():
+        try:
+            target_alt = float(target_entry.get())
+            guns = _read_guns()
+        except ValueError:
+            messagebox.showerror("입력 오류", "숫자만 입력하세요.", parent=window)
+            return
+        if not guns:
+            status.config(text="포 정보를 한 줄 이상 입력하세요")
+            return
+
+        results = solve_battery(guns, target_alt, registry=registry)
+        tree.delete(*tree.get_children())
+        for result in results:
+            if result.error:
+                tree.insert("", "end", values=(result.gun.name, result.gun.equipment, result.error))
+                continue
+            low, high = result.low, result.high
+            parent = tree.insert(
+                "",
+                "end",
+                values=(
+                    result.gun.name,
+                    result.gun.equipment,
+                    *_battery_cells(low[0] if low else None),
+                    *_battery_cells(high[0] if high else None),
+                ),
+            )
+            # 두 번째 이후 장약은 펼쳐서 볼 수 있는 하위 행으로 둔다.
+            for i in range(1, max(len(low), len(high))):
+                tree.insert(
+                    parent,
+                    "end",
+                    values=(
+                        "",
+                        "",
+                        *_battery_cells(low[i] if i < len(low) else None),
+                        *_battery_cells(high[i] if i < len(high) else None),
+                    ),
+                )
+        engaged = sum(1 for result in results if result.low or result.high)
+        status.config(text=f"포 {len(results)}문 중 {engaged}문 사격 가능")
+
+    buttons = ttk.Frame(window, style="Card.TFrame", padding=(12, 4))
+    buttons.grid(row=2, column=0, sticky="ew")
+    ttk.Button(buttons, text="행 추가", style="Secondary.TButton", command=_add_gun_row).grid(
+        row=0, column=0, sticky="w"
+    )
+    ttk.Button(buttons, text="계산", style="Primary.TButton", command=_calculate).grid(
+        row=0, column=1, sticky="w", padx=(8, 0)
+    )
+
+    tree.grid(row=3, column=0, sticky="nsew", padx=12, pady=(8, 4))
+    status.grid(row=4, column=0, sticky="ew", padx=12, pady=(0, 10))
+    return window
+
+
+def _chart_panels():
+    left, top, right, bottom = CHART_MARGIN
+    panel_height = (CHART_HEIGHT - top - bottom - CHART_GAP) / 2
+    mill_panel = (left, top, CHART_WIDTH - right, top + panel_height)
+    eta_panel = (left, top + panel_height + CHART_GAP, CHART_WIDTH - right, CHART_HEIGHT - bottom)
+    return mill_panel, eta_panel
+
+
+def _scale(value, low, high, start, end):
+    if high == low:
+        return (start + end) / 2.0
+    return start + (value - low) / (high - low) * (end - start)
+
+
+def _draw_coverage_group(canvas: tk.Canvas, coverage, tag: str, theme_name: str):
+    """장비·탄도 하나의 곡선을 그리고 이후 표적 표시에 쓸 축 정보를 반환한다."""
+
+    palette = CHART_PALETTE[theme_name]
+    x_low = min((curve.min_range for curve in coverage.curves), default=0.0)
+    x_high = max((curve.max_range for curve in coverage.curves), default=1.0)
+    panels = _chart_panels()
+    for panel, key, title in zip(panels, ("mills", "etas"), ("MILL", "ETA (s)")):
+        x0, y0, x1, y1 = panel
+        y_low, y_high = coverage.bounds(key)
+        canvas.create_rectangle(x0, y0, x1, y1, outline=BORDER_COLOR, tags=(tag, "chart_axis"))
+        canvas.create_text(
+            x0 - 6, y0, text=f"{y_high:g}", anchor="ne", fill=MUTED_COLOR, font=BODY_FONT,
+            tags=(tag, "chart_text"),
+        )
+        canvas.create_text(
+            x0 - 6, y1, text=f"{y_low:g}", anchor="se", fill=MUTED_COLOR, font=BODY_FONT,
+            tags=(tag, "chart_text"),
+        )
+        canvas.create_text(
+            x0 + 6, y0 + 4, text=title, anchor="nw", fill=MUTED_COLOR, font=BODY_FONT,
+            tags=(tag, "chart_text"),
+        )
+        for i, curve in enumerate(coverage.curves):
+            color_tag = f"chart_palette{i % len(palette)}"
+            values = getattr(curve, key)
+            points = []
+            for distance, value in zip(curve.distances, values):
+                points.append(_scale(distance, x_low, x_high, x0, x1))
+                points.append(_scale(value, y_low, y_high, y1, y0))
+            if len(points) >= 4:
+                canvas.create_line(
+                    *points, fill=palette[i % len(palette)], width=2, tags=(tag, "chart_curve", color_tag)
+                )
+            canvas.create_text(
+                points[-2] + 4,
+                points[-1],
+                text=f"CH{curve.charge}",
+                anchor="w",
+                fill=palette[i % len(palette)],
+                font=BODY_FONT,
+                tags=(tag, "chart_curve", color_tag),
+            )
+    _, _, _, eta_bottom = panels[1]
+    for distance, anchor in ((x_low, "nw"), (x_high, "ne")):
+        canvas.create_text(
+            _scale(distance, x_low, x_high, panels[1][0], panels[1][2]),
+            eta_bottom + 4,
+            text=f"{distance:g} m",
+            anchor=anchor,
+            fill=MUTED_COLOR,
+            font=BODY_FONT,
+            tags=(tag, "chart_text"),
+        )
+    return {"coverage": coverage, "tag": tag, "x_range": (x_low, x_high)}
+
+
+def show_coverage(chart, equipment, trajectory: str, theme_name: str):
+    """선택한 장비·탄도의 곡선을 보인다. 이미 그린 조합은 숨겨 둔 항목을 다시 보이기만 한다."""
+
+    canvas = chart["canvas"]
+    coverage = sample_curves(equipment, trajectory)
+    key = (equipment.name, trajectory)
+    group = chart["groups"].get(key)
+    if group is not None and group["coverage"] is not coverage:
+        # 사거리표가 다시 읽혔으면 해당 조합만 새로 그린다.
+        canvas.delete(group["tag"])
+        group = None
+    if group is None:
+        # 다시 그린 조합이 다른 조합의 태그를 물려받지 않도록 단조 증가 번호를 쓴다.
+        chart["next_tag"] += 1
+        tag = f"chart_group{chart['next_tag']}_{trajectory}"
+        group = chart["groups"][key] = _draw_coverage_group(canvas, coverage, tag, theme_name)
+
+    for other in chart["groups"].values():
+        canvas.itemconfigure(other["tag"], state="normal" if other is group else "hidden")
+    chart["active"] = group
+    update_coverage_marker(chart, chart.get("distance"))
+
+
+def update_coverage_marker(chart, distance):
+    """표적 거리 표시만 다시 그린다. 곡선은 건드리지 않는다."""
+
+    canvas = chart["canvas"]
+    canvas.delete("chart_marker")
+    chart["distance"] = distance
+    group = chart.get("active")
+    if group is None or distance is None:
+        return
+    x_low, x_high = group["x_range"]
+    if not x_low <= distance <= x_high:
+        return
+    mill_panel, eta_panel = _chart_panels()
+    x = _scale(distance, x_low, x_high, mill_panel[0], mill_panel[2])
+    for _, y0, _, y1 in (mill_panel, eta_panel):
+        canvas.create_line(x, y0, x, y1, fill=ACCENT_COLOR, dash=(4, 3), width=2, tags=("chart_marker",))
+    charges = ", ".join(str(charge) for charge in group["coverage"].covering(distance)) or "없음"
+    canvas.create_text(
+        x + 4,
+        mill_panel[1] + 4,
+        text=f"{distance:g} m · CH {charges}",
+        anchor="nw",
+        fill=ACCENT_COLOR,
+        font=BODY_FONT,
+        tags=("chart_marker",),
+    )
+
+
+def recolor_coverage_chart(chart, theme_name: str):
+    """테마 전환 시 항목을 다시 그리지 않고 색만 바꾼다."""
+
+    canvas = chart["canvas"]
+    canvas.configure(bg=CARD_BG, highlightbackground=BORDER_COLOR)
+    canvas.itemconfigure("chart_axis", outline=BORDER_COLOR)
+    canvas.itemconfigure("chart_text", fill=MUTED_COLOR)
+    canvas.itemconfigure("chart_marker", fill=ACCENT_COLOR)
+    for i, color in enumerate(CHART_PALETTE[theme_name]):
+        canvas.itemconfigure(f"chart_palette{i}", fill=color)
+
+
+def open_coverage_chart(root: tk.Tk, system_var: tk.StringVar, theme_var: tk.StringVar):
+    """선택한 장비의 장약별 거리-밀/ETA 곡선 창을 연다."""
+
+    chart = getattr(root, "coverage_chart", None)
+    if chart is not None and chart["window"].winfo_exists():
+        if chart["system_var"] is not system_var:
+            bind_coverage_chart(chart, system_var)
+        chart["window"].lift()
+        return chart
+
+    window = tk.Toplevel(root)
+    window.title("사거리 커버리지")
+    window.configure(bg=CARD_BG)
+
+    controls = ttk.Frame(window, style="Card.TFrame", padding=(12, 10, 12, 4))
+    controls.grid(row=0, column=0, sticky="ew")
+    trajectory_var = tk.StringVar(value="low")
+    for col, (text, value) in enumerate((("LOW", "low"), ("HIGH", "high"))):
+        ttk.Radiobutton(
+            controls, text=text, value=value, variable=trajectory_var, command=lambda: _show()
+        ).grid(row=0, column=col, padx=(0, 12))
+
+    canvas = tk.Canvas(
+        window,
+        width=CHART_WIDTH,
+        height=CHART_HEIGHT,
+        bg=CARD_BG,
+        highlightthickness=1,
+        highlightbackground=BORDER_COLOR,
+    )
+    canvas.grid(row=1, column=0, padx=12, pady=(0, 12))
+
+    chart = {
+        "window": window,
+        "canvas": canvas,
+        "groups": {},
+        "next_tag": 0,
+        "active": None,
+        "distance": None,
+        "system_var": None,
+        "trace": None,
+    }
+
+    def _show(*_):
+        equipment = registry.get(chart["system_var"].get())
+        if equipment is not None:
+            show_coverage(chart, equipment, trajectory_var.get(), theme_var.get())
+
+    chart["show"] = _show
+
+    def _close():
+        chart["system_var"].trace_remove("write", chart["trace"])
+        root.coverage_chart = None
+        window.destroy()
+
+    window.protocol("WM_DELETE_WINDOW", _close)
+    root.coverage_chart = chart
+    bind_coverage_chart(chart, system_var)
+    return chart
+
+
+def bind_coverage_chart(chart, system_var: tk.StringVar, distance=None):
+    """차트가 따라갈 장비 변수(임무 탭)를 바꾸고 그 탭의 목표 거리 표시로 다시 그린다."""
+
+    if chart["system_var"] is not None:
+        chart["system_var"].trace_remove("write", chart["trace"])
+    chart["system_var"] = system_var
+    chart["trace"] = system_var.trace_add("write", chart["show"])
+    chart["show"]()
+    update_coverage_marker(chart, distance)
+
+
 def render_log(log_body: ttk.Frame, entries, equipment_filter: str):
     for child in log_body.winfo_children():
         child.destroy()
 
-    filtered_entries = sorted(entries, key=lambda e: e["timestamp"], reverse=True)
+    filtered_entries = sorted(entries, key=lambda e: e.timestamp, reverse=True)
     if equipment_filter and equipment_filter != "전체":
         filtered_entries = [
-            e for e in filtered_entries if e["system"] == equipment_filter
+            e for e in filtered_entries if e.system == equipment_filter
         ]
 
     if not filtered_entries:
@@ -152,7 +919,7 @@ def render_log(log_body: ttk.Frame, entries, equipment_filter: str):
 
         tk.Label(
             card,
-            text=f"시간 {entry['timestamp'].strftime('%H:%M')} · 장비 {entry['system']}",
+            text=f"시간 {entry.timestamp.strftime('%H:%M')} · 장비 {entry.system}",
             bg=CARD_BG,
             fg=ACCENT_COLOR,
             font=(MONO_FONT[0], 12, "bold"),
@@ -162,9 +929,9 @@ def render_log(log_body: ttk.Frame, entries, equipment_filter: str):
         tk.Label(
             card,
             text=(
-                f"My ALT {entry['my_alt']:>5g}m  |  "
-                f"Target ALT {entry['target_alt']:>5g}m  |  "
-                f"Distance {entry['distance']:>6g}m"
+                f"My ALT {entry.my_alt:>5g}m  |  "
+                f"Target ALT {entry.target_alt:>5g}m  |  "
+                f"Distance {entry.distance:>6g}m"
             ),
             bg=CARD_BG,
             fg=MUTED_COLOR,
@@ -209,11 +976,11 @@ def render_log(log_body: ttk.Frame, entries, equipment_filter: str):
             _column_header(label_text, idx_col, width)
             _column_header(label_text, idx_col + 4, width)
 
-        low_sorted = sorted(entry["low"], key=lambda s: s["charge"])
-        high_sorted = sorted(entry["high"], key=lambda s: s["charge"])
+        low_sorted = sorted(entry.low, key=lambda s: s.charge)
+        high_sorted = sorted(entry.high, key=lambda s: s.charge)
 
-        low_map = {solution["charge"]: solution for solution in low_sorted}
-        high_map = {solution["charge"]: solution for solution in high_sorted}
+        low_map = {solution.charge: solution for solution in low_sorted}
+        high_map = {solution.charge: solution for solution in high_sorted}
         charges = sorted(set(low_map.keys()) | set(high_map.keys())) or [None]
 
         def _row(value, width, row_idx, column):
@@ -235,10 +1002,10 @@ def render_log(log_body: ttk.Frame, entries, equipment_filter: str):
                 if not solution:
                     return "—"
                 if key == "mill":
-                    return f"{solution[key]:.2f}"
+                    return f"{solution.mill:.2f}"
                 if key == "eta":
-                    return f"{solution[key]:.1f}"
-                return str(solution[key])
+                    return f"{solution.eta:.1f}"
+                return str(getattr(solution, key))
 
             for col_offset, key, width in (
                 (0, "charge", CH_WIDTH),
@@ -254,32 +1021,171 @@ def render_log(log_body: ttk.Frame, entries, equipment_filter: str):
             )
 
 
+def _parse_time(text: str):
+    text = text.strip()
+    return datetime.strptime(text, HISTORY_TIME_FORMAT) if text else None
+
+
+def open_history_export(root: tk.Tk, log_entries: list, equipment_filter: tk.StringVar):
+    """현재 장비 필터와 시간 범위에 맞는 기록을 작업 스레드에서 파일로 내보내는 창을 연다."""
+
+    window = tk.Toplevel(root)
+    window.title("기록 내보내기")
+    window.configure(bg=CARD_BG)
+    window.columnconfigure(1, weight=1)
+
+    equipment = equipment_filter.get() or "전체"
+    ttk.Label(window, text=f"장비: {equipment}", style="CardBody.TLabel").grid(
+        row=0, column=0, columnspan=2, sticky="w", padx=12, pady=(12, 6)
+    )
+    range_entries = []
+    for row, text in enumerate(("시작", "끝"), start=1):
+        ttk.Label(window, text=text, style="CardBody.TLabel").grid(
+            row=row, column=0, sticky="w", padx=(12, 8), pady=2
+        )
+        entry = ttk.Entry(window, width=18)
+        entry.grid(row=row, column=1, sticky="ew", padx=(0, 12), pady=2)
+        range_entries.append(entry)
+    ttk.Label(window, text="예: 2024-05-01 09:30 · 비우면 제한 없음", style="Muted.TLabel").grid(
+        row=3, column=0, columnspan=2, sticky="w", padx=12
+    )
+
+    progress = ttk.Progressbar(window, mode="determinate", maximum=1)
+    progress.grid(row=4, column=0, columnspan=2, sticky="ew", padx=12, pady=(10, 4))
+    status = tk.Label(window, bg=CARD_BG, fg=MUTED_COLOR, font=BODY_FONT, anchor="w")
+    status.grid(row=5, column=0, columnspan=2, sticky="ew", padx=12)
+
+    buttons = ttk.Frame(window, style="Card.TFrame", padding=(12, 8, 12, 12))
+    buttons.grid(row=6, column=0, columnspan=2, sticky="ew")
+    state = {"cancel": False, "running": False}
+
+    def _on_progress(done, total):
+        if not window.winfo_exists():
+            return
+        progress.configure(maximum=max(total, 1), value=done)
+        status.config(text=f"{done}/{total}건 기록")
+
+    def _on_finished(message):
+        state["running"] = False
+        if window.winfo_exists():
+            status.config(text=message)
+            save_button.state(["!disabled"])
+
+    def _worker(path, start, end):
+        try:
+            count = export_history(
+                log_entries,
+                path,
+                equipment=equipment,
+                start=start,
+                end=end,
+                on_progress=lambda done, total: root.after(0, lambda: _on_progress(done, total)),
+                should_cancel=lambda: state["cancel"],
+            )
+            message = f"{count}건 저장: {path}"
+        except ExportCancelled:
+            message = "내보내기를 취소했습니다"
+        except (OSError, ValueError) as exc:
+            message = f"저장 실패: {exc}"
+        root.after(0, lambda: _on_finished(message))
+
+    def _save():
+        try:
+            start, end = (_parse_time(entry.get()) for entry in range_entries)
+        except ValueError:
+            messagebox.showerror("입력 오류", f"시간은 {HISTORY_TIME_FORMAT} 형식으로 입력하세요.", parent=window)
+            return
+        path = filedialog.asksaveasfilename(
+            parent=window,
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")],
+            initialfile=f"afcs_log_{datetime.now():%Y%m%d_%H%M%S}.csv",
+        )
+        if not path:
+            return
+        state.update(cancel=False, running=True)
+        save_button.state(["disabled"])
+        progress.configure(value=0)
+        threading.Thread(target=_worker, args=(path, start, end), daemon=True).start()
+
+    def _cancel():
+        if state["running"]:
+            state["cancel"] = True
+        else:
+            window.destroy()
+
+    save_button = ttk.Button(buttons, text="저장", style="Primary.TButton", command=_save)
+    save_button.grid(row=0, column=0, sticky="w")
+    ttk.Button(buttons, text="취소", style="Secondary.TButton", command=_cancel).grid(
+        row=0, column=1, sticky="w", padx=(8, 0)
+    )
+    return window
+
+
 def log_calculation(
     log_body: ttk.Frame,
     log_entries: list,
     equipment_filter: tk.StringVar,
-    my_alt: float,
-    target_alt: float,
-    distance: float,
-    system: str,
-    low_solutions,
-    high_solutions,
+    result: MissionResult,
     sync_layout=None,
 ):
-    log_entries.append(
-        {
-            "timestamp": datetime.now(),
-            "my_alt": my_alt,
-            "target_alt": target_alt,
-            "distance": distance,
-            "system": system,
-            "low": low_solutions,
-            "high": high_solutions,
-        }
-    )
-    render_log(log_body, log_entries, equipment_filter.get())
+    log_entries.append(result.to_log_entry())
+    with profiler.span("render_log"):
+        render_log(log_body, log_entries, equipment_filter.get())
     if sync_layout:
-        sync_layout()
+        with profiler.span("sync_layout"):
+            sync_layout()
+
+
+def _criterion_from_label(label: str) -> str:
+    for name, text in CRITERION_LABELS.items():
+        if text == label:
+            return name
+    return "charge"
+
+
+def render_mission_result(
+    result: MissionResult,
+    low_rows,
+    high_rows,
+    low_status,
+    high_status,
+    delta_label,
+    log_entries,
+    log_equipment_filter,
+    log_body,
+    sync_layout=None,
+    on_solved=None,
+):
+    if not result.ok:
+        messagebox.showerror(result.error_title, result.error)
+        return
+
+    with profiler.span("update_solution_table"):
+        for rows, status, outcome in (
+            (low_rows, low_status, result.low),
+            (high_rows, high_status, result.high),
+        ):
+            update_solution_table(
+                rows, status, outcome.solutions, message=outcome.message, bands=outcome.bands
+            )
+        delta_label.config(text=result.delta_text)
+
+    log_calculation(
+        log_body,
+        log_entries,
+        log_equipment_filter,
+        result,
+        sync_layout=sync_layout,
+    )
+    if on_solved:
+        on_solved(
+            result.equipment,
+            result.distance,
+            result.altitude_delta,
+            result.low.solutions,
+            result.high.solutions,
+        )
 
 
 def calculate_and_display(
@@ -296,84 +1202,74 @@ def calculate_and_display(
     log_equipment_filter,
     log_body,
     sync_layout=None,
+    on_solved=None,
+    criterion_var=None,
+    scheduler=None,
+    tab_key=None,
 ):
-    try:
-        my_alt = float(my_altitude_entry.get())
-        target_alt = float(target_altitude_entry.get())
-        distance = float(distance_entry.get())
-    except ValueError:
-        messagebox.showerror("입력 오류", "숫자만 입력하세요.")
-        return
-    
-    altitude_delta = my_alt - target_alt
-    system = system_var.get()
-    equipment = registry.get(system)
-    if equipment is None:
-        messagebox.showerror("장비 오류", f"'{system}' 장비 정보를 찾을 수 없습니다.")
-        return
-
-    equipment_charges = equipment.charges_override
-    low_override = equipment_charges.get("low") if equipment_charges else None
-    high_override = equipment_charges.get("high") if equipment_charges else None
-
-    low_charges = (
-        low_override if low_override is not None else available_charges(equipment, "low")
-    )
-    high_charges = (
-        high_override if high_override is not None else available_charges(equipment, "high")
+    """입력을 읽어 계산하고 결과를 그린다.
+
+    ``scheduler``를 주면 계산은 공유 작업 스레드의 ``tab_key`` 대기열로 넘기고(같은 탭의
+    밀린 계산은 최신 입력 하나만 남긴다), 결과는 Tk 이벤트 루프에서 그린다.
+    """
+
+    criterion = _criterion_from_label(criterion_var.get()) if criterion_var else "charge"
+    inputs = (
+        system_var.get(),
+        my_altitude_entry.get(),
+        target_altitude_entry.get(),
+        distance_entry.get(),
+        criterion,
     )
 
-    if low_charges:
-        low_solutions = find_solutions(
-            distance,
-            altitude_delta,
-            "low",
-            equipment=equipment,
-            limit=3,
-            charges=low_charges,
-        )
-        low_message = None
-    else:
-        low_solutions = []
-        low_message = (
-            "해당 장비는 저각 사격을 지원하지 않습니다"
-            if low_override == []
-            else "저각 데이터가 없습니다. rangeTables를 확인하세요"
+    def _render(result):
+        render_mission_result(
+            result,
+            low_rows,
+            high_rows,
+            low_status,
+            high_status,
+            delta_label,
+            log_entries,
+            log_equipment_filter,
+            log_body,
+            sync_layout,
+            on_solved,
         )
 
-    if high_charges:
-        high_solutions = find_solutions(
-            distance,
-            altitude_delta,
-            "high",
-            equipment=equipment,
-            limit=3,
-            charges=high_charges,
-        )
-        high_message = None
-    else:
-        high_solutions = []
-        high_message = (
-            "해당 장비는 고각 사격을 지원하지 않습니다"
-            if high_override == []
-            else "고각 데이터가 없습니다. rangeTables를 확인하세요"
-        )
+    if scheduler is None:
+        with profiler.calculation("calculate"):
+            _render(mission_controller.calculate(*inputs))
+        return
 
-    update_solution_table(low_rows, low_status, low_solutions, message=low_message)
-    update_solution_table(high_rows, high_status, high_solutions, message=high_message)
-    delta_label.config(text=f"고도 차이(사수-목표): {altitude_delta:+.1f} m")
+    root = delta_label.winfo_toplevel()
 
-    log_calculation(
-        log_body,
-        log_entries,
-        log_equipment_filter,
-        my_alt,
-        target_alt,
-        distance,
-        system,
-        low_solutions,
-        high_solutions,
-        sync_layout=sync_layout,
+    def _job():
+        # 기록은 화면 스레드로 넘겨 그리기 단계까지 한 건으로 남긴다.
+        with profiler.calculation("calculate", publish=False) as record:
+            return mission_controller.calculate(*inputs), record
+
+    def _show(result, record):
+        # 계산하는 동안 탭이 닫혔으면 그릴 곳이 없다.
+        if not delta_label.winfo_exists():
+            return
+        if not result.ok:
+            delta_label.config(text="고도 차이: 계산 필요")
+        with profiler.resume(record):
+            _render(result)
+
+    def _fail(exc):
+        if delta_label.winfo_exists():
+            delta_label.config(text="고도 차이: 계산 필요")
+            messagebox.showerror("계산 오류", str(exc))
+
+    delta_label.config(text="계산 중…")
+    scheduler.submit(
+        tab_key,
+        _job,
+        on_done=lambda done: root.after(0, lambda: _show(*done)),
+        on_error=lambda exc: root.after(0, lambda: _fail(exc)),
+        replace=True,
     )
 
 
@@ -474,6 +1370,44 @@ def apply_styles(root: tk.Tk):
         background=[("active", HOVER_BG), ("pressed", PRESSED_BG)],
     )
 
+    style.configure(
+        "Card.Treeview",
+        background=CARD_BG,
+        fieldbackground=CARD_BG,
+        foreground=TEXT_COLOR,
+        bordercolor=BORDER_COLOR,
+        font=MONO_FONT,
+        rowheight=24,
+    )
+    style.configure(
+        "Card.Treeview.Heading",
+        background=CARD_BG,
+        foreground=MUTED_COLOR,
+        font=(BODY_FONT[0], 11, "bold"),
+        relief="flat",
+    )
+    style.map(
+        "Card.Treeview",
+        background=[("selected", ACCENT_COLOR)],
+        foreground=[("selected", "#ffffff")],
+    )
+
+    style.configure("Mission.TNotebook", background=APP_BG, borderwidth=0, tabmargins=(0, 0, 0, 0))
+    style.configure(
+        "Mission.TNotebook.Tab",
+        background=APP_BG,
+        foreground=MUTED_COLOR,
+        bordercolor=BORDER_COLOR,
+        lightcolor=APP_BG,
+        font=(BODY_FONT[0], 12, "bold"),
+        padding=(14, 6),
+    )
+    style.map(
+        "Mission.TNotebook.Tab",
+        background=[("selected", CARD_BG), ("active", HOVER_BG)],
+        foreground=[("selected", ACCENT_COLOR)],
+    )
+
     style.configure(
         "Card.TLabelframe",
         background=CARD_BG,
@@ -539,8 +1473,8 @@ def build_solution_table(parent):
     rows = []
     for i in range(3):
         ch = tk.Label(table, text="—", bg=CARD_BG, fg=MUTED_COLOR, font=MONO_FONT, anchor="w", width=4)
-        mill = tk.Label(table, text="—", bg=CARD_BG, fg=MUTED_COLOR, font=MONO_FONT, anchor="w", width=12)
-        eta = tk.Label(table, text="—", bg=CARD_BG, fg=MUTED_COLOR, font=MONO_FONT, anchor="w", width=6)
+        mill = tk.Label(table, text="—", bg=CARD_BG, fg=MUTED_COLOR, font=MONO_FONT, anchor="w", width=15)
+        eta = tk.Label(table, text="—", bg=CARD_BG, fg=MUTED_COLOR, font=MONO_FONT, anchor="w", width=10)
 
         ch.grid(row=i + 1, column=0, sticky="w", pady=3)
         mill.grid(row=i + 1, column=1, sticky="w", pady=3)
@@ -556,35 +1490,33 @@ def build_solution_table(parent):
     return rows, status
 
 
-def build_gui():
-    root = tk.Tk()
-    root.title("AFCS : Artillery Fire Control System")
-    root.configure(bg=APP_BG)
-    root.option_add("*Font", BODY_FONT)
-    apply_styles(root)
+def build_mission_tab(
+    root: tk.Tk,
+    notebook: ttk.Notebook,
+    title: str,
+    *,
+    log_entries: list,
+    log_equipment_filter: tk.StringVar,
+    log_body: ttk.Frame,
+    sync_layout,
+    append_log,
+    system: str = "",
+):
+    """임무 탭 하나(장비 선택, 입력, 결과 표, 수정 사격)를 ``notebook``에 붙인다.
 
-    version_var = tk.StringVar(value=get_version())
+    장비 목록·사거리표 캐시·계산 스레드는 모든 탭이 함께 쓰고, 탭은 입력과 결과만 따로 갖는다.
+    """
 
-    main = ttk.Frame(root, style="Main.TFrame", padding=20)
-    main.grid(row=0, column=0, sticky="nsew")
-
-    header = ttk.Frame(main, style="Main.TFrame")
-    header.grid(row=0, column=0, sticky="ew", pady=(0, 12))
-    header.columnconfigure(0, weight=1)
-    title = ttk.Label(header, text=f"AFCS {version_var.get()}", style="Title.TLabel")
-    title.grid(row=0, column=0, sticky="w")
-    subtitle = ttk.Label(
-        header,
-        text="Made by Prue\nDiscord - prue._.0115",
-        style="Muted.TLabel",
-    )
-    subtitle.grid(row=1, column=0, sticky="w")
+    tab = ttk.Frame(notebook, style="Main.TFrame", padding=(0, 12, 0, 0))
+    tab.columnconfigure(0, weight=1)
+    tab.rowconfigure(3, weight=1)
+    notebook.add(tab, text=title)
+    key = str(tab)
 
     equipment_names = registry.names
-    default_system = equipment_names[0] if equipment_names else ""
-    system_var = tk.StringVar(value=default_system)
-    system_picker = ttk.Frame(header, style="Main.TFrame")
-    system_picker.grid(row=0, column=1, rowspan=2, sticky="e", padx=(12, 0))
+    system_var = tk.StringVar(value=system or (equipment_names[0] if equipment_names else ""))
+    system_picker = ttk.Frame(tab, style="Main.TFrame")
+    system_picker.grid(row=0, column=0, sticky="e", pady=(0, 12))
     ttk.Label(system_picker, text="장비", style="Body.TLabel").grid(row=0, column=0, sticky="e")
     system_select = ttk.Combobox(
         system_picker,
@@ -596,7 +1528,7 @@ def build_gui():
     )
     system_select.grid(row=0, column=1, sticky="w", padx=(6, 0))
 
-    input_card = ttk.Frame(main, style="Card.TFrame", padding=(16, 16, 16, 12))
+    input_card = ttk.Frame(tab, style="Card.TFrame", padding=(16, 16, 16, 12))
     input_card.grid(row=1, column=0, sticky="ew")
     input_card.columnconfigure(1, weight=1)
 
@@ -618,7 +1550,48 @@ def build_gui():
     distance_entry = ttk.Entry(input_card)
     distance_entry.grid(row=2, column=1, sticky="ew", pady=4)
 
-    button_row = ttk.Frame(main, style="Main.TFrame")
+    # 좌표를 입력하면 거리를 직접 계산하지 않아도 된다. 고도는 위의 ALT 값을 쓴다.
+    grid_frame = ttk.Frame(input_card, style="Card.TFrame")
+    grid_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+    grid_frame.columnconfigure(1, weight=1)
+    grid_frame.columnconfigure(2, weight=1)
+    ttk.Label(grid_frame, text="E / N (m)", style="TableHeader.TLabel").grid(
+        row=0, column=1, columnspan=2, sticky="w"
+    )
+    grid_entries = {}
+    for row, (grid_key, text) in enumerate((("gun", "My Grid"), ("target", "Target Grid")), start=1):
+        ttk.Label(grid_frame, text=text, style="CardBody.TLabel").grid(
+            row=row, column=0, sticky="e", padx=(0, 10), pady=4
+        )
+        easting = ttk.Entry(grid_frame, width=10)
+        northing = ttk.Entry(grid_frame, width=10)
+        easting.grid(row=row, column=1, sticky="ew", padx=(0, 6), pady=4)
+        northing.grid(row=row, column=2, sticky="ew", pady=4)
+        grid_entries[grid_key] = (easting, northing)
+    azimuth_label = ttk.Label(grid_frame, text="", style="TableStatus.TLabel")
+    azimuth_label.grid(row=3, column=0, columnspan=2, sticky="w", pady=(4, 0))
+
+    def _apply_grid():
+        try:
+            my_alt = float(my_altitude_entry.get() or 0.0)
+            target_alt = float(target_altitude_entry.get() or 0.0)
+            gun = GridPoint(*(float(entry.get()) for entry in grid_entries["gun"]), my_alt)
+            target = GridPoint(*(float(entry.get()) for entry in grid_entries["target"]), target_alt)
+        except ValueError:
+            messagebox.showerror("입력 오류", "좌표는 숫자만 입력하세요.")
+            return
+        geometry = solve_geometry(gun, target)
+        distance_entry.delete(0, "end")
+        distance_entry.insert(0, f"{geometry.distance:.1f}")
+        azimuth_label.config(
+            text=f"방위각 {geometry.azimuth_mils:.0f} mil"
+        )
+
+    ttk.Button(grid_frame, text="좌표 → 거리", style="Secondary.TButton", command=_apply_grid).grid(
+        row=3, column=2, sticky="e", pady=(4, 0)
+    )
+
+    button_row = ttk.Frame(tab, style="Main.TFrame")
     button_row.grid(row=2, column=0, sticky="ew", pady=(12, 0))
     button_row.columnconfigure(0, weight=1)
 
@@ -630,7 +1603,33 @@ def build_gui():
     )
     calculate_button.grid(row=0, column=0, sticky="ew")
 
-    results_card = ttk.Frame(main, style="Card.TFrame", padding=16)
+    compare_button = ttk.Button(
+        button_row,
+        text="전체 장비 비교",
+        style="Secondary.TButton",
+        command=lambda: open_comparison_view(
+            root, my_altitude_entry, target_altitude_entry, distance_entry
+        ),
+    )
+    compare_button.grid(row=0, column=1, sticky="e", padx=(8, 0))
+
+    battery_button = ttk.Button(
+        button_row,
+        text="포대 계산",
+        style="Secondary.TButton",
+        command=lambda: open_battery_panel(root, system_var),
+    )
+    battery_button.grid(row=0, column=2, sticky="e", padx=(8, 0))
+
+    bulk_button = ttk.Button(
+        button_row,
+        text="목표 일괄",
+        style="Secondary.TButton",
+        command=lambda: open_bulk_import(root, system_var, my_altitude_entry, append_log),
+    )
+    bulk_button.grid(row=0, column=3, sticky="e", padx=(8, 0))
+
+    results_card = ttk.Frame(tab, style="Card.TFrame", padding=16)
     results_card.grid(row=3, column=0, sticky="ew", pady=(16, 0))
     results_card.columnconfigure(0, weight=1)
     results_card.columnconfigure(1, weight=1)
@@ -646,13 +1645,175 @@ def build_gui():
     low_rows, low_status = build_solution_table(low_frame)
     high_rows, high_status = build_solution_table(high_frame)
 
-    delta_label = ttk.Label(main, text="고도 차이: 계산 필요", style="Muted.TLabel")
+    criterion_row = ttk.Frame(results_card, style="Card.TFrame")
+    criterion_row.grid(row=1, column=0, columnspan=2, sticky="w", pady=(12, 0))
+    ttk.Label(criterion_row, text="장약 선택 기준", style="CardBody.TLabel").grid(
+        row=0, column=0, sticky="w", padx=(0, 8)
+    )
+    criterion_var = tk.StringVar(value=CRITERION_LABELS["charge"])
+    ttk.Combobox(
+        criterion_row,
+        textvariable=criterion_var,
+        values=list(CRITERION_LABELS.values()),
+        state="readonly",
+        width=14,
+        font=BODY_FONT,
+    ).grid(row=0, column=1, sticky="w")
+
+    delta_label = ttk.Label(tab, text="고도 차이: 계산 필요", style="Muted.TLabel")
     delta_label.grid(row=4, column=0, sticky="w", pady=(10, 0))
 
+    # 수정 사격: 마지막 계산의 첫 해(LOW 우선)를 기준으로 사거리표를 붙잡아 두고 가감·좌우만 다시 계산한다.
+    adjust_frame = ttk.Frame(results_card, style="Card.TFrame")
+    adjust_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(12, 0))
+    adjust_frame.columnconfigure(7, weight=1)
+    ttk.Label(adjust_frame, text="수정 (m)", style="CardBody.TLabel").grid(row=0, column=0, padx=(0, 6))
+    adjust_step = ttk.Entry(adjust_frame, width=6)
+    adjust_step.insert(0, str(ADJUST_DEFAULT_STEP))
+    adjust_step.grid(row=0, column=1, padx=(0, 8))
+    adjust_status = ttk.Label(adjust_frame, text="계산 후 사용할 수 있습니다", style="TableStatus.TLabel")
+    adjust_status.grid(row=1, column=0, columnspan=8, sticky="w", pady=(6, 0))
+    adjust_state = {"session": None}
+
+    def _start_adjustment(equipment, distance, altitude_delta, low_solutions, high_solutions):
+        trajectory, solutions = ("low", low_solutions) if low_solutions else ("high", high_solutions)
+        if not solutions:
+            adjust_state["session"] = None
+            adjust_status.config(text="계산 후 사용할 수 있습니다")
+            return
+        adjust_state["session"] = AdjustmentSession(
+            equipment, trajectory, solutions[0].charge, distance, altitude_delta
+        )
+        _show_adjustment()
+
+    def _show_adjustment():
+        session = adjust_state["session"]
+        state = session.current
+        solution = state.solution
+        adjust_status.config(
+            text=(
+                f"{session.trajectory.upper()} CH {session.charge} · {state.distance:.0f} m · "
+                f"MILL {solution.mill:.2f} · ETA {solution.eta:.1f} · "
+                f"편각 {state.deflection_mils:+.1f} mil"
+            )
+        )
+
+    def _adjust(action: str):
+        session = adjust_state["session"]
+        if session is None:
+            return
+        try:
+            step = float(adjust_step.get())
+        except ValueError:
+            messagebox.showerror("입력 오류", "숫자만 입력하세요.")
+            return
+        try:
+            if action == "undo":
+                session.undo()
+            else:
+                getattr(session, action)(step)
+        except ValueError:
+            adjust_status.config(text=f"{session.trajectory.upper()} CH {session.charge} 사거리표 범위를 벗어납니다")
+            return
+        distance_entry.delete(0, "end")
+        distance_entry.insert(0, f"{session.current.distance:.1f}")
+        _show_adjustment()
+
+    for col, (text, action) in enumerate(
+        (("ADD", "add"), ("DROP", "drop"), ("L", "left"), ("R", "right"), ("되돌리기", "undo")), start=2
+    ):
+        ttk.Button(
+            adjust_frame,
+            text=text,
+            style="Secondary.TButton",
+            command=lambda action=action: _adjust(action),
+        ).grid(row=0, column=col, padx=(0, 6))
+
+    marker = {"distance": None}
+
+    def _on_solved(equipment, distance, altitude_delta, low_solutions, high_solutions):
+        _start_adjustment(equipment, distance, altitude_delta, low_solutions, high_solutions)
+        marker["distance"] = distance
+        # 차트는 보고 있는 탭만 따라간다. 뒤쪽 탭의 결과는 그 탭으로 돌아올 때 표시한다.
+        chart = getattr(root, "coverage_chart", None)
+        if chart is not None and str(notebook.select()) == key:
+            update_coverage_marker(chart, distance)
+
+    calculate_button.configure(
+        command=lambda: calculate_and_display(
+            system_var,
+            low_rows,
+            high_rows,
+            low_status,
+            high_status,
+            delta_label,
+            my_altitude_entry,
+            target_altitude_entry,
+            distance_entry,
+            log_entries,
+            log_equipment_filter,
+            log_body,
+            sync_layout,
+            _on_solved,
+            criterion_var,
+            mission_scheduler,
+            key,
+        )
+    )
+
+    return {
+        "key": key,
+        "frame": tab,
+        "system_var": system_var,
+        "results_card": results_card,
+        "solution_tables": [low_rows, high_rows],
+        "marker": marker,
+    }
+
+
+def build_gui():
+    root = tk.Tk()
+    root.title("AFCS : Artillery Fire Control System")
+    root.configure(bg=APP_BG)
+    root.option_add("*Font", BODY_FONT)
+    apply_styles(root)
+
+    version_var = tk.StringVar(value=get_version())
+
+    main = ttk.Frame(root, style="Main.TFrame", padding=20)
+    main.grid(row=0, column=0, sticky="nsew")
+
+    header = ttk.Frame(main, style="Main.TFrame")
+    header.grid(row=0, column=0, sticky="ew", pady=(0, 12))
+    header.columnconfigure(0, weight=1)
+    title = ttk.Label(header, text=f"AFCS {version_var.get()}", style="Title.TLabel")
+    title.grid(row=0, column=0, sticky="w")
+    subtitle = ttk.Label(
+        header,
+        text="Made by Prue\nDiscord - prue._.0115",
+        style="Muted.TLabel",
+    )
+    subtitle.grid(row=1, column=0, sticky="w")
+
+    tab_bar = ttk.Frame(header, style="Main.TFrame")
+    tab_bar.grid(row=0, column=1, rowspan=2, sticky="e", padx=(12, 0))
+    new_tab_button = ttk.Button(tab_bar, text="새 임무", style="Secondary.TButton")
+    new_tab_button.grid(row=0, column=0, sticky="e")
+    close_tab_button = ttk.Button(tab_bar, text="탭 닫기", style="Secondary.TButton")
+    close_tab_button.grid(row=0, column=1, sticky="e", padx=(8, 0))
+
+    missions = ttk.Notebook(main, style="Mission.TNotebook")
+    missions.grid(row=1, column=0, sticky="nsew")
+    mission_tabs = {}
+    tab_numbers = {"next": 1}
+
+    def _current_tab():
+        return mission_tabs[str(missions.select())]
+
     theme_var = tk.StringVar(value="light")
 
     bottom_bar = ttk.Frame(main, style="Main.TFrame")
-    bottom_bar.grid(row=5, column=0, sticky="ew", pady=(8, 0))
+    bottom_bar.grid(row=2, column=0, sticky="ew", pady=(8, 0))
     bottom_bar.columnconfigure(0, weight=1)
 
     try:
@@ -674,6 +1835,14 @@ def build_gui():
     log_toggle_button = ttk.Button(bottom_bar, text="기록", style="Secondary.TButton")
     log_toggle_button.grid(row=0, column=2, sticky="e")
 
+    chart_button = ttk.Button(
+        bottom_bar,
+        text="차트",
+        style="Secondary.TButton",
+        command=lambda: open_coverage_chart(root, _current_tab()["system_var"], theme_var),
+    )
+    chart_button.grid(row=0, column=3, sticky="e", padx=(8, 0))
+
     log_frame = ttk.Labelframe(root, text="기록", style="Card.TLabelframe", padding=14)
     log_frame.grid(row=0, column=1, sticky="nsew", padx=(0, 12), pady=12)
     log_frame.grid_remove()
@@ -689,12 +1858,18 @@ def build_gui():
     equipment_select = ttk.Combobox(
         equipment_wrap,
         textvariable=log_equipment_filter,
-        values=["전체", *equipment_names],
+        values=["전체", *registry.names],
         state="readonly",
         width=8,
         font=BODY_FONT,
     )
     equipment_select.grid(row=0, column=1, sticky="e")
+    ttk.Button(
+        log_header,
+        text="내보내기",
+        style="Secondary.TButton",
+        command=lambda: open_history_export(root, log_entries, log_equipment_filter),
+    ).grid(row=0, column=1, sticky="e", padx=(8, 0))
     log_canvas = tk.Canvas(
         log_frame,
         height=380,
@@ -775,7 +1950,7 @@ def build_gui():
 
             content_width = log_body.winfo_reqwidth()
             scrollbar_width = y_scroll.winfo_reqwidth()
-            table_width = max(results_card.winfo_width(), results_card.winfo_reqwidth())
+            table_width = max(missions.winfo_width(), missions.winfo_reqwidth())
             desired_width = max(table_width, content_width + scrollbar_width)
 
             if desired_width > log_column_width["value"]:
@@ -795,8 +1970,50 @@ def build_gui():
 
     _refresh_log()
 
+    def _append_log(entries):
+        # 일괄 계산 결과는 목표마다 다시 그리지 않고 한 번에 추가한 뒤 한 번만 그린다.
+        log_entries.extend(entries)
+        _refresh_log()
+
     equipment_select.bind("<<ComboboxSelected>>", _refresh_log)
 
+    def _new_tab():
+        # 새 탭은 지금 탭의 장비로 시작한다.
+        system = _current_tab()["system_var"].get() if mission_tabs else ""
+        tab = build_mission_tab(
+            root,
+            missions,
+            MISSION_TAB_TITLE.format(number=tab_numbers["next"]),
+            log_entries=log_entries,
+            log_equipment_filter=log_equipment_filter,
+            log_body=log_body,
+            sync_layout=_sync_layout,
+            append_log=_append_log,
+            system=system,
+        )
+        tab_numbers["next"] += 1
+        mission_tabs[tab["key"]] = tab
+        missions.select(tab["frame"])
+
+    def _close_tab():
+        if len(mission_tabs) <= 1:
+            return
+        tab = mission_tabs.pop(str(missions.select()))
+        mission_scheduler.cancel(tab["key"])
+        missions.forget(tab["frame"])
+        tab["frame"].destroy()
+
+    def _on_tab_changed(event=None):
+        chart = getattr(root, "coverage_chart", None)
+        tab = mission_tabs.get(str(missions.select()))
+        if chart is not None and tab is not None and chart["window"].winfo_exists():
+            bind_coverage_chart(chart, tab["system_var"], tab["marker"]["distance"])
+
+    missions.bind("<<NotebookTabChanged>>", _on_tab_changed)
+    new_tab_button.configure(command=_new_tab)
+    close_tab_button.configure(command=_close_tab)
+    _new_tab()
+
     def toggle_log():
         log_visible["value"] = not log_visible["value"]
         if log_visible["value"]:
@@ -815,12 +2032,16 @@ def build_gui():
         apply_theme(
             root,
             new_theme,
-            solution_tables=[low_rows, high_rows],
+            solution_tables=[rows for tab in mission_tabs.values() for rows in tab["solution_tables"]],
             log_body=log_body,
             log_entries=log_entries,
             log_equipment_filter=log_equipment_filter,
         )
 
+        chart = getattr(root, "coverage_chart", None)
+        if chart is not None:
+            recolor_coverage_chart(chart, new_theme)
+
         _apply_toggle_icon(new_theme)
 
     theme_toggle.configure(command=toggle_theme)
@@ -836,25 +2057,18 @@ def build_gui():
     _sync_layout()
     root.rowconfigure(0, weight=1)
     main.columnconfigure(0, weight=1)
-    main.rowconfigure(3, weight=1)
+    main.rowconfigure(1, weight=1)
 
-    calculate_button.configure(
-        command=lambda: calculate_and_display(
-            system_var,
-            low_rows,
-            high_rows,
-            low_status,
-            high_status,
-            delta_label,
-            my_altitude_entry,
-            target_altitude_entry,
-            distance_entry,
-            log_entries,
-            log_equipment_filter,
-            log_body,
-            _sync_layout,
-        )
-    )
+    def _toggle_profiler(event=None):
+        profiler.toggle()
+        overlay = getattr(root, "profiler_overlay", None)
+        if overlay is not None and overlay.winfo_exists():
+            overlay.refresh()
+        return "break"
+
+    # 운영자에게 노출하지 않는 계측 단축키
+    root.bind_all("<Control-Alt-p>", _toggle_profiler)
+    root.bind_all("<Control-Alt-o>", lambda event: open_profiler_overlay(root))
 
     root.after(500, lambda: check_latest_release(root, version_var, title))
 
@@ -870,8 +2084,22 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def start_metrics_server():
+    """환경 변수로 포트가 지정된 경우 localhost 지표 서버를 띄운다."""
+
+    port = os.environ.get(METRICS_PORT_ENV_VAR)
+    if not port:
+        return None
+    try:
+        return serve_metrics(int(port))
+    except (ValueError, OSError) as e:
+        print(f"지표 서버 시작 실패: {e}")
+        return None
+
+
 def main():
     ensure_dpi_awareness()
+    start_metrics_server()
     root = build_gui()
     
     # tkinter 윈도우 아이콘 설정
@@ -882,6 +2110,7 @@ def main():
         print(f"아이콘 로드 실패: {e}")
     
     root.mainloop()
+    mission_scheduler.close(timeout=1.0)
 
 
 if __name__ == "__main__":